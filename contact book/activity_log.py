@@ -0,0 +1,233 @@
+"""
+Buffered activity logging for the SmartConnect Contact Management System.
+
+This module provides the ActivityLogWriter class. Activity entries (logins,
+logouts, contact changes) are collected in memory and written to the
+auth_activity table in batches, with executemany in one transaction, by a
+background thread, so logging an entry does not commit a transaction on the
+caller's path. Every entry is also appended to a spool file next to the
+database until it has been written; entries left there by a crash are written
+when the log is next opened.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from connection_pool import get_pool
+
+
+_INSERT_SQL = """
+    INSERT INTO auth_activity (user_id, action, details, ip_address, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+ActivityEntry = Tuple[Optional[int], str, Optional[str], Optional[str], str]
+
+
+class ActivityLogWriter:
+    """
+    Writes activity entries to auth_activity in batches.
+
+    Entries are written once max_pending have accumulated, at least every
+    flush_interval seconds, on flush() and on close(). Until then they are
+    kept in the spool file, so they survive a crash of the process; an
+    entry written just before a crash may be written again on restart.
+    If writing fails (e.g. the database is locked for too long), the entries
+    are kept and retried on the next flush.
+
+    Every thread opening ":memory:" gets its own private database (see
+    ConnectionPool), so a ":memory:" writer has no background thread and
+    writes each entry right away on the thread that logged it.
+    """
+
+    DEFAULT_MAX_PENDING = 100
+    DEFAULT_FLUSH_INTERVAL = 1.0
+
+    def __init__(self, db_path: str = "contacts.db", max_pending: int = DEFAULT_MAX_PENDING,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, spool_path: Optional[str] = None):
+        """
+        Initialize the writer and write entries spooled by a previous run.
+
+        Args:
+            db_path: Path to the SQLite database file holding auth_activity
+            max_pending: Number of pending entries that triggers a write
+            flush_interval: Longest time in seconds an entry stays pending
+            spool_path: File holding pending entries (defaults to the
+                database path plus ".activity-spool"; ":memory:" databases
+                get no spool file)
+        """
+        self.pool = get_pool(db_path)
+        self.max_pending = max(1, max_pending)
+        self.flush_interval = flush_interval
+        if spool_path is None and db_path != ":memory:":
+            spool_path = os.path.abspath(db_path) + ".activity-spool"
+        self.spool_path = spool_path
+
+        self._pending: List[ActivityEntry] = []
+        self._lock = threading.Lock()         # Guards _pending and the spool file
+        self._flush_lock = threading.Lock()   # One write to the database at a time
+        self._spool = None
+        self._wake = threading.Event()
+        self._closed = False
+
+        self._recover_spool()
+        self._thread = None
+        if db_path != ":memory:":
+            self._thread = threading.Thread(target=self._run, name="activity-log", daemon=True)
+            self._thread.start()
+
+    def log(self, user_id: Optional[int], action: str, details: str = None,
+            ip_address: str = None) -> None:
+        """
+        Record an activity entry; it is written to the database later.
+
+        Args:
+            user_id: ID of the user concerned, if any
+            action: Action name, e.g. "LOGIN_SUCCESS"
+            details: Free-form description
+            ip_address: Client IP address
+        """
+        # Same format and time zone as SQLite's CURRENT_TIMESTAMP
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        entry = (user_id, action, details, ip_address, timestamp)
+        with self._lock:
+            self._pending.append(entry)
+            self._spool_write([entry])
+            if len(self._pending) >= self.max_pending:
+                self._wake.set()
+        if self._thread is None:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all pending entries to the database in one transaction.
+
+        Returns:
+            int: Number of entries written (0 if writing failed; they stay pending)
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+            if not batch:
+                return 0
+
+            conn = self.pool.connection()
+            try:
+                with conn:
+                    conn.executemany(_INSERT_SQL, batch)
+            except (sqlite3.Error, RuntimeError):
+                return 0
+
+            with self._lock:
+                del self._pending[:len(batch)]
+                # The spool now only needs the entries logged during the write
+                self._spool_rewrite()
+            return len(batch)
+
+    def pending_count(self) -> int:
+        """Return the number of entries not yet written to the database."""
+        with self._lock:
+            return len(self._pending)
+
+    def close(self) -> None:
+        """Stop the background thread and write the pending entries."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._wake.set()
+            self._thread.join()
+        self.flush()
+        with self._lock:
+            if self._spool is not None:
+                self._spool.close()
+                self._spool = None
+
+    def _run(self) -> None:
+        """Background thread body: write pending entries when due."""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if not self._closed:
+                self.flush()
+
+    def _recover_spool(self) -> None:
+        """Queue entries left in the spool file by a previous run."""
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return
+        try:
+            with open(self.spool_path, encoding="utf-8") as spool:
+                for line in spool:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Partial line written during a crash
+                    if isinstance(entry, list) and len(entry) == 5:
+                        self._pending.append(tuple(entry))
+        except OSError:
+            return
+        self.flush()
+
+    def _spool_write(self, entries: List[ActivityEntry]) -> None:
+        """Append entries to the spool file; the caller holds _lock."""
+        if not self.spool_path:
+            return
+        try:
+            if self._spool is None:
+                self._spool = open(self.spool_path, "a", encoding="utf-8", buffering=1)
+            for entry in entries:
+                self._spool.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass  # Entries are still pending in memory
+
+    def _spool_rewrite(self) -> None:
+        """Replace the spool contents with the pending entries; the caller holds _lock."""
+        if not self.spool_path:
+            return
+        try:
+            if self._spool is not None:
+                self._spool.close()
+                self._spool = None
+            if self._pending:
+                self._spool = open(self.spool_path, "w", encoding="utf-8", buffering=1)
+                self._spool_write(self._pending)
+            elif os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+        except OSError:
+            pass
+
+
+_writers: Dict[str, ActivityLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_activity_log(db_path: str) -> ActivityLogWriter:
+    """
+    Return the process-wide activity log writer for a database file.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        ActivityLogWriter: Writer shared by every component using this file
+    """
+    key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = ActivityLogWriter(db_path)
+            _writers[key] = writer
+        return writer
+
+
+@atexit.register
+def _close_writers() -> None:
+    """Write pending entries of every writer when the interpreter exits."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.close()
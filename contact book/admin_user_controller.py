@@ -4,24 +4,37 @@ Admin User Management Controller
 Handles all admin operations for user management
 """
 
-import sqlite3
 import bcrypt
 import secrets
 import string
+import time
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 from admin_middleware import AdminMiddleware
 from auth_system import AuthenticationSystem
+from activity_log import get_activity_log
 
 
 class AdminUserController:
     """Controller for admin user management operations."""
     
+    # Longest time cached statistics are used, to pick up changes made by other processes
+    STATS_TTL_SECONDS = 30.0
+    
+    _USER_COLUMNS = ('id', 'name', 'email', 'role', 'status', 'created_at',
+                     'last_login', 'failed_login_attempts', 'suspension_end')
+    
+    _STATS_KEYS = ('total_users', 'active_users', 'banned_users', 'suspended_users',
+                   'admin_users', 'active_sessions')
+    
     def __init__(self, auth_system: AuthenticationSystem):
         """Initialize controller."""
         self.auth_system = auth_system
         self.middleware = AdminMiddleware(auth_system)
         self.db_path = auth_system.db_path
+        self.pool = auth_system.pool
+        self.activity_log = get_activity_log(self.db_path)  # Buffered auth_activity writes
+        self._stats_snapshot = None  # (users_version, time taken, statistics)
     
     @property
     def require_admin(self):
@@ -33,7 +46,7 @@ class AdminUserController:
         @self.require_admin
         def _get_users(session_token, user_data):
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.pool.connection() as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute('''
@@ -64,6 +77,94 @@ class AdminUserController:
         
         return _get_users(session_token)
     
+    # Filters accepted by list_users, as SQL predicates on users
+    _USER_FILTERS = {
+        'status': "status = ?",
+        'role': "role = ?",
+        'last_login_from': "last_login >= ?",
+        'last_login_to': "last_login < ?",
+    }
+    
+    def list_users(self, session_token: str, status: Optional[str] = None, role: Optional[str] = None,
+                   search: Optional[str] = None, last_login_from: Optional[str] = None,
+                   last_login_to: Optional[str] = None, after_key: Optional[int] = None,
+                   limit: int = 50) -> Tuple[bool, str, Optional[Tuple[List[Dict], Optional[int]]]]:
+        """
+        Get one page of users matching filters, newest first (admin only).
+        
+        Pages use keyset pagination on the user ID (which follows creation
+        order): each page continues after the ID of the previous page's last
+        user, so the cost of a page depends on its size and not its position.
+        Filters are applied in SQL and backed by indexes on users.
+        
+        Args:
+            session_token: Admin session token
+            status: Only users with this status ('active', 'banned', 'suspended')
+            role: Only users with this role ('user', 'admin')
+            search: Only users whose name or email starts with this text (case-insensitive)
+            last_login_from: Only users last logged in at or after this UTC time ("YYYY-MM-DD[ HH:MM:SS]")
+            last_login_to: Only users last logged in before this UTC time
+            after_key: Key returned with the previous page, or None for the first page
+            limit: Maximum number of users to return
+        
+        Returns:
+            Tuple of (success, message, (users, next_key)) - next_key is None
+            when there are no further pages
+        """
+        @self.require_admin
+        def _list_users(session_token, user_data):
+            if limit <= 0:
+                return False, "Page limit must be positive", None
+            
+            filters = {'status': status, 'role': role,
+                       'last_login_from': last_login_from, 'last_login_to': last_login_to}
+            where = []
+            params = []
+            for key, value in filters.items():
+                if value:
+                    where.append(self._USER_FILTERS[key])
+                    params.append(value)
+            
+            if search and search.strip():
+                # Escape LIKE wildcards so the text only matches as a prefix
+                prefix = search.strip().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                where.append("(name LIKE ? ESCAPE '\\' OR email LIKE ? ESCAPE '\\')")
+                params.extend((prefix, prefix))
+            
+            if after_key is not None:
+                where.append("id < ?")
+                params.append(after_key)
+            
+            params.append(limit + 1)  # One extra row tells whether another page exists
+            where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+            
+            try:
+                with self.pool.connection() as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute(f'''
+                        SELECT id, name, email, role, status, created_at, 
+                               last_login, failed_login_attempts, suspension_end
+                        FROM users
+                        {where_sql}
+                        ORDER BY id DESC
+                        LIMIT ?
+                    ''', params)
+                    rows = cursor.fetchall()
+                    
+                    next_key = None
+                    if len(rows) > limit:
+                        rows = rows[:limit]
+                        next_key = rows[-1][0]
+                    
+                    users = [dict(zip(self._USER_COLUMNS, row)) for row in rows]
+                    return True, "Users retrieved successfully", (users, next_key)
+                
+            except Exception as e:
+                return False, f"Failed to retrieve users: {str(e)}", None
+        
+        return _list_users(session_token)
+    
     def create_user(self, session_token: str, name: str, email: str, 
                    password: str, role: str = 'user') -> Tuple[bool, str]:
         """Create new user (admin only)."""
@@ -80,7 +181,7 @@ class AdminUserController:
                 return False, "Password must be at least 8 characters"
             
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.pool.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Check if email exists
@@ -99,14 +200,11 @@ class AdminUserController:
                     
                     new_user_id = cursor.lastrowid
                     conn.commit()
+                    self.auth_system.users_changed()
                     
                     # Log activity
-                    cursor.execute('''
-                        INSERT INTO auth_activity (user_id, action, details)
-                        VALUES (?, ?, ?)
-                    ''', (user_data['id'], "USER_CREATED", 
-                          f"Admin created user: {email} with role {role}"))
-                    conn.commit()
+                    self.activity_log.log(user_data['id'], "USER_CREATED",
+                                          f"Admin created user: {email} with role {role}")
                     
                     return True, f"User '{name}' created successfully"
                     
@@ -124,7 +222,7 @@ class AdminUserController:
                 return False, "Cannot delete your own account"
             
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.pool.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Get user info
@@ -145,14 +243,12 @@ class AdminUserController:
                     # Delete user (CASCADE will handle sessions)
                     cursor.execute('DELETE FROM users WHERE id = ?', (user_id,))
                     conn.commit()
+                    self.auth_system.session_cache.invalidate_user(user_id)
+                    self.auth_system.users_changed()
                     
                     # Log activity
-                    cursor.execute('''
-                        INSERT INTO auth_activity (user_id, action, details)
-                        VALUES (?, ?, ?)
-                    ''', (user_data['id'], "USER_DELETED", 
-                          f"Admin deleted user: {email} ({name})"))
-                    conn.commit()
+                    self.activity_log.log(user_data['id'], "USER_DELETED",
+                                          f"Admin deleted user: {email} ({name})")
                     
                     return True, f"User '{name}' deleted successfully"
                     
@@ -170,7 +266,7 @@ class AdminUserController:
                 return False, "Cannot ban your own account"
             
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.pool.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Get user info
@@ -195,17 +291,15 @@ class AdminUserController:
                     ''', (user_id,))
                     
                     conn.commit()
+                    self.auth_system.session_cache.invalidate_user(user_id)
+                    self.auth_system.users_changed()
                     
                     # Log activity
                     details = f"Admin banned user: {email} ({name})"
                     if reason:
                         details += f" - Reason: {reason}"
                     
-                    cursor.execute('''
-                        INSERT INTO auth_activity (user_id, action, details)
-                        VALUES (?, ?, ?)
-                    ''', (user_data['id'], "USER_BANNED", details))
-                    conn.commit()
+                    self.activity_log.log(user_data['id'], "USER_BANNED", details)
                     
                     return True, f"User '{name}' has been banned"
                     
@@ -227,7 +321,7 @@ class AdminUserController:
                 return False, "Suspension days must be positive"
             
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.pool.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Get user info
@@ -255,17 +349,15 @@ class AdminUserController:
                     ''', (user_id,))
                     
                     conn.commit()
+                    self.auth_system.session_cache.invalidate_user(user_id)
+                    self.auth_system.users_changed()
                     
                     # Log activity
                     details = f"Admin suspended user: {email} ({name}) for {days} days"
                     if reason:
                         details += f" - Reason: {reason}"
                     
-                    cursor.execute('''
-                        INSERT INTO auth_activity (user_id, action, details)
-                        VALUES (?, ?, ?)
-                    ''', (user_data['id'], "USER_SUSPENDED", details))
-                    conn.commit()
+                    self.activity_log.log(user_data['id'], "USER_SUSPENDED", details)
                     
                     return True, f"User '{name}' suspended for {days} days"
                     
@@ -279,7 +371,7 @@ class AdminUserController:
         @self.require_admin
         def _reactivate_user(session_token, user_data):
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.pool.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Get user info
@@ -300,14 +392,12 @@ class AdminUserController:
                         WHERE id = ?
                     ''', (user_id,))
                     conn.commit()
+                    self.auth_system.session_cache.invalidate_user(user_id)
+                    self.auth_system.users_changed()
                     
                     # Log activity
-                    cursor.execute('''
-                        INSERT INTO auth_activity (user_id, action, details)
-                        VALUES (?, ?, ?)
-                    ''', (user_data['id'], "USER_REACTIVATED", 
-                          f"Admin reactivated user: {email} ({name}) from {status} status"))
-                    conn.commit()
+                    self.activity_log.log(user_data['id'], "USER_REACTIVATED",
+                                          f"Admin reactivated user: {email} ({name}) from {status} status")
                     
                     return True, f"User '{name}' has been reactivated"
                     
@@ -321,7 +411,7 @@ class AdminUserController:
         @self.require_admin
         def _reset_password(session_token, user_data):
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.pool.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Get user info
@@ -348,12 +438,8 @@ class AdminUserController:
                     conn.commit()
                     
                     # Log activity
-                    cursor.execute('''
-                        INSERT INTO auth_activity (user_id, action, details)
-                        VALUES (?, ?, ?)
-                    ''', (user_data['id'], "PASSWORD_RESET", 
-                          f"Admin reset password for user: {email} ({name})"))
-                    conn.commit()
+                    self.activity_log.log(user_data['id'], "PASSWORD_RESET",
+                                          f"Admin reset password for user: {email} ({name})")
                     
                     return True, f"Password reset for '{name}'", temp_password
                     
@@ -363,40 +449,39 @@ class AdminUserController:
         return _reset_password(session_token)
     
     def get_user_statistics(self, session_token: str) -> Tuple[bool, str, Optional[Dict]]:
-        """Get user statistics (admin only)."""
+        """
+        Get user statistics (admin only).
+        
+        All counters come from one aggregate query. The result is kept until
+        users or sessions change through the authentication system (see
+        AuthenticationSystem.users_changed) or STATS_TTL_SECONDS pass, so
+        refreshing the admin panel repeatedly does not rescan the users table.
+        """
         @self.require_admin
         def _get_stats(session_token, user_data):
+            version = self.auth_system.users_version
+            snapshot = self._stats_snapshot
+            if (snapshot is not None and snapshot[0] == version
+                    and time.monotonic() - snapshot[1] < self.STATS_TTL_SECONDS):
+                return True, "Statistics retrieved", dict(snapshot[2])
+            
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.pool.connection() as conn:
                     cursor = conn.cursor()
                     
-                    stats = {}
-                    
-                    # Total users
-                    cursor.execute('SELECT COUNT(*) FROM users')
-                    stats['total_users'] = cursor.fetchone()[0]
-                    
-                    # Active users
-                    cursor.execute('SELECT COUNT(*) FROM users WHERE status = "active"')
-                    stats['active_users'] = cursor.fetchone()[0]
-                    
-                    # Banned users
-                    cursor.execute('SELECT COUNT(*) FROM users WHERE status = "banned"')
-                    stats['banned_users'] = cursor.fetchone()[0]
-                    
-                    # Suspended users
-                    cursor.execute('SELECT COUNT(*) FROM users WHERE status = "suspended"')
-                    stats['suspended_users'] = cursor.fetchone()[0]
-                    
-                    # Admin users
-                    cursor.execute('SELECT COUNT(*) FROM users WHERE role = "admin"')
-                    stats['admin_users'] = cursor.fetchone()[0]
-                    
-                    # Active sessions
-                    cursor.execute('SELECT COUNT(*) FROM user_sessions WHERE is_active = 1')
-                    stats['active_sessions'] = cursor.fetchone()[0]
+                    cursor.execute('''
+                        SELECT COUNT(*),
+                               COUNT(CASE WHEN status = 'active' THEN 1 END),
+                               COUNT(CASE WHEN status = 'banned' THEN 1 END),
+                               COUNT(CASE WHEN status = 'suspended' THEN 1 END),
+                               COUNT(CASE WHEN role = 'admin' THEN 1 END),
+                               (SELECT COUNT(*) FROM user_sessions WHERE is_active = 1)
+                        FROM users
+                    ''')
+                    stats = dict(zip(self._STATS_KEYS, cursor.fetchone()))
                     
-                    return True, "Statistics retrieved", stats
+                    self._stats_snapshot = (version, time.monotonic(), stats)
+                    return True, "Statistics retrieved", dict(stats)
                     
             except Exception as e:
                 return False, f"Failed to get statistics: {str(e)}", None
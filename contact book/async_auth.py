@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Non-blocking authentication for the SmartConnect desktop application.
+
+bcrypt is slow on purpose: hashing or checking a password takes hundreds of
+milliseconds, which freezes the Tk event loop when done on the main thread.
+AsyncAuthService runs the password-handling operations of
+AuthenticationSystem and AdminUserController on a worker thread pool and
+returns futures; call_when_done hands a future's result back to the Tk main
+thread by polling with after(). bcrypt releases the GIL while hashing, so
+several operations (e.g. concurrent admin actions) can overlap.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Set
+from admin_user_controller import AdminUserController
+from auth_system import AuthenticationSystem
+
+
+POLL_MS = 25
+
+
+def call_when_done(widget, future: Future, on_done: Callable[[Any], None],
+                   on_error: Optional[Callable[[BaseException], None]] = None,
+                   poll_ms: int = POLL_MS) -> None:
+    """
+    Call on_done with a future's result on the Tk main thread.
+
+    Must be called from the main thread. The future is polled with
+    widget.after(), so no Tk call is ever made from a worker thread.
+
+    Args:
+        widget: Any Tk widget, used for scheduling
+        future: Future to wait for
+        on_done: Called with the result once the future has finished
+        on_error: Called with the exception if the future failed; if not
+            given, the exception propagates out of the Tk callback and is
+            reported by Tk
+        poll_ms: Polling interval in milliseconds
+    """
+    def poll():
+        if not future.done():
+            widget.after(poll_ms, poll)
+            return
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None and on_error is not None:
+            on_error(error)
+            return
+        on_done(future.result())
+
+    widget.after(poll_ms, poll)
+
+
+class AsyncAuthService:
+    """
+    Future-returning facade over the operations that hash or check passwords.
+
+    Each method takes the same arguments as its synchronous counterpart and
+    returns a Future of the same result. The underlying classes use the
+    per-thread connection pool, so they are safe to call from the workers.
+    """
+
+    DEFAULT_WORKERS = 4
+
+    def __init__(self, auth_system: AuthenticationSystem,
+                 admin_controller: Optional[AdminUserController] = None,
+                 max_workers: int = DEFAULT_WORKERS):
+        """
+        Initialize the service.
+
+        Args:
+            auth_system: Authentication system doing the work
+            admin_controller: Controller for admin operations (created for
+                auth_system if not given)
+            max_workers: Number of worker threads
+        """
+        self.auth_system = auth_system
+        self.admin_controller = admin_controller or AdminUserController(auth_system)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auth")
+        self._pending: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        """Run fn on the worker pool, tracking the future until it completes."""
+        future = self._executor.submit(fn, *args)
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future) -> None:
+        """Stop tracking a completed or cancelled future."""
+        with self._pending_lock:
+            self._pending.discard(future)
+
+    def login(self, email: str, password: str, ip_address: str = None) -> Future:
+        """Run AuthenticationSystem.login in the background."""
+        return self._submit(self.auth_system.login, email, password, ip_address)
+
+    def signup(self, name: str, email: str, password: str) -> Future:
+        """Run AuthenticationSystem.signup in the background."""
+        return self._submit(self.auth_system.signup, name, email, password)
+
+    def create_user(self, session_token: str, name: str, email: str,
+                    password: str, role: str = 'user') -> Future:
+        """Run AdminUserController.create_user in the background."""
+        return self._submit(
+            self.admin_controller.create_user, session_token, name, email, password, role
+        )
+
+    def reset_password(self, session_token: str, user_id: int) -> Future:
+        """Run AdminUserController.reset_password in the background."""
+        return self._submit(self.admin_controller.reset_password, session_token, user_id)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop the worker threads.
+
+        Operations that have not started yet are cancelled unless wait is
+        set. (ThreadPoolExecutor.shutdown only gained cancel_futures in
+        Python 3.9.)
+
+        Args:
+            wait: Block until running operations have finished
+        """
+        if not wait:
+            with self._pending_lock:
+                pending = list(self._pending)
+            for future in pending:
+                future.cancel()
+        self._executor.shutdown(wait=wait)
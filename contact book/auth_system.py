@@ -7,8 +7,108 @@ Provides signup, login, and session management with bcrypt password hashing
 import sqlite3
 import bcrypt
 import secrets
+import threading
+import time
+from itertools import count
+from collections import OrderedDict
 from typing import Tuple, Optional, Dict
 from datetime import datetime, timedelta
+from connection_pool import get_pool
+from activity_log import get_activity_log
+from migrations import get_schema
+
+
+class SessionCache:
+    """
+    Bounded LRU cache of validated sessions with a time-to-live.
+    
+    Entries expire after ttl_seconds (or when the session itself expires, if
+    sooner), so changes made outside this process are picked up within the
+    TTL. Changes made through this process must invalidate explicitly.
+    """
+    
+    DEFAULT_MAX_ENTRIES = 256
+    DEFAULT_TTL_SECONDS = 30.0
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation; pass the value read before a lookup to put()."""
+        return self._generation
+    
+    def get(self, session_token: str) -> Optional[Dict]:
+        """Return a copy of the cached user data for a token, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(session_token)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[session_token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_token)
+            self.hits += 1
+            return dict(entry[1])
+    
+    def put(self, session_token: str, user_data: Dict, expires_at: datetime, generation: int) -> None:
+        """
+        Cache a validated session.
+        
+        Args:
+            session_token: Session token
+            user_data: User data returned for the session
+            expires_at: When the session itself expires
+            generation: Value of generation read before the session was looked
+                up; if anything was invalidated since, the data may be stale
+                and is not cached
+        """
+        lifetime = min(self.ttl_seconds, (expires_at - datetime.now()).total_seconds())
+        with self._lock:
+            if generation != self._generation or lifetime <= 0:
+                return
+            self._entries[session_token] = (time.monotonic() + lifetime, dict(user_data))
+            self._entries.move_to_end(session_token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, session_token: str) -> None:
+        """Drop one session."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(session_token, None)
+    
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every session of a user (after a ban, suspension, deletion or role change)."""
+        with self._lock:
+            self._generation += 1
+            for token in [token for token, (_, data) in self._entries.items() if data['id'] == user_id]:
+                del self._entries[token]
+    
+    def clear(self) -> None:
+        """Drop all sessions."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters, the hit rate and the number of cached sessions."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries)
+            }
 
 
 class AuthenticationSystem:
@@ -17,90 +117,19 @@ class AuthenticationSystem:
     def __init__(self, db_path: str = "contacts.db"):
         """Initialize authentication system."""
         self.db_path = db_path
+        self.pool = get_pool(db_path)
+        self.session_cache = SessionCache()  # Validated sessions, see validate_session
+        self.users_version = 0  # Bumped by users_changed(), see AdminUserController.get_user_statistics
+        self._users_versions = count(1)
         self._init_database()
+        self.activity_log = get_activity_log(db_path)  # Buffered auth_activity writes
     
     def _init_database(self) -> None:
-        """Initialize authentication tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        """Bring the schema up to date and create the default admin account if needed."""
+        self.schema = get_schema(self.db_path)  # Migrated once per process, see migrations.py
+        with self.pool.connection() as conn:
             cursor = conn.cursor()
             
-            # Check if users table exists and get its columns
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-            table_exists = cursor.fetchone() is not None
-            
-            if table_exists:
-                # Get existing columns
-                cursor.execute("PRAGMA table_info(users)")
-                existing_columns = {row[1] for row in cursor.fetchall()}
-                
-                # Add missing columns if needed
-                if 'name' not in existing_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN name TEXT")
-                if 'email' not in existing_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN email TEXT UNIQUE")
-                if 'password_hash' not in existing_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN password_hash TEXT")
-                if 'role' not in existing_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
-                if 'status' not in existing_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN status TEXT DEFAULT 'active'")
-                if 'created_at' not in existing_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-                if 'last_login' not in existing_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN last_login TIMESTAMP")
-                if 'failed_login_attempts' not in existing_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN failed_login_attempts INTEGER DEFAULT 0")
-                if 'suspension_end' not in existing_columns:
-                    cursor.execute("ALTER TABLE users ADD COLUMN suspension_end TIMESTAMP")
-                
-                conn.commit()
-            else:
-                # Create users table from scratch
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        email TEXT UNIQUE NOT NULL,
-                        password_hash TEXT NOT NULL,
-                        role TEXT DEFAULT 'user' CHECK(role IN ('user', 'admin')),
-                        status TEXT DEFAULT 'active' CHECK(status IN ('active', 'banned', 'suspended')),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        last_login TIMESTAMP,
-                        failed_login_attempts INTEGER DEFAULT 0,
-                        suspension_end TIMESTAMP
-                    )
-                ''')
-            
-            # Create user_sessions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    session_token TEXT UNIQUE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL,
-                    is_active BOOLEAN DEFAULT 1,
-                    ip_address TEXT,
-                    user_agent TEXT,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Create activity log
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS auth_activity (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    action TEXT NOT NULL,
-                    details TEXT,
-                    ip_address TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE SET NULL
-                )
-            ''')
-            
-            conn.commit()
-            
             # Create default admin if none exists
             cursor.execute('SELECT COUNT(*) FROM users WHERE role = "admin"')
             if cursor.fetchone()[0] == 0:
@@ -111,11 +140,7 @@ class AuthenticationSystem:
         """Create default admin account."""
         password_hash = bcrypt.hashpw("admin123".encode('utf-8'), bcrypt.gensalt())
         
-        # Check if username column exists
-        cursor.execute("PRAGMA table_info(users)")
-        columns = {row[1] for row in cursor.fetchall()}
-        
-        if 'username' in columns:
+        if self.schema.users_has_username:
             cursor.execute('''
                 INSERT INTO users (name, username, email, password_hash, role)
                 VALUES (?, ?, ?, ?, ?)
@@ -149,7 +174,7 @@ class AuthenticationSystem:
             return False, "Invalid email address"
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Check if email already exists
@@ -160,12 +185,8 @@ class AuthenticationSystem:
                 # Hash password with bcrypt
                 password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
                 
-                # Check if username column exists
-                cursor.execute("PRAGMA table_info(users)")
-                columns = {row[1] for row in cursor.fetchall()}
-                
                 # Insert new user with username field if it exists
-                if 'username' in columns:
+                if self.schema.users_has_username:
                     # Use email as username for compatibility
                     cursor.execute('''
                         INSERT INTO users (name, username, email, password_hash, role)
@@ -179,10 +200,10 @@ class AuthenticationSystem:
                 
                 user_id = cursor.lastrowid
                 conn.commit()
+                self.users_changed()
                 
                 # Log activity
-                self._log_activity(cursor, user_id, "SIGNUP", f"New user registered: {email}")
-                conn.commit()
+                self._log_activity(user_id, "SIGNUP", f"New user registered: {email}")
                 
                 return True, "Account created successfully! Please login."
                 
@@ -205,7 +226,7 @@ class AuthenticationSystem:
             return False, "Email and password are required", None, None
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Get user
@@ -218,28 +239,24 @@ class AuthenticationSystem:
                 user = cursor.fetchone()
                 
                 if not user:
-                    self._log_activity(cursor, None, "LOGIN_FAILED", f"Unknown email: {email}", ip_address)
-                    conn.commit()
+                    self._log_activity(None, "LOGIN_FAILED", f"Unknown email: {email}", ip_address)
                     return False, "Invalid email or password", None, None
                 
                 user_id, name, email_db, password_hash, role, status, suspension_end, failed_attempts = user
                 
                 # Check account status
                 if status == 'banned':
-                    self._log_activity(cursor, user_id, "LOGIN_BLOCKED", "Banned user attempted login", ip_address)
-                    conn.commit()
+                    self._log_activity(user_id, "LOGIN_BLOCKED", "Banned user attempted login", ip_address)
                     return False, "Account is banned. Contact administrator.", None, None
                 
                 if status == 'suspended':
                     if suspension_end and datetime.fromisoformat(suspension_end) > datetime.now():
-                        self._log_activity(cursor, user_id, "LOGIN_BLOCKED", "Suspended user attempted login", ip_address)
-                        conn.commit()
+                        self._log_activity(user_id, "LOGIN_BLOCKED", "Suspended user attempted login", ip_address)
                         return False, f"Account suspended until {suspension_end}", None, None
                 
                 # Check for account lockout (5 failed attempts)
                 if failed_attempts >= 5:
-                    self._log_activity(cursor, user_id, "LOGIN_BLOCKED", "Locked account attempted login", ip_address)
-                    conn.commit()
+                    self._log_activity(user_id, "LOGIN_BLOCKED", "Locked account attempted login", ip_address)
                     return False, "Account locked due to too many failed attempts. Contact administrator.", None, None
                 
                 # Verify password
@@ -251,8 +268,7 @@ class AuthenticationSystem:
                     ''', (user_id,))
                     conn.commit()
                     
-                    self._log_activity(cursor, user_id, "LOGIN_FAILED", "Invalid password", ip_address)
-                    conn.commit()
+                    self._log_activity(user_id, "LOGIN_FAILED", "Invalid password", ip_address)
                     return False, "Invalid email or password", None, None
                 
                 # Successful login - reset failed attempts
@@ -271,10 +287,10 @@ class AuthenticationSystem:
                 ''', (user_id, session_token, expires_at.isoformat(), ip_address))
                 
                 conn.commit()
+                self.users_changed()
                 
                 # Log successful login
-                self._log_activity(cursor, user_id, "LOGIN_SUCCESS", f"User logged in: {email}", ip_address)
-                conn.commit()
+                self._log_activity(user_id, "LOGIN_SUCCESS", f"User logged in: {email}", ip_address)
                 
                 # Return user data
                 user_data = {
@@ -294,6 +310,10 @@ class AuthenticationSystem:
         """
         Validate session token and return user data.
         
+        Valid sessions are cached for a short time (see SessionCache), so
+        repeated checks of the same token, e.g. by every admin operation,
+        do not query the database each time.
+        
         Args:
             session_token: Session token to validate
             
@@ -303,8 +323,13 @@ class AuthenticationSystem:
         if not session_token:
             return False, None
         
+        cached = self.session_cache.get(session_token)
+        if cached is not None:
+            return True, cached
+        generation = self.session_cache.generation
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -329,6 +354,7 @@ class AuthenticationSystem:
                         WHERE session_token = ?
                     ''', (session_token,))
                     conn.commit()
+                    self.users_changed()
                     return False, None
                 
                 # Check user status
@@ -343,6 +369,7 @@ class AuthenticationSystem:
                     'status': status
                 }
                 
+                self.session_cache.put(session_token, user_data, datetime.fromisoformat(expires_at), generation)
                 return True, user_data
                 
         except Exception:
@@ -358,8 +385,9 @@ class AuthenticationSystem:
         Returns:
             True if successful
         """
+        self.session_cache.invalidate(session_token)
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Get user_id before deactivating
@@ -375,25 +403,27 @@ class AuthenticationSystem:
                         WHERE session_token = ?
                     ''', (session_token,))
                     
-                    self._log_activity(cursor, user_id, "LOGOUT", "User logged out")
                     conn.commit()
+                    self.users_changed()
+                    self._log_activity(user_id, "LOGOUT", "User logged out")
                 
                 return True
                 
         except Exception:
             return False
     
-    def _log_activity(self, cursor, user_id: Optional[int], action: str, 
+    def _log_activity(self, user_id: Optional[int], action: str, 
                      details: str = None, ip_address: str = None) -> None:
-        """Log authentication activity."""
+        """Log authentication activity (written to auth_activity in batches)."""
         try:
-            cursor.execute('''
-                INSERT INTO auth_activity (user_id, action, details, ip_address)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, action, details, ip_address))
+            self.activity_log.log(user_id, action, details, ip_address)
         except Exception:
             pass  # Don't fail operations if logging fails
     
+    def users_changed(self) -> None:
+        """Record a change to users or sessions, so cached admin statistics are recomputed."""
+        self.users_version = next(self._users_versions)
+    
     def is_admin(self, session_token: str) -> bool:
         """Check if session belongs to an admin user."""
         is_valid, user_data = self.validate_session(session_token)
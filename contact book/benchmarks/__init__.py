@@ -0,0 +1,11 @@
+"""
+Performance benchmarks for the SmartConnect Contact Management System.
+
+Run from the application directory:
+
+    python -m benchmarks --sizes 1000,10000,100000 --output results.json
+    python -m benchmarks --compare baseline.json
+
+Contacts are produced by a seeded synthetic generator, so runs on different
+commits measure the same data and their JSON results can be compared.
+"""
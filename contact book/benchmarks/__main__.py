@@ -0,0 +1,11 @@
+"""Entry point for ``python -m benchmarks``."""
+
+import os
+import sys
+
+# The application modules live next to this package, not inside it
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.runner import main
+
+sys.exit(main())
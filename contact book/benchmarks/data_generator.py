@@ -0,0 +1,155 @@
+"""
+Seeded synthetic contact data for SmartConnect benchmarks.
+
+This module provides the ContactGenerator class, which produces valid Contact
+objects with realistic field distributions: common names are much more
+frequent than rare ones, phone numbers come in the formats people actually
+type, and emails, companies and addresses are present for only a share of
+contacts. The same seed always yields the same contacts.
+"""
+
+import random
+from typing import Iterator, List, Sequence
+from models import Contact
+
+
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Christopher", "Nancy", "Daniel", "Lisa",
+    "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra", "Donald", "Ashley",
+    "Steven", "Kimberly", "Paul", "Emily", "Andrew", "Donna", "Joshua", "Michelle",
+    "Kenneth", "Dorothy", "Kevin", "Carol", "Brian", "Amanda", "George", "Melissa",
+    "Timothy", "Deborah", "Ronald", "Stephanie", "Edward", "Rebecca", "Jason", "Sharon",
+    "Jeffrey", "Laura", "Ryan", "Cynthia", "Jacob", "Kathleen", "Gary", "Amy",
+    "Nicholas", "Angela", "Eric", "Shirley", "Jonathan", "Anna", "Stephen", "Brenda",
+    "Larry", "Pamela", "Justin", "Emma", "Scott", "Nicole", "Brandon", "Helen",
+    "Benjamin", "Samantha", "Samuel", "Katherine", "Gregory", "Christine", "Alexander", "Debra",
+    "Frank", "Rachel", "Patrick", "Carolyn", "Raymond", "Janet", "Jack", "Catherine",
+    "Dennis", "Maria", "Jerry", "Heather", "Tyler", "Diane", "Aaron", "Ruth",
+    "Priya", "Wei", "Aisha", "Mateo", "Yuki", "Olga", "Kwame", "Ingrid",
+    "Diego", "Fatima", "Hiroshi", "Siobhan", "Arjun", "Chloe", "Lars", "Amara",
+)
+
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas",
+    "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White",
+    "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker", "Young",
+    "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell",
+    "Carter", "Roberts", "Gomez", "Phillips", "Evans", "Turner", "Diaz", "Parker",
+    "Cruz", "Edwards", "Collins", "Reyes", "Stewart", "Morris", "Morales", "Murphy",
+    "Cook", "Rogers", "Gutierrez", "Ortiz", "Morgan", "Cooper", "Peterson", "Bailey",
+    "Reed", "Kelly", "Howard", "Ramos", "Kim", "Cox", "Ward", "Richardson",
+    "Watson", "Brooks", "Chavez", "Wood", "James", "Bennett", "Gray", "Mendoza",
+    "Ruiz", "Hughes", "Price", "Alvarez", "Castillo", "Sanders", "Patel", "Myers",
+    "O'Brien", "McCarthy", "Van der Berg", "Smith-Jones", "Okafor", "Nakamura", "Kowalski", "Johansson",
+    "Fitzgerald", "Schmidt", "Rossi", "Dubois", "Novak", "Haddad", "Singh", "Chen",
+)
+
+COMPANIES = (
+    "Acme Corp", "Globex", "Initech", "Umbrella", "Stark Industries", "Wayne Enterprises",
+    "Hooli", "Pied Piper", "Vandelay Industries", "Wonka Industries", "Cyberdyne",
+    "Soylent", "Tyrell", "Massive Dynamic", "Aperture Science", "Gringotts",
+)
+
+JOB_TITLES = (
+    "Engineer", "Manager", "Director", "Analyst", "Designer", "Consultant",
+    "Accountant", "Sales Representative", "Teacher", "Nurse", "Developer", "Founder",
+)
+
+EMAIL_DOMAINS = ("gmail.com", "yahoo.com", "outlook.com", "icloud.com", "hotmail.com", "example.com")
+EMAIL_DOMAIN_WEIGHTS = (40, 15, 15, 10, 10, 10)
+
+STREETS = ("Main St", "Oak Ave", "Maple Dr", "Cedar Ln", "Park Rd", "Elm St", "Pine St", "Lake View")
+CITIES = ("Springfield", "Riverside", "Franklin", "Greenville", "Bristol", "Clinton", "Fairview", "Salem")
+
+# Category mix of a typical personal address book
+CATEGORIES = ("Friends", "Family", "Work")
+CATEGORY_WEIGHTS = (50, 20, 30)
+
+
+def _zipf_weights(count: int, exponent: float = 1.0) -> List[float]:
+    """Weights making the k-th item about 1/k^exponent as likely as the first."""
+    return [1.0 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+class ContactGenerator:
+    """
+    Deterministic generator of realistic, valid contacts.
+
+    Names follow a Zipf distribution over the name lists, so a few names are
+    very common (as in real address books, which matters for search result
+    sizes) while most are rare.
+    """
+
+    def __init__(self, seed: int = 42):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Random seed; equal seeds produce equal contact sequences
+        """
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._first_weights = _zipf_weights(len(FIRST_NAMES))
+        self._last_weights = _zipf_weights(len(LAST_NAMES))
+
+    def _pick(self, values: Sequence[str], weights: Sequence[float]) -> str:
+        return self._random.choices(values, weights)[0]
+
+    def phone(self) -> str:
+        """Return a phone number in one of the commonly typed formats."""
+        rand = self._random
+        area, exchange, line = rand.randint(201, 989), rand.randint(200, 999), rand.randint(0, 9999)
+        style = rand.random()
+        if style < 0.35:
+            return f"({area}) {exchange}-{line:04d}"
+        if style < 0.65:
+            return f"{area}-{exchange}-{line:04d}"
+        if style < 0.85:
+            return f"{area}{exchange}{line:04d}"
+        if style < 0.95:
+            return f"+1 {area} {exchange} {line:04d}"
+        return f"+44 20 {rand.randint(1000, 9999)} {rand.randint(1000, 9999)}"
+
+    def contact(self) -> Contact:
+        """Return one synthetic contact."""
+        rand = self._random
+        first = self._pick(FIRST_NAMES, self._first_weights)
+        last = self._pick(LAST_NAMES, self._last_weights)
+
+        email = ""
+        if rand.random() < 0.8:
+            local = f"{first}.{last}".lower().replace("'", "").replace(" ", "")
+            if rand.random() < 0.5:
+                local += str(rand.randint(1, 999))
+            email = f"{local}@{self._pick(EMAIL_DOMAINS, EMAIL_DOMAIN_WEIGHTS)}"
+
+        category = self._pick(CATEGORIES, CATEGORY_WEIGHTS)
+        is_work = category == "Work"
+
+        return Contact(
+            name=f"{first} {last}",
+            phone=self.phone(),
+            email=email,
+            address=(f"{rand.randint(1, 9999)} {rand.choice(STREETS)}, {rand.choice(CITIES)}"
+                     if rand.random() < 0.3 else ""),
+            company=rand.choice(COMPANIES) if is_work or rand.random() < 0.2 else "",
+            job_title=rand.choice(JOB_TITLES) if is_work else "",
+            category=category
+        )
+
+    def contacts(self, count: int) -> Iterator[Contact]:
+        """
+        Yield synthetic contacts.
+
+        Args:
+            count: Number of contacts to generate
+
+        Yields:
+            Contact: Valid contact without a database ID
+        """
+        for _ in range(count):
+            yield self.contact()
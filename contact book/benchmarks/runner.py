@@ -0,0 +1,317 @@
+"""
+Benchmark runner for the SmartConnect Contact Management System.
+
+For every requested book size this loads a fresh database with synthetic
+contacts for one user, then times the operations the application depends on:
+ContactDatabase CRUD, search_contacts, ContactSearchEngine.search_and_sort,
+export_contacts_csv and get_contact_count. Results are written as JSON and can
+be compared against a baseline run to spot regressions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Sequence
+
+from benchmarks.data_generator import ContactGenerator
+from connection_pool import get_pool
+from contact_manager import ContactManager
+from database import ContactDatabase
+from search_engine import ContactSearchEngine
+
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+OPERATIONS = (
+    "bulk_load", "add_contact", "get_contact", "update_contact", "delete_contact",
+    "search_contacts", "search_and_sort_cold", "search_and_sort",
+    "export_contacts_csv", "get_contact_count",
+)
+
+# Queries covering common prefixes, full names, rare names and phone digits
+SEARCH_QUERIES = ("jo", "mary", "james smith", "kowalski", "555", "212-", "gmail")
+
+LOAD_BATCH_SIZE = 10000
+BENCHMARK_USER_ID = 1
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize timing samples.
+
+    Args:
+        samples: Durations in seconds
+
+    Returns:
+        Dict with the number of runs and min/median/p95/mean in milliseconds
+    """
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(ordered[p95_index] * 1000, 4),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 4),
+    }
+
+
+def _time(function: Callable[[], object]) -> float:
+    """Run a function once and return its duration in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def _load(database: ContactDatabase, generator: ContactGenerator, size: int) -> float:
+    """Insert size synthetic contacts in bulk and return the elapsed seconds."""
+    contacts = generator.contacts(size)
+    start = time.perf_counter()
+    while True:
+        batch = list(islice(contacts, LOAD_BATCH_SIZE))
+        if not batch:
+            break
+        database.add_contacts_bulk(batch)
+    return time.perf_counter() - start
+
+
+def benchmark_size(size: int, seed: int, operations_count: int, repeat: int,
+                   operations: Sequence[str], workdir: str) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark one address book size on a fresh database.
+
+    Args:
+        size: Number of contacts loaded for the benchmark user
+        seed: Seed for the contact generator and the choice of contacts to touch
+        operations_count: Number of single-contact CRUD operations of each kind
+        repeat: Number of timed runs of each read operation (per query for searches)
+        operations: Names of the operations to run (see OPERATIONS)
+        workdir: Directory for the database and export files
+
+    Returns:
+        Dict mapping operation name to its timing summary
+    """
+    db_path = os.path.join(workdir, f"bench_{size}.db")
+    database = ContactDatabase(db_path)
+    database.set_current_user(BENCHMARK_USER_ID)
+    manager = ContactManager(database)
+    generator = ContactGenerator(seed)
+    chooser = random.Random(seed)
+    results: Dict[str, Dict[str, float]] = {}
+
+    try:
+        elapsed = _load(database, generator, size)
+        if "bulk_load" in operations:
+            results["bulk_load"] = summarize([elapsed])
+            results["bulk_load"]["records_per_second"] = round(size / elapsed) if elapsed else 0
+
+        existing_ids = [row[0] for row in database.connection.execute(
+            "SELECT id FROM contacts WHERE user_id = ?", (BENCHMARK_USER_ID,)
+        )]
+        touched_ids = chooser.sample(existing_ids, min(operations_count, len(existing_ids)))
+
+        added_ids: List[int] = []
+        if "add_contact" in operations or "delete_contact" in operations:
+            samples = []
+            for contact in generator.contacts(operations_count):
+                start = time.perf_counter()
+                added_ids.append(database.add_contact(contact))
+                samples.append(time.perf_counter() - start)
+            if "add_contact" in operations:
+                results["add_contact"] = summarize(samples)
+
+        if "get_contact" in operations:
+            results["get_contact"] = summarize(
+                [_time(lambda: database.get_contact(contact_id)) for contact_id in touched_ids]
+            )
+
+        if "update_contact" in operations:
+            samples = []
+            for contact_id in touched_ids:
+                contact = database.get_contact(contact_id)
+                contact.phone = generator.phone()
+                samples.append(_time(lambda: database.update_contact(contact)))
+            results["update_contact"] = summarize(samples)
+
+        if "delete_contact" in operations:
+            # Delete the contacts added above so the book keeps its size
+            results["delete_contact"] = summarize(
+                [_time(lambda: database.delete_contact(contact_id)) for contact_id in added_ids]
+            )
+
+        if "search_contacts" in operations:
+            results["search_contacts"] = summarize([
+                _time(lambda: database.search_contacts(query))
+                for query in SEARCH_QUERIES for _ in range(repeat)
+            ])
+
+        if "search_and_sort_cold" in operations or "search_and_sort" in operations:
+            engine = ContactSearchEngine(manager)
+            # The first search builds the in-memory index for the user
+            cold = _time(lambda: engine.search_and_sort(SEARCH_QUERIES[0], "name"))
+            if "search_and_sort_cold" in operations:
+                results["search_and_sort_cold"] = summarize([cold])
+            if "search_and_sort" in operations:
+                results["search_and_sort"] = summarize([
+                    _time(lambda: engine.search_and_sort(query, sort_by))
+                    for query in SEARCH_QUERIES for sort_by in ("name", "recent") for _ in range(repeat)
+                ])
+
+        if "export_contacts_csv" in operations:
+            export_path = os.path.join(workdir, f"bench_{size}.csv")
+            samples = []
+            for _ in range(max(1, min(repeat, 3))):
+                start = time.perf_counter()
+                success, message = manager.export_contacts_csv(export_path)
+                samples.append(time.perf_counter() - start)
+                if not success:
+                    raise RuntimeError(message)
+            results["export_contacts_csv"] = summarize(samples)
+
+        if "get_contact_count" in operations:
+            results["get_contact_count"] = summarize(
+                [_time(manager.get_contact_count) for _ in range(repeat)]
+            )
+    finally:
+        database.close_connection()
+        get_pool(db_path).close_all()
+
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    """Return the current git commit hash, if available."""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def collect_metadata(seed: int, sizes: Sequence[int], repeat: int, operations_count: int) -> Dict[str, object]:
+    """Describe the environment and parameters of a benchmark run."""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": seed,
+        "sizes": list(sizes),
+        "repeat": repeat,
+        "operations_count": operations_count,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[Dict[str, object]]:
+    """
+    Compare median timings of two benchmark result documents.
+
+    Args:
+        current: Results of this run
+        baseline: Results of an earlier run
+        threshold: Relative slowdown (e.g. 0.1 for 10%) reported as a regression
+
+    Returns:
+        List of per-operation comparisons present in both runs
+    """
+    comparisons = []
+    for size, operations in current["results"].items():
+        for name, stats in operations.items():
+            old = baseline.get("results", {}).get(size, {}).get(name)
+            if not old or not old["median_ms"]:
+                continue
+            change = stats["median_ms"] / old["median_ms"] - 1
+            comparisons.append({
+                "size": size,
+                "operation": name,
+                "baseline_ms": old["median_ms"],
+                "current_ms": stats["median_ms"],
+                "change": round(change, 4),
+                "regression": change > threshold,
+            })
+    return comparisons
+
+
+def _print_results(results: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+    """Print a table of median and p95 timings."""
+    print(f"{'size':>9}  {'operation':<22} {'runs':>5} {'median ms':>11} {'p95 ms':>11}")
+    for size, operations in results.items():
+        for name, stats in operations.items():
+            print(f"{size:>9}  {name:<22} {stats['runs']:>5} {stats['median_ms']:>11.3f} {stats['p95_ms']:>11.3f}")
+
+
+def _parse_sizes(value: str) -> List[int]:
+    sizes = [int(part.replace("_", "")) for part in value.split(",") if part.strip()]
+    if not sizes or any(size <= 0 for size in sizes):
+        raise argparse.ArgumentTypeError("sizes must be positive integers")
+    return sizes
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the benchmarks from the command line.
+
+    Returns:
+        int: Exit status (1 if a comparison found regressions)
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=_parse_sizes, default=list(DEFAULT_SIZES),
+                        help="comma-separated contacts per user, e.g. 1000,10000,100000,1000000")
+    parser.add_argument("--seed", type=int, default=42, help="generator seed (default: 42)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per read operation (default: 5)")
+    parser.add_argument("--ops", type=int, default=200, dest="operations_count",
+                        help="single-contact CRUD operations of each kind (default: 200)")
+    parser.add_argument("--only", default=",".join(OPERATIONS),
+                        help="comma-separated subset of: " + ", ".join(OPERATIONS))
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    operations = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = set(operations) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    document = {
+        "meta": collect_metadata(args.seed, args.sizes, args.repeat, args.operations_count),
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="smartconnect-bench-") as workdir:
+        for size in args.sizes:
+            print(f"Benchmarking {size} contacts...", file=sys.stderr)
+            document["results"][str(size)] = benchmark_size(
+                size, args.seed, args.operations_count, args.repeat, operations, workdir
+            )
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(document, output, indent=2)
+    _print_results(document["results"])
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        comparisons = compare(document, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} (commit {baseline.get('meta', {}).get('git_commit')}):")
+        for item in comparisons:
+            flag = "  REGRESSION" if item["regression"] else ""
+            print(f"{item['size']:>9}  {item['operation']:<22} {item['baseline_ms']:>11.3f} -> "
+                  f"{item['current_ms']:>11.3f} ms ({item['change']:+.1%}){flag}")
+        if any(item["regression"] for item in comparisons):
+            return 1
+    return 0
@@ -0,0 +1,229 @@
+"""
+Contact file formats for the SmartConnect Contact Management System.
+
+This module provides streaming readers for the CSV and vCard formats used by
+contact import, and a streaming writer for CSV and NDJSON export. Readers yield
+one plain dictionary of contact fields per record; the writer consumes batches
+of raw database rows. Neither holds more than one record or batch in memory.
+"""
+
+import csv
+import gzip
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# CSV header aliases, keyed by lower-cased header text (covers our own export headers)
+CSV_HEADER_ALIASES = {
+    'name': 'name',
+    'full name': 'name',
+    'phone': 'phone',
+    'phone number': 'phone',
+    'mobile': 'phone',
+    'email': 'email',
+    'e-mail': 'email',
+    'email address': 'email',
+    'address': 'address',
+    'company': 'company',
+    'organization': 'company',
+    'job title': 'job_title',
+    'job_title': 'job_title',
+    'title': 'job_title',
+    'category': 'category',
+}
+
+VALID_CATEGORIES = ('Family', 'Friends', 'Work')
+
+# Export columns in database row order, with their CSV headers
+EXPORT_COLUMNS = (
+    'id', 'name', 'phone', 'email', 'address',
+    'company', 'job_title', 'category', 'created_at', 'updated_at'
+)
+EXPORT_HEADERS = (
+    'ID', 'Name', 'Phone', 'Email', 'Address',
+    'Company', 'Job Title', 'Category', 'Created At', 'Updated At'
+)
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+
+def read_csv_records(file_path: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream contact records from a CSV file with a header row.
+
+    Headers are matched case-insensitively against known aliases, so files
+    written by export_contacts_csv can be imported back. Unknown columns
+    (such as ID or timestamps) are ignored.
+
+    Args:
+        file_path: Path of the CSV file
+
+    Yields:
+        Dict[str, str]: Contact field values for one data row
+    """
+    with open(file_path, 'r', newline='', encoding='utf-8-sig') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        columns = [
+            (position, CSV_HEADER_ALIASES[title.strip().lower()])
+            for position, title in enumerate(header)
+            if title.strip().lower() in CSV_HEADER_ALIASES
+        ]
+
+        for row in reader:
+            record = {}
+            for position, field in columns:
+                if position < len(row):
+                    record[field] = row[position]
+            yield record
+
+
+def read_vcard_records(file_path: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream contact records from a vCard (.vcf) file.
+
+    Supports vCard 2.1, 3.0 and 4.0 cards: folded lines are unfolded and the
+    first FN (or N), TEL, EMAIL, ADR, ORG, TITLE and a recognised CATEGORIES
+    value of each card are used.
+
+    Args:
+        file_path: Path of the vCard file
+
+    Yields:
+        Dict[str, str]: Contact field values for one card
+    """
+    card = None
+    for line in _unfolded_lines(file_path):
+        prop, _, value = line.partition(':')
+        params = prop.split(';')
+        # Drop an optional group prefix such as "item1.TEL"
+        key = params[0].rsplit('.', 1)[-1].upper()
+
+        if key == 'BEGIN' and value.strip().upper() == 'VCARD':
+            card = {}
+        elif key == 'END' and value.strip().upper() == 'VCARD':
+            if card is not None:
+                yield card
+            card = None
+        elif card is not None:
+            _apply_vcard_property(card, key, value)
+
+
+def _unfolded_lines(file_path: str) -> Iterator[str]:
+    """Yield logical vCard lines, joining folded continuation lines."""
+    pending = None
+    with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as vcf_file:
+        for raw_line in vcf_file:
+            line = raw_line.rstrip('\r\n')
+            if line[:1] in (' ', '\t') and pending is not None:
+                pending += line[1:]
+                continue
+            if pending is not None:
+                yield pending
+            pending = line
+    if pending is not None:
+        yield pending
+
+
+def _apply_vcard_property(card: Dict[str, str], key: str, value: str) -> None:
+    """Copy a single vCard property into a contact record."""
+    if key == 'FN':
+        card['name'] = _unescape(value)
+    elif key == 'N' and 'name' not in card:
+        # N:Family;Given;Additional;Prefix;Suffix
+        parts = [_unescape(part) for part in _split_components(value)]
+        given = parts[1] if len(parts) > 1 else ''
+        card['name'] = ' '.join(part for part in (given, parts[0]) if part)
+    elif key == 'TEL' and 'phone' not in card:
+        card['phone'] = _unescape(value)
+    elif key == 'EMAIL' and 'email' not in card:
+        card['email'] = _unescape(value)
+    elif key == 'ADR' and 'address' not in card:
+        parts = [_unescape(part).strip() for part in _split_components(value)]
+        card['address'] = ', '.join(part for part in parts if part)
+    elif key == 'ORG' and 'company' not in card:
+        card['company'] = _unescape(_split_components(value)[0])
+    elif key == 'TITLE' and 'job_title' not in card:
+        card['job_title'] = _unescape(value)
+    elif key == 'CATEGORIES' and 'category' not in card:
+        for category in value.split(','):
+            category = _unescape(category).strip().capitalize()
+            if category in VALID_CATEGORIES:
+                card['category'] = category
+                break
+
+
+def _split_components(value: str) -> List[str]:
+    """Split a structured vCard value on unescaped semicolons."""
+    parts = ['']
+    escaped = False
+    for char in value:
+        if escaped:
+            parts[-1] += '\\' + char
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == ';':
+            parts.append('')
+        else:
+            parts[-1] += char
+    return parts
+
+
+def _unescape(value: str) -> str:
+    """Undo vCard text escaping."""
+    return (value.replace('\\n', '\n').replace('\\N', '\n')
+            .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def write_contact_batches(batches: Iterable[Sequence[Sequence]], file_path: str,
+                          format: str = "csv", compress: bool = False, total: int = 0,
+                          progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Write batches of contact rows to a CSV or NDJSON file.
+
+    Args:
+        batches: Iterable of row batches, each row ordered as EXPORT_COLUMNS
+        file_path: Destination path
+        format: "csv" (with a header row) or "ndjson" (one JSON object per line)
+        compress: Write gzip-compressed output
+        total: Expected number of rows, passed through to progress_callback
+        progress_callback: Called as progress_callback(rows_written, total)
+            after every batch
+
+    Returns:
+        int: Number of rows written
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    if compress:
+        output = gzip.open(file_path, 'wt', newline='', encoding='utf-8')
+    else:
+        output = open(file_path, 'w', newline='', encoding='utf-8')
+
+    written = 0
+    with output:
+        if format == 'csv':
+            writer = csv.writer(output)
+            writer.writerow(EXPORT_HEADERS)
+            for batch in batches:
+                writer.writerows(batch)
+                written += len(batch)
+                if progress_callback:
+                    progress_callback(written, total)
+        else:
+            for batch in batches:
+                output.writelines(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n'
+                    for row in batch
+                )
+                written += len(batch)
+                if progress_callback:
+                    progress_callback(written, total)
+
+    return written
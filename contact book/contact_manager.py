@@ -5,12 +5,16 @@ This module provides the ContactManager class that serves as the core business l
 layer, coordinating contact operations between the GUI and database layers.
 """
 
-import csv
+import os
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from models import Contact
+from itertools import islice, tee
+from typing import Callable, Dict, List, Optional, Tuple
+from models import Contact, ContactQuery, ContactRow
+from events import ContactEvent, ContactEventBus, ContactEventType
 from database import ContactDatabase
 from validation import ContactValidator
+from activity_log import ActivityLogWriter
+from contact_io import EXPORT_FORMATS, read_csv_records, read_vcard_records, write_contact_batches
 
 
 class ContactManager:
@@ -19,19 +23,35 @@ class ContactManager:
     
     Coordinates between the GUI layer and database layer, providing high-level
     contact operations with validation, error handling, and business rules.
+    
+    Every successful change is published on the events bus, so views and
+    search indexes can update incrementally.
     """
     
-    def __init__(self, database: ContactDatabase, auth_manager=None):
+    def __init__(self, database: ContactDatabase, auth_manager=None,
+                 activity_log: Optional[ActivityLogWriter] = None):
         """
         Initialize ContactManager with database connection.
         
         Args:
             database: ContactDatabase instance for data persistence
             auth_manager: Optional AuthManager instance for permission checking
+            activity_log: Optional writer recording contact changes in auth_activity
         """
         self.database = database
         self.validator = ContactValidator()
         self.auth_manager = auth_manager
+        self.activity_log = activity_log
+        self.events = ContactEventBus()  # Contact change notifications
+    
+    def _publish(self, event_type: ContactEventType, contact: Optional[Contact] = None) -> None:
+        """Publish a change to the current user's contacts."""
+        self.events.publish(ContactEvent(
+            type=event_type,
+            user_id=self.database.current_user_id,
+            contact_id=contact.id if contact else None,
+            contact=ContactRow.from_contact(contact) if contact else None
+        ))
     
     def _check_authentication(self) -> bool:
         """Check if user is authenticated."""
@@ -40,11 +60,17 @@ class ContactManager:
         return True  # Allow operations if no auth manager (backward compatibility)
     
     def _log_activity(self, action: str, details: str = None) -> None:
-        """Log user activity if auth manager is available."""
+        """Log user activity if an activity log is available (written in batches)."""
+        if self.activity_log is None:
+            return
+        user_id = self.database.current_user_id
         if self.auth_manager and self.auth_manager.is_authenticated():
             user_id = self.auth_manager.get_current_user_id()
-            if user_id:
-                self.auth_manager._log_user_activity(user_id, action, details)
+        if user_id:
+            try:
+                self.activity_log.log(user_id, action, details)
+            except Exception:
+                pass  # Don't fail operations if logging fails
     
     def create_contact(self, contact_data: Dict[str, str]) -> Tuple[bool, str]:
         """
@@ -80,6 +106,9 @@ class ContactManager:
             
             # Save to database
             contact_id = self.database.add_contact(contact)
+            contact.id = contact_id
+            
+            self._publish(ContactEventType.CREATED, contact)
             
             # Log activity
             self._log_activity("CONTACT_CREATED", f"Created contact: {contact.name} (ID: {contact_id})")
@@ -132,6 +161,8 @@ class ContactManager:
             # Update in database
             success = self.database.update_contact(updated_contact)
             if success:
+                self._publish(ContactEventType.UPDATED, updated_contact)
+                
                 # Log activity
                 self._log_activity("CONTACT_UPDATED", f"Updated contact: {updated_contact.name} (ID: {contact_id})")
                 return True, "Contact updated successfully"
@@ -164,6 +195,8 @@ class ContactManager:
             # Perform deletion
             success = self.database.delete_contact(contact_id)
             if success:
+                self._publish(ContactEventType.DELETED, existing_contact)
+                
                 # Log activity
                 self._log_activity("CONTACT_DELETED", f"Deleted contact: {existing_contact.name} (ID: {contact_id})")
                 return True, f"Contact '{existing_contact.name}' deleted successfully"
@@ -173,9 +206,48 @@ class ContactManager:
         except Exception as e:
             return False, f"Failed to delete contact: {str(e)}"
     
+    def merge_contacts(self, keep_id: int, duplicate_ids: List[int]) -> Tuple[bool, str]:
+        """
+        Merge duplicate contacts into one (see ContactDatabase.merge_contacts).
+        
+        Duplicates are typically found with dedupe.ContactDeduplicator. The
+        kept contact is published as updated and each duplicate as deleted.
+        
+        Args:
+            keep_id: ID of the contact to keep
+            duplicate_ids: IDs of the contacts merged into it and deleted
+        
+        Returns:
+            Tuple[bool, str]: (success, message) - success status and result message
+        """
+        try:
+            # Check authentication
+            if not self._check_authentication():
+                return False, "Authentication required to merge contacts"
+            
+            duplicate_ids = list(dict.fromkeys(duplicate_ids))
+            duplicates = [self.database.get_contact(contact_id) for contact_id in duplicate_ids]
+            merged = self.database.merge_contacts(keep_id, duplicate_ids)
+            if not merged:
+                return False, "Some of the contacts to merge were not found"
+            
+            self._publish(ContactEventType.UPDATED, merged)
+            for duplicate in duplicates:
+                if duplicate:
+                    self._publish(ContactEventType.DELETED, duplicate)
+            
+            self._log_activity(
+                "CONTACTS_MERGED",
+                f"Merged contacts {', '.join(map(str, duplicate_ids))} into {merged.name} (ID: {keep_id})"
+            )
+            return True, f"Merged {len(duplicate_ids)} duplicate(s) into '{merged.name}'"
+            
+        except Exception as e:
+            return False, f"Failed to merge contacts: {str(e)}"
+    
     def get_contact(self, contact_id: int) -> Optional[Contact]:
         """
-        Retrieve a specific contact by ID.
+        Retrieve a specific contact by ID, e.g. to open it for editing.
         
         Args:
             contact_id: ID of the contact to retrieve
@@ -188,7 +260,7 @@ class ContactManager:
         except Exception:
             return None
     
-    def get_all_contacts(self, sort_by: str = "name") -> List[Contact]:
+    def get_all_contacts(self, sort_by: str = "name") -> List[ContactRow]:
         """
         Retrieve all contacts with optional sorting.
         
@@ -196,23 +268,51 @@ class ContactManager:
             sort_by: Sorting criteria ("name" for alphabetical, "recent" for creation date)
             
         Returns:
-            List of Contact objects sorted according to criteria
+            List of ContactRow objects sorted according to criteria
         """
         try:
-            contacts = self.database.get_all_contacts()
-            
-            if sort_by == "recent":
-                # Sort by creation date, newest first
-                contacts.sort(key=lambda c: c.created_at or datetime.min, reverse=True)
-            else:
-                # Default: sort alphabetically by name
-                contacts.sort(key=lambda c: c.name.lower())
+            # Sorting is done by SQL using the per-user composite indexes
+            return self.database.get_all_contacts(sort_by)
+        except Exception:
+            return []
+    
+    def get_contacts_page(self, after_key: Optional[Tuple] = None, limit: int = 50,
+                          sort_by: str = "name") -> Tuple[List[ContactRow], Optional[Tuple]]:
+        """
+        Retrieve one page of contacts with keyset pagination.
+        
+        Args:
+            after_key: Key returned with the previous page, or None for the first page
+            limit: Maximum number of contacts to return
+            sort_by: Sorting criteria ("name" for alphabetical, "recent" for creation date)
             
-            return contacts
+        Returns:
+            Tuple[List[ContactRow], Optional[Tuple]]: (contacts, next_key) - pass next_key
+            back to fetch the following page; it is None on the last page
+        """
+        try:
+            return self.database.get_contacts_page(after_key, limit, sort_by)
+        except Exception:
+            return [], None
+    
+    def query_contacts(self, query: ContactQuery) -> List[ContactRow]:
+        """
+        Retrieve contacts matching a structured query.
+        
+        Filtering, sorting, limit and offset are all done by one SQL statement.
+        
+        Args:
+            query: Search text, filters, sort order and window
+        
+        Returns:
+            List of matching ContactRow objects in the requested order
+        """
+        try:
+            return self.database.query_contacts(query)
         except Exception:
             return []
     
-    def search_contacts(self, query: str) -> List[Contact]:
+    def search_contacts(self, query: str) -> List[ContactRow]:
         """
         Search contacts by name or phone number.
         
@@ -220,7 +320,7 @@ class ContactManager:
             query: Search query string
             
         Returns:
-            List of matching Contact objects
+            List of matching ContactRow objects
         """
         try:
             if not query or not query.strip():
@@ -230,54 +330,171 @@ class ContactManager:
         except Exception:
             return []
     
-    def export_contacts_csv(self, file_path: str) -> Tuple[bool, str]:
+    def export_contacts(self, file_path: str, format: str = "csv", compress: bool = False,
+                        progress_callback: Optional[Callable[[int, int], None]] = None) -> Tuple[bool, str]:
+        """
+        Export all contacts to a CSV or NDJSON file, optionally gzip-compressed.
+        
+        Rows are streamed from the database in batches and written as they
+        arrive, so memory use stays flat regardless of the number of contacts.
+        
+        Args:
+            file_path: Path where the file should be saved
+            format: "csv" or "ndjson"
+            compress: Write gzip-compressed output
+            progress_callback: Called as progress_callback(rows_written, total)
+                after every batch
+            
+        Returns:
+            Tuple[bool, str]: (success, message) - success status and result message
+        """
+        try:
+            if format not in EXPORT_FORMATS:
+                return False, f"Unsupported export format: {format}"
+            
+            total = self.database.count_contacts()
+            
+            if not total:
+                return False, "No contacts to export"
+            
+            written = write_contact_batches(
+                self.database.iter_contact_batches(),
+                file_path,
+                format=format,
+                compress=compress,
+                total=total,
+                progress_callback=progress_callback
+            )
+            
+            return True, f"Successfully exported {written} contacts to {file_path}"
+            
+        except Exception as e:
+            return False, f"Failed to export contacts: {str(e)}"
+    
+    def export_contacts_csv(self, file_path: str,
+                            progress_callback: Optional[Callable[[int, int], None]] = None) -> Tuple[bool, str]:
         """
         Export all contacts to a CSV file.
         
         Args:
             file_path: Path where the CSV file should be saved
+            progress_callback: Called as progress_callback(rows_written, total)
+                after every batch
             
         Returns:
             Tuple[bool, str]: (success, message) - success status and result message
         """
+        return self.export_contacts(file_path, "csv", progress_callback=progress_callback)
+    
+    @staticmethod
+    def _contact_from_record(record: Dict[str, str], now: datetime) -> Contact:
+        """Build an unsaved contact from an imported record."""
+        return Contact(
+            name=(record.get('name') or '').strip(),
+            phone=(record.get('phone') or '').strip(),
+            email=(record.get('email') or '').strip(),
+            address=(record.get('address') or '').strip(),
+            company=(record.get('company') or '').strip(),
+            job_title=(record.get('job_title') or '').strip(),
+            category=(record.get('category') or 'Friends').strip(),
+            created_at=now,
+            updated_at=now
+        )
+    
+    def import_contacts(self, file_path: str, format: str = "csv", chunk_size: int = 5000,
+                        resume: bool = True, validation_processes: Optional[int] = None
+                        ) -> Tuple[bool, str, List[Tuple[int, List[str]]]]:
+        """
+        Import contacts from a CSV or vCard file.
+        
+        The file is streamed through ContactValidator.validate_many and stored in
+        chunks. Each chunk is inserted with a single executemany in one
+        transaction, together with a checkpoint of the records processed so
+        far. If an import is interrupted, calling this again with resume=True
+        skips the records that were already stored (as long as the file has
+        not changed in the meantime).
+        
+        Invalid records are skipped and reported; they do not stop the import.
+        
+        Args:
+            file_path: Path of the file to import
+            format: File format, "csv" or "vcard"
+            chunk_size: Number of records validated and committed together
+            resume: Continue from the last checkpoint of this file, if any
+            validation_processes: Validate in this many worker processes (for
+                very large files); None validates in-process
+            
+        Returns:
+            Tuple[bool, str, List[Tuple[int, List[str]]]]: (success, message, errors) -
+            errors holds (record_number, validation_errors) for every rejected
+            record, numbered from 1 in file order
+        """
+        readers = {"csv": read_csv_records, "vcard": read_vcard_records}
+        errors: List[Tuple[int, List[str]]] = []
+        imported = 0
+        
         try:
-            contacts = self.get_all_contacts()
+            if not self._check_authentication():
+                return False, "Authentication required to import contacts", errors
             
-            if not contacts:
-                return False, "No contacts to export"
+            if format not in readers:
+                return False, f"Unsupported import format: {format}", errors
+            
+            if chunk_size <= 0:
+                return False, "Chunk size must be positive", errors
+            
+            source = os.path.abspath(file_path)
+            stat = os.stat(source)
+            fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}"
             
-            # Define CSV headers
-            headers = [
-                'ID', 'Name', 'Phone', 'Email', 'Address', 
-                'Company', 'Job Title', 'Category', 'Created At', 'Updated At'
-            ]
+            records_done = self.database.get_import_checkpoint(source, fingerprint) if resume else 0
+            records = enumerate(readers[format](source), start=1)
+            # Skip records stored by an interrupted run of the same file
+            records = islice(records, records_done, None)
             
-            # Write CSV file
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
+            now = datetime.now()
+            parsed, to_validate = tee(
+                (record_number, self._contact_from_record(record, now))
+                for record_number, record in records
+            )
+            validated = zip(parsed, self.validator.validate_many(
+                (contact for _, contact in to_validate), processes=validation_processes
+            ))
+            
+            while True:
+                chunk = list(islice(validated, chunk_size))
+                if not chunk:
+                    break
                 
-                # Write headers
-                writer.writerow(headers)
+                valid_contacts = []
+                chunk_errors = []
+                for (record_number, contact), (_, record_errors) in chunk:
+                    if record_errors:
+                        chunk_errors.append((record_number, record_errors))
+                    else:
+                        valid_contacts.append(contact)
                 
-                # Write contact data
-                for contact in contacts:
-                    writer.writerow([
-                        contact.id,
-                        contact.name,
-                        contact.phone,
-                        contact.email,
-                        contact.address,
-                        contact.company,
-                        contact.job_title,
-                        contact.category,
-                        contact.created_at.isoformat() if contact.created_at else '',
-                        contact.updated_at.isoformat() if contact.updated_at else ''
-                    ])
-            
-            return True, f"Successfully exported {len(contacts)} contacts to {file_path}"
+                records_done = chunk[-1][0][0]
+                imported += self.database.add_contacts_bulk(
+                    valid_contacts, source, fingerprint, records_done
+                )
+                errors.extend(chunk_errors)
+            
+            self.database.clear_import_checkpoint(source)
+            
+            self._log_activity("CONTACTS_IMPORTED", f"Imported {imported} contacts from {file_path}")
+            
+            message = f"Imported {imported} contacts from {file_path}"
+            if errors:
+                message += f" ({len(errors)} invalid records skipped)"
+            return True, message, errors
             
         except Exception as e:
-            return False, f"Failed to export contacts: {str(e)}"
+            return False, f"Failed to import contacts after {imported} records: {str(e)}", errors
+        finally:
+            # One event for the whole import instead of one per contact
+            if imported:
+                self._publish(ContactEventType.RELOADED)
     
     def get_contact_count(self) -> int:
         """
@@ -287,11 +504,25 @@ class ContactManager:
             int: Total number of contacts
         """
         try:
-            contacts = self.database.get_all_contacts()
-            return len(contacts)
+            return self.database.count_contacts()
         except Exception:
             return 0
     
+    def get_contact_facets(self) -> Dict[str, int]:
+        """
+        Get the number of contacts in each category.
+        
+        Counts are kept up to date by the database, so this is cheap enough
+        to call on every refresh.
+        
+        Returns:
+            Dict[str, int]: Contacts per category (Family, Friends, Work, ...)
+        """
+        try:
+            return self.database.get_contact_facets()
+        except Exception:
+            return dict.fromkeys(self.database.FACET_CATEGORIES, 0)
+    
     def validate_contact_data(self, contact_data: Dict[str, str]) -> Tuple[bool, List[str]]:
         """
         Validate contact data without creating a contact.
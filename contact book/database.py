@@ -7,9 +7,16 @@ using SQLite3 for persistent contact storage.
 
 import sqlite3
 import os
+import re
 from datetime import datetime
-from typing import List, Optional, Tuple
-from models import Contact
+from itertools import starmap
+from typing import Dict, Iterator, List, Optional, Tuple
+from models import Contact, ContactQuery, ContactRow
+from connection_pool import get_pool
+from migrations import (CONTACT_COUNTS_BULK_FILL_SQL, CONTACT_COUNTS_INSERT_TRIGGER_SQL, FTS_BULK_FILL_SQL,
+                        FTS_INSERT_TRIGGER_SQL, PHONE_FTS_BULK_FILL_SQL, PHONE_FTS_INSERT_TRIGGER_SQL,
+                        get_schema)
+from phone_utils import digits_only, phone_query_digits, to_e164
 
 
 class ContactDatabase:
@@ -18,6 +25,9 @@ class ContactDatabase:
     
     Handles SQLite3 database connection, table creation, and all CRUD operations
     for contact data with proper error handling and transaction management.
+    
+    Connections come from the shared per-thread pool for the database file, so
+    a ContactDatabase may be used from worker threads as well as the UI thread.
     """
     
     def __init__(self, db_path: str = "contacts.db"):
@@ -28,8 +38,12 @@ class ContactDatabase:
             db_path: Path to the SQLite database file
         """
         self.db_path = db_path
-        self.connection = None
+        self.pool = None
+        self._closed = True
         self.current_user_id = 1  # Default user ID
+        self.schema = None  # Schema capabilities, set by create_tables
+        self.fts_enabled = False  # Set by create_tables when FTS5 is available
+        self.phone_fts_enabled = False  # Set when the FTS5 trigram tokenizer is available
         self._connect()
         self.create_tables()
     
@@ -37,59 +51,44 @@ class ContactDatabase:
         """Set the current user ID for filtering contacts."""
         self.current_user_id = user_id
     
+    @property
+    def connection(self) -> Optional[sqlite3.Connection]:
+        """The calling thread's pooled connection, or None once closed."""
+        if self._closed:
+            return None
+        return self.pool.connection()
+    
     def _connect(self) -> None:
         """Establish database connection with proper error handling."""
-        try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row  # Enable column access by name
-        except sqlite3.Error as e:
-            raise RuntimeError(f"Failed to connect to database: {e}")
+        self.pool = get_pool(self.db_path)
+        self.pool.connection()  # Raises RuntimeError if the file cannot be opened
+        self._closed = False
     
     def create_tables(self) -> None:
         """
-        Create the contacts table if it doesn't exist.
+        Bring the database schema up to date and record its optional indexes.
+        
+        The schema is migrated once per process and database file (see
+        migrations.get_schema); later calls only read the cached capabilities.
         
         Raises:
-            RuntimeError: If table creation fails
-        """
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS contacts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL DEFAULT 1,
-            name TEXT NOT NULL,
-            phone TEXT,
-            email TEXT,
-            address TEXT,
-            company TEXT,
-            job_title TEXT,
-            category TEXT CHECK(category IN ('Family', 'Friends', 'Work')) DEFAULT 'Friends',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-        );
+            RuntimeError: If migrating the schema fails
         """
-        
         try:
-            cursor = self.connection.cursor()
-            
-            # Check if contacts table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='contacts'")
-            table_exists = cursor.fetchone() is not None
-            
-            if table_exists:
-                # Add user_id column if it doesn't exist
-                cursor.execute("PRAGMA table_info(contacts)")
-                columns = {row[1] for row in cursor.fetchall()}
-                if 'user_id' not in columns:
-                    cursor.execute("ALTER TABLE contacts ADD COLUMN user_id INTEGER NOT NULL DEFAULT 1")
-                    print("Added user_id column to contacts table")
-            else:
-                # Create new table with user_id
-                cursor.execute(create_table_sql)
-            
-            self.connection.commit()
+            self.schema = get_schema(self.db_path)
         except sqlite3.Error as e:
             raise RuntimeError(f"Failed to create tables: {e}")
+        self.fts_enabled = self.schema.contacts_fts
+        self.phone_fts_enabled = self.schema.contacts_phone_fts
+    
+    def _bulk_indexes(self) -> List[Tuple[str, str, str]]:
+        """Return (trigger name, trigger SQL, bulk fill SQL) for each table maintained by an insert trigger."""
+        indexes = [("contact_counts_insert", CONTACT_COUNTS_INSERT_TRIGGER_SQL, CONTACT_COUNTS_BULK_FILL_SQL)]
+        if self.fts_enabled:
+            indexes.append(("contacts_fts_insert", FTS_INSERT_TRIGGER_SQL, FTS_BULK_FILL_SQL))
+        if self.phone_fts_enabled:
+            indexes.append(("contacts_phone_fts_insert", PHONE_FTS_INSERT_TRIGGER_SQL, PHONE_FTS_BULK_FILL_SQL))
+        return indexes
     
     def add_contact(self, contact: Contact) -> int:
         """
@@ -108,8 +107,9 @@ class ContactDatabase:
             raise RuntimeError("Database connection is closed")
             
         insert_sql = """
-        INSERT INTO contacts (user_id, name, phone, email, address, company, job_title, category, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO contacts (user_id, name, phone, phone_digits, phone_e164, email, address, company,
+                              job_title, category, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         
         try:
@@ -119,6 +119,8 @@ class ContactDatabase:
                 self.current_user_id,
                 contact.name,
                 contact.phone,
+                digits_only(contact.phone),
+                to_e164(contact.phone),
                 contact.email,
                 contact.address,
                 contact.company,
@@ -133,6 +135,126 @@ class ContactDatabase:
             self.connection.rollback()
             raise RuntimeError(f"Failed to add contact: {e}")
     
+    def add_contacts_bulk(self, contacts: List[Contact], source: Optional[str] = None,
+                          fingerprint: str = "", records_done: int = 0) -> int:
+        """
+        Insert many contacts in a single transaction.
+        
+        When a source is given, the import checkpoint for it is advanced in the
+        same transaction, so after a crash the checkpoint never claims rows that
+        were not stored (and never misses rows that were).
+        
+        The full-text indexes and contact counts are filled with one INSERT ...
+        SELECT each for the whole chunk instead of by their per-row triggers, which is several times
+        faster. The triggers are dropped and recreated inside the same
+        transaction, so other connections never observe them missing.
+        
+        Args:
+            contacts: Validated Contact objects to insert
+            source: Identifier of the file being imported, if checkpointing
+            fingerprint: Fingerprint of the source file contents
+            records_done: Number of source records processed including this chunk
+            
+        Returns:
+            int: Number of contacts inserted
+            
+        Raises:
+            RuntimeError: If the insert fails (nothing from the chunk is stored)
+        """
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        insert_sql = """
+        INSERT INTO contacts (user_id, name, phone, phone_digits, phone_e164, email, address, company,
+                              job_title, category, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        checkpoint_sql = """
+        INSERT OR REPLACE INTO import_checkpoints (user_id, source, fingerprint, records_done, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        """
+        
+        try:
+            cursor = self.connection.cursor()
+            now = datetime.now().isoformat()
+            user_id = self.current_user_id
+            
+            bulk_indexes = self._bulk_indexes()
+            if bulk_indexes:
+                if not self.connection.in_transaction:
+                    cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM contacts")
+                first_new_id = cursor.fetchone()[0] + 1
+                for trigger_name, _, _ in bulk_indexes:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+            
+            cursor.executemany(insert_sql, [
+                (user_id, contact.name, contact.phone, digits_only(contact.phone), to_e164(contact.phone),
+                 contact.email, contact.address, contact.company, contact.job_title, contact.category,
+                 now, now)
+                for contact in contacts
+            ])
+            
+            for _, trigger_sql, fill_sql in bulk_indexes:
+                cursor.execute(fill_sql, (first_new_id,))
+                cursor.execute(trigger_sql)
+            
+            if source is not None:
+                cursor.execute(checkpoint_sql, (user_id, source, fingerprint, records_done, now))
+            self.connection.commit()
+            return len(contacts)
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            raise RuntimeError(f"Failed to import contacts: {e}")
+    
+    def get_import_checkpoint(self, source: str, fingerprint: str) -> int:
+        """
+        Return how many records of a source were already imported.
+        
+        Args:
+            source: Identifier of the file being imported
+            fingerprint: Fingerprint of the current file contents
+            
+        Returns:
+            int: Records already processed, or 0 if there is no checkpoint or
+            the file changed since it was written
+        """
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "SELECT fingerprint, records_done FROM import_checkpoints WHERE user_id = ? AND source = ?",
+                (self.current_user_id, source)
+            )
+            row = cursor.fetchone()
+            if row and row['fingerprint'] == fingerprint:
+                return row['records_done']
+            return 0
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to read import checkpoint: {e}")
+    
+    def clear_import_checkpoint(self, source: str) -> None:
+        """
+        Remove the checkpoint of a finished (or abandoned) import.
+        
+        Args:
+            source: Identifier of the imported file
+        """
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        try:
+            self.connection.execute(
+                "DELETE FROM import_checkpoints WHERE user_id = ? AND source = ?",
+                (self.current_user_id, source)
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            raise RuntimeError(f"Failed to clear import checkpoint: {e}")
+    
     def get_contact(self, contact_id: int) -> Optional[Contact]:
         """
         Retrieve a contact by ID.
@@ -162,29 +284,352 @@ class ContactDatabase:
         except sqlite3.Error as e:
             raise RuntimeError(f"Failed to retrieve contact: {e}")
     
-    def get_all_contacts(self) -> List[Contact]:
+    # ORDER BY clause, keyset predicate and key column for each sort order.
+    # The predicates are spelled out (rather than as row values) so SQLite
+    # can seek into the composite index instead of filtering from its start.
+    _PAGE_ORDERINGS = {
+        "name": (
+            "name COLLATE NOCASE, id",
+            "name >= ? COLLATE NOCASE AND (name > ? COLLATE NOCASE OR id > ?)",
+            "name",
+        ),
+        "recent": (
+            "created_at DESC, id DESC",
+            "created_at <= ? AND (created_at < ? OR id < ?)",
+            "created_at",
+        ),
+    }
+    
+    # Columns selected for ContactRow results, in constructor order
+    _ROW_COLUMNS = ", ".join(ContactRow.COLUMNS)
+    _JOINED_ROW_COLUMNS = ", ".join(f"c.{column}" for column in ContactRow.COLUMNS)
+    
+    def get_all_contacts(self, sort_by: str = "name") -> List[ContactRow]:
         """
         Retrieve all contacts from the database for the current user.
         
+        Args:
+            sort_by: Sorting criteria ("name" for alphabetical, "recent" for creation date)
+        
         Returns:
-            List of Contact objects
+            List of ContactRow objects
             
         Raises:
             RuntimeError: If database query fails
         """
         if self.connection is None:
             raise RuntimeError("Database connection is closed")
+        
+        order_by = self._PAGE_ORDERINGS.get(sort_by, self._PAGE_ORDERINGS["name"])[0]
+        select_sql = f"SELECT {self._ROW_COLUMNS} FROM contacts WHERE user_id = ? ORDER BY {order_by}"
+        
+        try:
+            cursor = self._tuple_cursor()
+            cursor.execute(select_sql, (self.current_user_id,))
+            return self._to_contact_rows(cursor.fetchall())
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to retrieve contacts: {e}")
+    
+    def get_contacts_page(self, after_key: Optional[Tuple] = None, limit: int = 50,
+                          sort_by: str = "name") -> Tuple[List[ContactRow], Optional[Tuple]]:
+        """
+        Retrieve one page of the current user's contacts using keyset pagination.
+        
+        Each page continues strictly after the key of the previous page's last
+        row, walking the (user_id, name, id) or (user_id, created_at, id) index,
+        so the cost of a page depends on its size and not on its position.
+        
+        Args:
+            after_key: Key returned with the previous page, or None for the first page
+            limit: Maximum number of contacts to return
+            sort_by: Sorting criteria ("name" for alphabetical, "recent" for creation date)
+            
+        Returns:
+            Tuple[List[ContactRow], Optional[Tuple]]: (contacts, next_key) - next_key
+            is None when there are no further pages
             
-        select_sql = "SELECT * FROM contacts WHERE user_id = ? ORDER BY name"
+        Raises:
+            RuntimeError: If database query fails
+            ValueError: If limit is not positive
+        """
+        if limit <= 0:
+            raise ValueError("Page limit must be positive")
+        
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        order_by, keyset_predicate, key_column = self._PAGE_ORDERINGS.get(
+            sort_by, self._PAGE_ORDERINGS["name"]
+        )
+        
+        params = [self.current_user_id]
+        where = "user_id = ?"
+        if after_key is not None:
+            key_value, key_id = after_key
+            where += f" AND {keyset_predicate}"
+            params.extend((key_value, key_value, key_id))
+        params.append(limit + 1)  # One extra row tells whether another page exists
+        
+        select_sql = f"SELECT {self._ROW_COLUMNS} FROM contacts WHERE {where} ORDER BY {order_by} LIMIT ?"
+        
+        try:
+            cursor = self._tuple_cursor()
+            cursor.execute(select_sql, params)
+            rows = cursor.fetchall()
+            
+            next_key = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last_row = rows[-1]
+                next_key = (last_row[ContactRow.COLUMNS.index(key_column)], last_row[0])
+            
+            return self._to_contact_rows(rows), next_key
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to retrieve contacts page: {e}")
+    
+    # Columns ordered by for each ContactQuery sort key, and whether the key
+    # sorts descending by default. Each matches a per-user composite index.
+    _QUERY_ORDERINGS = {
+        "name": (("c.name COLLATE NOCASE", "c.id"), False),
+        "recent": (("c.created_at", "c.id"), True),
+        "company": (("COALESCE(c.company, '') COLLATE NOCASE", "c.name COLLATE NOCASE", "c.id"), False),
+    }
+    
+    def query_contacts(self, query: ContactQuery) -> List[ContactRow]:
+        """
+        Retrieve the current user's contacts selected by a ContactQuery.
+        
+        The query is compiled into one parameterized statement: text goes
+        through the FTS5 indexes (as in search_contacts), the other filters
+        and the ordering use the per-user composite indexes, and limit and
+        offset are applied by SQLite, so no filtering or sorting is left to
+        the caller.
+        
+        Args:
+            query: Filters, sort order and window to apply
+        
+        Returns:
+            List of matching ContactRow objects in the requested order
+        
+        Raises:
+            RuntimeError: If database query fails
+            ValueError: If the sort key is unknown or limit or offset is negative
+        """
+        if query.sort_by not in self._QUERY_ORDERINGS:
+            raise ValueError(f"Unknown sort key: {query.sort_by}")
+        if (query.limit is not None and query.limit < 0) or query.offset < 0:
+            raise ValueError("Limit and offset cannot be negative")
+        
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        conditions = ["c.user_id = ?"]
+        params: list = [self.current_user_id]
+        
+        if query.text.strip():
+            text_condition, text_params = self._text_condition(query.text)
+            conditions.append(text_condition)
+            params.extend(text_params)
+        if query.category:
+            conditions.append("c.category = ?")
+            params.append(query.category)
+        if query.company:
+            conditions.append("COALESCE(c.company, '') = ? COLLATE NOCASE")
+            params.append(query.company)
+        if query.created_from is not None:
+            conditions.append("c.created_at >= ?")
+            params.append(query.created_from.isoformat())
+        if query.created_to is not None:
+            conditions.append("c.created_at < ?")
+            params.append(query.created_to.isoformat())
+        
+        columns, natural_descending = self._QUERY_ORDERINGS[query.sort_by]
+        descending = natural_descending if query.descending is None else query.descending
+        direction = " DESC" if descending else ""
+        order_by = ", ".join(column + direction for column in columns)
+        
+        params.extend((-1 if query.limit is None else query.limit, query.offset))
+        select_sql = f"""
+        SELECT {self._JOINED_ROW_COLUMNS} FROM contacts c
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {order_by} LIMIT ? OFFSET ?
+        """
+        
+        try:
+            cursor = self._tuple_cursor()
+            cursor.execute(select_sql, params)
+            return self._to_contact_rows(cursor.fetchall())
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to query contacts: {e}")
+    
+    def _text_condition(self, text: str) -> Tuple[str, list]:
+        """
+        Compile search text into a WHERE condition on contacts aliased as c.
+        
+        Words match by prefix through the FTS5 index and phone-like text
+        matches phone numbers by digits, with the same semantics as
+        search_contacts.
+        
+        Args:
+            text: Non-blank search text
+        
+        Returns:
+            Tuple[str, list]: SQL condition and its parameters
+        """
+        alternatives = []
+        params = []
+        
+        if self.fts_enabled:
+            match_expression = self._build_match_expression(text)
+            if match_expression:
+                alternatives.append("c.id IN (SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ?)")
+                params.append(match_expression)
+        else:
+            alternatives.append("c.name LIKE ? OR c.phone LIKE ?")
+            params.extend((f"%{text}%", f"%{text}%"))
+        
+        digits = phone_query_digits(text)
+        if digits and self.phone_fts_enabled and len(digits) >= 3:
+            alternatives.append("c.id IN (SELECT rowid FROM contacts_phone_fts WHERE contacts_phone_fts MATCH ?)")
+            params.append(f'"{digits}"')
+        elif digits:
+            alternatives.append("c.phone_digits LIKE ?")
+            params.append(f"%{digits}%")
+        
+        if not alternatives:
+            return "0", params  # Nothing searchable, e.g. only punctuation
+        return "(" + " OR ".join(alternatives) + ")", params
+    
+    def iter_contact_batches(self, batch_size: int = 1000,
+                             sort_by: str = "name") -> Iterator[List[sqlite3.Row]]:
+        """
+        Stream the current user's contact rows in batches.
+        
+        Rows are pulled from the cursor with fetchmany and handed out as raw
+        sqlite3.Row objects (no Contact objects or timestamp parsing), so memory
+        use stays bounded by the batch size however many contacts there are.
+        
+        Args:
+            batch_size: Number of rows per batch
+            sort_by: Sorting criteria ("name" for alphabetical, "recent" for creation date)
+            
+        Yields:
+            List[sqlite3.Row]: Rows with the columns id, name, phone, email, address,
+            company, job_title, category, created_at, updated_at
+            
+        Raises:
+            RuntimeError: If database query fails
+        """
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        order_by = self._PAGE_ORDERINGS.get(sort_by, self._PAGE_ORDERINGS["name"])[0]
+        select_sql = f"""
+        SELECT id, name, phone, email, address, company, job_title, category, created_at, updated_at
+        FROM contacts WHERE user_id = ? ORDER BY {order_by}
+        """
         
         try:
             cursor = self.connection.cursor()
             cursor.execute(select_sql, (self.current_user_id,))
-            rows = cursor.fetchall()
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield batch
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to read contacts: {e}")
+    
+    def iter_match_rows(self, batch_size: int = 5000) -> Iterator[List[tuple]]:
+        """
+        Stream the fields used to match duplicate contacts, as plain tuples.
+
+        Args:
+            batch_size: Number of rows per batch
+
+        Yields:
+            List[tuple]: Rows of (id, name, phone_digits, phone_e164, email,
+            address, company, filled), where filled is the number of non-empty
+            phone, email, address, company and job title fields
+
+        Raises:
+            RuntimeError: If database query fails
+        """
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+
+        select_sql = """
+        SELECT id, name, COALESCE(phone_digits, ''), COALESCE(phone_e164, ''), COALESCE(email, ''),
+               COALESCE(address, ''), COALESCE(company, ''),
+               (COALESCE(phone, '') != '') + (COALESCE(email, '') != '') + (COALESCE(address, '') != '')
+               + (COALESCE(company, '') != '') + (COALESCE(job_title, '') != '')
+        FROM contacts WHERE user_id = ?
+        """
+
+        try:
+            cursor = self._tuple_cursor()
+            cursor.execute(select_sql, (self.current_user_id,))
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield batch
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to read contacts: {e}")
+
+    def count_contacts(self) -> int:
+        """
+        Count the current user's contacts.
+        
+        Returns:
+            int: Number of contacts
             
-            return [self._row_to_contact(row) for row in rows]
+        Raises:
+            RuntimeError: If database query fails
+        """
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM contact_counts WHERE user_id = ?", (self.current_user_id,)
+            )
+            return cursor.fetchone()[0]
         except sqlite3.Error as e:
-            raise RuntimeError(f"Failed to retrieve contacts: {e}")
+            raise RuntimeError(f"Failed to count contacts: {e}")
+    
+    # Categories always reported by get_contact_facets, in display order
+    FACET_CATEGORIES = ('Family', 'Friends', 'Work')
+    
+    def get_contact_facets(self) -> Dict[str, int]:
+        """
+        Count the current user's contacts per category.
+        
+        The counts are maintained by triggers in the contact_counts table, so
+        this reads a few rows regardless of the number of contacts.
+        
+        Returns:
+            Dict[str, int]: Contacts per category; every category in
+            FACET_CATEGORIES is present, plus any other category in use
+        
+        Raises:
+            RuntimeError: If database query fails
+        """
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "SELECT category, count FROM contact_counts WHERE user_id = ? AND count > 0",
+                (self.current_user_id,)
+            )
+            facets = dict.fromkeys(self.FACET_CATEGORIES, 0)
+            facets.update((row[0], row[1]) for row in cursor.fetchall())
+            return facets
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to count contacts by category: {e}")
     
     def update_contact(self, contact: Contact) -> bool:
         """
@@ -208,8 +653,8 @@ class ContactDatabase:
         
         update_sql = """
         UPDATE contacts 
-        SET name = ?, phone = ?, email = ?, address = ?, company = ?, 
-            job_title = ?, category = ?, updated_at = ?
+        SET name = ?, phone = ?, phone_digits = ?, phone_e164 = ?, email = ?, address = ?,
+            company = ?, job_title = ?, category = ?, updated_at = ?
         WHERE id = ?
         """
         
@@ -218,6 +663,8 @@ class ContactDatabase:
             cursor.execute(update_sql, (
                 contact.name,
                 contact.phone,
+                digits_only(contact.phone),
+                to_e164(contact.phone),
                 contact.email,
                 contact.address,
                 contact.company,
@@ -259,43 +706,282 @@ class ContactDatabase:
             self.connection.rollback()
             raise RuntimeError(f"Failed to delete contact: {e}")
     
-    def search_contacts(self, query: str) -> List[Contact]:
+    # Fields a merged contact takes from its duplicates when it has none itself
+    _MERGE_FILL_FIELDS = ("phone", "email", "address", "company", "job_title")
+    
+    def merge_contacts(self, keep_id: int, duplicate_ids: List[int]) -> Optional[Contact]:
+        """
+        Merge duplicate contacts into one, in a single transaction.
+        
+        The kept contact keeps its name and category. Each of its empty phone,
+        email, address, company and job title fields is filled from the most
+        recently updated duplicate that has one, it takes the earliest creation
+        date of the group, and the duplicates are deleted. Either all of this
+        is stored or, on error, nothing is.
+        
+        Args:
+            keep_id: ID of the contact to keep
+            duplicate_ids: IDs of the contacts merged into it
+        
+        Returns:
+            Contact: The merged contact, or None if any of the contacts does
+            not exist or belongs to another user (nothing is changed then)
+        
+        Raises:
+            ValueError: If there are no duplicates or keep_id is among them
+            RuntimeError: If the merge fails
+        """
+        duplicate_ids = list(dict.fromkeys(duplicate_ids))
+        if not duplicate_ids or keep_id in duplicate_ids:
+            raise ValueError("Merging needs duplicate IDs other than the kept contact's")
+        
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        ids = [keep_id] + duplicate_ids
+        placeholders = ", ".join("?" * len(ids))
+        
+        try:
+            cursor = self.connection.cursor()
+            if not self.connection.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                f"SELECT * FROM contacts WHERE user_id = ? AND id IN ({placeholders})",
+                [self.current_user_id] + ids
+            )
+            rows = {row['id']: row for row in cursor.fetchall()}
+            if len(rows) != len(ids):
+                self.connection.rollback()
+                return None
+            
+            kept = rows[keep_id]
+            duplicates = sorted((rows[contact_id] for contact_id in duplicate_ids),
+                                key=lambda row: row['updated_at'] or "", reverse=True)
+            merged = {field: kept[field] or "" for field in self._MERGE_FILL_FIELDS}
+            for field in self._MERGE_FILL_FIELDS:
+                if not merged[field]:
+                    merged[field] = next((row[field] for row in duplicates if row[field]), "")
+            created_at = min((row['created_at'] for row in rows.values() if row['created_at']),
+                             default=kept['created_at'])
+            
+            cursor.execute("""
+            UPDATE contacts
+            SET phone = ?, phone_digits = ?, phone_e164 = ?, email = ?, address = ?,
+                company = ?, job_title = ?, created_at = ?, updated_at = ?
+            WHERE id = ?
+            """, (
+                merged['phone'],
+                digits_only(merged['phone']),
+                to_e164(merged['phone']),
+                merged['email'],
+                merged['address'],
+                merged['company'],
+                merged['job_title'],
+                created_at,
+                datetime.now().isoformat(),
+                keep_id
+            ))
+            cursor.execute(
+                f"DELETE FROM contacts WHERE id IN ({', '.join('?' * len(duplicate_ids))})",
+                duplicate_ids
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            raise RuntimeError(f"Failed to merge contacts: {e}")
+        
+        return self.get_contact(keep_id)
+    
+    def search_contacts(self, query: str) -> List[ContactRow]:
         """
-        Search contacts by name or phone number for the current user.
+        Search contacts for the current user.
+        
+        Uses the FTS5 index over name, email, company, job title and address
+        with prefix matching on every query term, ranked by bm25 (name matches
+        weigh most). Phone-like queries (digits and formatting characters only)
+        additionally match phone numbers by their digits, so "555-12" finds
+        "(555) 123-4567" while "Room 101" does not match every phone with 101.
         
         Args:
             query: Search query string
             
         Returns:
-            List of matching Contact objects
+            List of matching ContactRow objects, best matches first
             
         Raises:
             RuntimeError: If search query fails
         """
         if self.connection is None:
             raise RuntimeError("Database connection is closed")
+        
+        if not self.fts_enabled:
+            return self._search_contacts_like(query)
+        
+        fts_sql = f"""
+        SELECT {self._JOINED_ROW_COLUMNS} FROM contacts_fts
+        JOIN contacts c ON c.id = contacts_fts.rowid
+        WHERE contacts_fts MATCH ? AND c.user_id = ?
+        ORDER BY bm25(contacts_fts, 10.0, 2.0, 2.0, 1.0, 1.0), c.name
+        """
+        try:
+            cursor = self._tuple_cursor()
+            rows = []
+            
+            match_expression = self._build_match_expression(query)
+            if match_expression:
+                cursor.execute(fts_sql, (match_expression, self.current_user_id))
+                rows.extend(cursor.fetchall())
+            
+            digits = phone_query_digits(query)
+            if digits:
+                seen_ids = {row[0] for row in rows}
+                rows.extend(row for row in self._search_phone_rows(cursor, digits)
+                            if row[0] not in seen_ids)
+            
+            return self._to_contact_rows(rows)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to search contacts: {e}")
+    
+    def _search_phone_rows(self, cursor: sqlite3.Cursor, digits: str) -> List[tuple]:
+        """
+        Find the current user's contacts whose phone digits contain a digit string.
+        
+        Three or more digits go through the trigram index. Shorter queries
+        (or builds without trigram support) use a prefix range on the
+        (user_id, phone_digits) index plus a scan of the user's phone digits.
+        
+        Args:
+            cursor: Cursor to run the queries on
+            digits: Digits-only query
+            
+        Returns:
+            List of matching rows (ContactRow columns) ordered by name
+        """
+        if self.phone_fts_enabled and len(digits) >= 3:
+            cursor.execute(f"""
+            SELECT {self._JOINED_ROW_COLUMNS} FROM contacts_phone_fts
+            JOIN contacts c ON c.id = contacts_phone_fts.rowid
+            WHERE contacts_phone_fts MATCH ? AND c.user_id = ?
+            ORDER BY c.name
+            """, (f'"{digits}"', self.current_user_id))
+            return cursor.fetchall()
+        
+        # Prefix matches come straight off the index; ':' sorts right after '9'
+        cursor.execute(f"""
+        SELECT {self._ROW_COLUMNS} FROM contacts
+        WHERE user_id = ? AND phone_digits >= ? AND phone_digits < ?
+        ORDER BY name
+        """, (self.current_user_id, digits, digits + ":"))
+        rows = cursor.fetchall()
+        
+        cursor.execute(f"""
+        SELECT {self._ROW_COLUMNS} FROM contacts
+        WHERE user_id = ? AND phone_digits LIKE ? AND NOT (phone_digits >= ? AND phone_digits < ?)
+        ORDER BY name
+        """, (self.current_user_id, f"%{digits}%", digits, digits + ":"))
+        rows.extend(cursor.fetchall())
+        return rows
+    
+    def find_contacts_by_phone(self, phone: str) -> List[ContactRow]:
+        """
+        Find the current user's contacts with exactly this phone number.
+        
+        Numbers are compared in E.164 form, so "(555) 123-4567" and
+        "+1 555 123 4567" match each other. Numbers that cannot be normalized
+        are compared by their digits instead.
+        
+        Args:
+            phone: Phone number in any format
             
-        search_sql = """
-        SELECT * FROM contacts 
-        WHERE user_id = ? AND (LOWER(name) LIKE LOWER(?) OR phone LIKE ?)
+        Returns:
+            List of matching ContactRow objects ordered by name
+            
+        Raises:
+            RuntimeError: If the lookup fails
+        """
+        if self.connection is None:
+            raise RuntimeError("Database connection is closed")
+        
+        e164 = to_e164(phone)
+        if e164:
+            lookup_sql = f"SELECT {self._ROW_COLUMNS} FROM contacts WHERE user_id = ? AND phone_e164 = ? ORDER BY name"
+            value = e164
+        else:
+            lookup_sql = f"SELECT {self._ROW_COLUMNS} FROM contacts WHERE user_id = ? AND phone_digits = ? ORDER BY name"
+            value = digits_only(phone)
+            if not value:
+                return []
+        
+        try:
+            cursor = self._tuple_cursor()
+            cursor.execute(lookup_sql, (self.current_user_id, value))
+            return self._to_contact_rows(cursor.fetchall())
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to find contacts by phone: {e}")
+    
+    def _search_contacts_like(self, query: str) -> List[ContactRow]:
+        """Search contacts with LIKE scans (used when FTS5 is unavailable)."""
+        search_sql = f"""
+        SELECT {self._ROW_COLUMNS} FROM contacts 
+        WHERE user_id = ? AND (LOWER(name) LIKE LOWER(?) OR phone LIKE ? OR phone_digits LIKE ?)
         ORDER BY name
         """
         
         try:
-            cursor = self.connection.cursor()
+            cursor = self._tuple_cursor()
             search_pattern = f"%{query}%"
-            cursor.execute(search_sql, (self.current_user_id, search_pattern, search_pattern))
-            rows = cursor.fetchall()
-            
-            return [self._row_to_contact(row) for row in rows]
+            digits = phone_query_digits(query)
+            digits_pattern = f"%{digits}%" if digits else None
+            cursor.execute(search_sql, (self.current_user_id, search_pattern, search_pattern, digits_pattern))
+            return self._to_contact_rows(cursor.fetchall())
         except sqlite3.Error as e:
             raise RuntimeError(f"Failed to search contacts: {e}")
     
+    @staticmethod
+    def _build_match_expression(query: str) -> str:
+        """
+        Build an FTS5 MATCH expression from free-form user input.
+        
+        Every word becomes a quoted prefix query and all words must match,
+        so "jo smi" finds "John Smith". Quoting keeps FTS5 operators and
+        punctuation typed by the user from being interpreted as syntax.
+        
+        Args:
+            query: Raw search text
+            
+        Returns:
+            str: MATCH expression, or an empty string if the query has no words
+        """
+        terms = re.findall(r'\w+', query.lower())
+        return " ".join(f'"{term}"*' for term in terms)
+    
     def close_connection(self) -> None:
-        """Close the database connection."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """
+        Close the database connection.
+        
+        The underlying pooled connections stay open for other components
+        sharing the database file; this instance just stops using them.
+        """
+        self._closed = True
+    
+    def _tuple_cursor(self) -> sqlite3.Cursor:
+        """Return a cursor yielding plain tuples, for building ContactRow objects."""
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        return cursor
+    
+    @staticmethod
+    def _to_contact_rows(rows: List[tuple]) -> List[ContactRow]:
+        """
+        Convert plain tuples (in ContactRow.COLUMNS order) to ContactRow objects.
+        
+        Args:
+            rows: Rows fetched from a tuple cursor
+            
+        Returns:
+            List of ContactRow objects
+        """
+        return list(starmap(ContactRow, rows))
     
     def _row_to_contact(self, row: sqlite3.Row) -> Contact:
         """
@@ -0,0 +1,340 @@
+"""
+Duplicate contact detection for the SmartConnect Contact Management System.
+
+This module provides the ContactDeduplicator class, which finds likely
+duplicates in the current user's contacts without comparing every pair.
+Candidate pairs come from blocking (contacts sharing a phone number, an email
+address or a phonetic name code) and from a sorted-neighborhood pass over the
+contacts ordered by name; only those pairs are scored. Merging is done by
+ContactManager.merge_contacts, in one database transaction.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+from database import ContactDatabase
+from fuzzy_index import name_tokens
+
+
+# American Soundex digit of each letter; vowels, H, W and Y have none
+_SOUNDEX_CODES = {
+    **dict.fromkeys("BFPV", "1"), **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"), "L": "4", **dict.fromkeys("MN", "5"), "R": "6",
+}
+
+
+@lru_cache(maxsize=65536)
+def soundex(word: str) -> str:
+    """
+    Compute the American Soundex code of a word.
+
+    Args:
+        word: Word to encode; characters other than ASCII letters are ignored
+
+    Returns:
+        str: Code such as "R163" for "Robert", or an empty string if the word
+        has no letters
+    """
+    letters = [char for char in word.upper() if "A" <= char <= "Z"]
+    if not letters:
+        return ""
+
+    code = [letters[0]]
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        # H and W do not separate letters with the same code; vowels do
+        if char not in "HW":
+            previous = digit
+    return "".join(code).ljust(4, "0")
+
+
+def name_phonetic_key(name: str) -> str:
+    """
+    Phonetic blocking key of a name: Soundex of its first and last words.
+
+    Args:
+        name: Contact name
+
+    Returns:
+        str: Key such as "J500 S530" for "John Smith" (and "Jon Smyth"), or an
+        empty string if the name has no letters
+    """
+    codes = [code for code in map(soundex, name_tokens(name)) if code]
+    if len(codes) > 1:
+        return f"{codes[0]} {codes[-1]}"
+    return codes[0] if codes else ""
+
+
+@dataclass(frozen=True)
+class DuplicateCandidate:
+    """
+    A pair of contacts that are probably the same person.
+
+    Attributes:
+        keep_id: ID of the contact suggested to keep (the more complete one,
+            or the older one if they are equally complete)
+        duplicate_id: ID of the contact suggested to merge into it
+        score: Confidence between 0 and 1
+        reasons: Human-readable evidence, e.g. ("same phone", "same name")
+    """
+    keep_id: int
+    duplicate_id: int
+    score: float
+    reasons: Tuple[str, ...]
+
+
+@lru_cache(maxsize=65536)
+def _name_keys(name: str) -> Tuple[str, str, FrozenSet[str]]:
+    """Normalized name, phonetic key and word set of a name (shared by equal names)."""
+    tokens = name_tokens(name)
+    return " ".join(tokens), name_phonetic_key(name), frozenset(tokens)
+
+
+class _DedupeRecord:
+    """Normalized fields of one contact, computed once before scoring."""
+
+    __slots__ = ("id", "name", "phonetic", "tokens", "phone", "phone_tail", "email", "email_user",
+                 "address", "company", "filled")
+
+    def __init__(self, contact_id: int, name: str, phone_digits: str, phone_e164: str,
+                 email: str, address: str, company: str, filled: int):
+        self.id = contact_id
+        self.name, self.phonetic, self.tokens = _name_keys(name)
+
+        self.phone = phone_e164 or phone_digits
+        # The local part of the number, for numbers written with and without a country code
+        self.phone_tail = phone_digits[-7:] if len(phone_digits) >= 7 else ""
+
+        self.email = email.strip().lower()
+        self.email_user = self.email.partition("@")[0]
+        self.address = " ".join(address.lower().split())
+        self.company = company.strip().lower()
+        self.filled = filled
+
+
+# Evidence found for a pair and its weight; the sum for a pair (capped at 1)
+# is its score. "similar name" is scaled by the share of name words in common.
+_EVIDENCE = (
+    ("same name", 0.5),
+    ("similar sounding name", 0.35),
+    ("similar name", 0.3),
+    ("same phone", 0.35),
+    ("same phone number ending", 0.2),
+    ("different phone", -0.15),
+    ("same email", 0.35),
+    ("same email user name", 0.15),
+    ("different email", -0.1),
+    ("same address", 0.15),
+    ("same company", 0.1),
+)
+(_SAME_NAME, _SOUNDS_LIKE, _SIMILAR_NAME, _SAME_PHONE, _PHONE_ENDING, _OTHER_PHONE,
+ _SAME_EMAIL, _EMAIL_USER, _OTHER_EMAIL, _SAME_ADDRESS, _SAME_COMPANY) = (
+    1 << bit for bit in range(len(_EVIDENCE)))
+_WEIGHT = {1 << bit: weight for bit, (_, weight) in enumerate(_EVIDENCE)}
+
+
+def _score(a: _DedupeRecord, b: _DedupeRecord) -> Tuple[float, int]:
+    """
+    Score how likely two contacts are the same person.
+
+    Args:
+        a: First contact
+        b: Second contact
+
+    Returns:
+        Tuple[float, int]: Score (at most 1) and the evidence found, as a
+        bit mask over _EVIDENCE (see _reasons)
+    """
+    if a.name and a.name == b.name:
+        found = _SAME_NAME
+        score = _WEIGHT[_SAME_NAME]
+    elif a.phonetic and a.phonetic == b.phonetic:
+        found = _SOUNDS_LIKE
+        score = _WEIGHT[_SOUNDS_LIKE]
+    else:
+        common = len(a.tokens & b.tokens)
+        found = _SIMILAR_NAME if common else 0
+        score = _WEIGHT[_SIMILAR_NAME] * common / len(a.tokens | b.tokens) if common else 0.0
+
+    if a.phone and b.phone:
+        evidence = _SAME_PHONE if a.phone == b.phone else (
+            _PHONE_ENDING if a.phone_tail and a.phone_tail == b.phone_tail else _OTHER_PHONE)
+        found |= evidence
+        score += _WEIGHT[evidence]
+
+    if a.email and b.email:
+        evidence = _SAME_EMAIL if a.email == b.email else (
+            _EMAIL_USER if a.email_user == b.email_user else _OTHER_EMAIL)
+        found |= evidence
+        score += _WEIGHT[evidence]
+
+    if a.address and a.address == b.address:
+        found |= _SAME_ADDRESS
+        score += _WEIGHT[_SAME_ADDRESS]
+    if a.company and a.company == b.company:
+        found |= _SAME_COMPANY
+        score += _WEIGHT[_SAME_COMPANY]
+
+    return min(score, 1.0), found
+
+
+@lru_cache(maxsize=None)
+def _reasons(found: int) -> Tuple[str, ...]:
+    """Names of the evidence in a bit mask returned by _score."""
+    return tuple(reason for bit, (reason, _) in enumerate(_EVIDENCE) if found >> bit & 1)
+
+
+class ContactDeduplicator:
+    """
+    Finds probable duplicate contacts of the database's current user.
+
+    Blocks of contacts sharing a key are compared pairwise while small; in a
+    block larger than max_block_size (e.g. everyone named "John Smith") each
+    contact is only compared with its window - 1 successors in name order,
+    as in the sorted-neighborhood pass. The number of scored pairs therefore
+    grows linearly with the number of contacts.
+    """
+
+    DEFAULT_WINDOW = 5
+    DEFAULT_MAX_BLOCK_SIZE = 50
+    DEFAULT_MIN_SCORE = 0.6
+
+    def __init__(self, database: ContactDatabase, window: int = DEFAULT_WINDOW,
+                 max_block_size: int = DEFAULT_MAX_BLOCK_SIZE):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            database: Database whose current user's contacts are checked
+            window: Size of the sorted-neighborhood window
+            max_block_size: Largest block whose contacts are all compared
+        """
+        if window < 2:
+            raise ValueError("Window must cover at least two contacts")
+        self.database = database
+        self.window = window
+        self.max_block_size = max(max_block_size, window)
+
+    def _load_records(self) -> List[_DedupeRecord]:
+        """Read the current user's contacts, sorted by normalized name."""
+        records = [
+            _DedupeRecord(*row)
+            for batch in self.database.iter_match_rows()
+            for row in batch
+        ]
+        records.sort(key=lambda record: (record.name, record.id))
+        return records
+
+    def _candidate_pairs(self, records: List[_DedupeRecord]) -> Set[int]:
+        """
+        Generate candidate pairs by blocking and sorted neighborhood.
+
+        Args:
+            records: Contacts sorted by name
+
+        Returns:
+            Set[int]: Pairs of positions i < j in records, encoded as i * len(records) + j
+        """
+        count = len(records)
+        window = self.window
+        pairs: Set[int] = set()
+
+        blocks: Dict[Tuple[str, str], List[int]] = {}
+        for position, record in enumerate(records):
+            for key in (("phone", record.phone), ("email", record.email), ("name", record.phonetic)):
+                if key[1]:
+                    blocks.setdefault(key, []).append(position)
+
+        for members in blocks.values():
+            size = len(members)
+            if size < 2:
+                continue
+            # Members are in name order, since positions are
+            span = size if size <= self.max_block_size else window
+            for offset, first in enumerate(members):
+                base = first * count
+                pairs.update([base + second for second in members[offset + 1:offset + span]])
+
+        # Sorted neighborhood over all contacts, catching pairs no key shares
+        for first in range(count - 1):
+            base = first * count
+            pairs.update(range(base + first + 1, base + min(count, first + window)))
+
+        return pairs
+
+    def find_duplicates(self, min_score: float = DEFAULT_MIN_SCORE) -> List[DuplicateCandidate]:
+        """
+        Find probable duplicate pairs among the current user's contacts.
+
+        Args:
+            min_score: Lowest score reported, between 0 and 1
+
+        Returns:
+            List[DuplicateCandidate]: Pairs ordered by descending score
+
+        Raises:
+            RuntimeError: If the contacts cannot be read
+        """
+        records = self._load_records()
+        count = len(records)
+        candidates = []
+
+        score_pair = _score
+        for pair in self._candidate_pairs(records):
+            first, second = divmod(pair, count)
+            a, b = records[first], records[second]
+            score, found = score_pair(a, b)
+            if score < min_score:
+                continue
+            keep, duplicate = (a, b) if (-a.filled, a.id) <= (-b.filled, b.id) else (b, a)
+            candidates.append(DuplicateCandidate(
+                keep_id=keep.id,
+                duplicate_id=duplicate.id,
+                score=round(score, 3),
+                reasons=_reasons(found)
+            ))
+
+        candidates.sort(key=lambda candidate: (-candidate.score, candidate.keep_id, candidate.duplicate_id))
+        return candidates
+
+    @staticmethod
+    def group_duplicates(candidates: Iterable[DuplicateCandidate]) -> List[List[int]]:
+        """
+        Combine duplicate pairs into groups of contacts that are all the same person.
+
+        Args:
+            candidates: Pairs accepted as duplicates
+
+        Returns:
+            List[List[int]]: Contact IDs per group; the first ID is the
+            contact to keep (the one most often suggested to keep in the group)
+        """
+        parent: Dict[int, int] = {}
+        keep_votes: Dict[int, int] = {}
+
+        def find(contact_id: int) -> int:
+            root = contact_id
+            while parent.setdefault(root, root) != root:
+                root = parent[root]
+            while parent[contact_id] != root:
+                parent[contact_id], contact_id = root, parent[contact_id]
+            return root
+
+        for candidate in candidates:
+            keep_votes[candidate.keep_id] = keep_votes.get(candidate.keep_id, 0) + 1
+            parent[find(candidate.duplicate_id)] = find(candidate.keep_id)
+
+        groups: Dict[int, List[int]] = {}
+        for contact_id in parent:
+            groups.setdefault(find(contact_id), []).append(contact_id)
+
+        return sorted(
+            (sorted(members, key=lambda contact_id: (-keep_votes.get(contact_id, 0), contact_id))
+             for members in groups.values()),
+            key=lambda members: members[0]
+        )
@@ -0,0 +1,100 @@
+"""
+Contact change events for the SmartConnect Contact Management System.
+
+This module provides the ContactEvent record that ContactManager publishes
+after every successful change, and the ContactEventBus used to subscribe to
+them, so views and search indexes can patch themselves instead of reloading
+every contact.
+"""
+
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, List, Optional
+from models import ContactRow
+
+
+class ContactEventType(Enum):
+    """Kinds of contact changes."""
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    RELOADED = "reloaded"  # Many contacts changed at once (e.g. a bulk import)
+
+
+@dataclass(frozen=True)
+class ContactEvent:
+    """
+    A change to one user's contacts.
+
+    Attributes:
+        type: Kind of change
+        user_id: ID of the user owning the contacts
+        contact_id: ID of the affected contact (None for RELOADED)
+        contact: The contact after the change, or as it was before deletion
+            (None for RELOADED)
+    """
+    type: ContactEventType
+    user_id: int
+    contact_id: Optional[int] = None
+    contact: Optional[ContactRow] = None
+
+
+ContactEventHandler = Callable[[ContactEvent], None]
+
+
+class ContactEventBus:
+    """
+    Synchronous publish/subscribe channel for contact change events.
+
+    Handlers run on the publishing thread, in subscription order. A failing
+    handler is reported and skipped so it cannot undo a change that has
+    already been committed or keep later handlers from running.
+    """
+
+    def __init__(self):
+        """Initialize a bus without subscribers."""
+        self._handlers: List[ContactEventHandler] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler: ContactEventHandler) -> Callable[[], None]:
+        """
+        Register a handler for all future events.
+
+        Args:
+            handler: Called with each published ContactEvent
+
+        Returns:
+            Callable[[], None]: Function that unsubscribes the handler
+        """
+        with self._lock:
+            if handler not in self._handlers:
+                self._handlers.append(handler)
+        return lambda: self.unsubscribe(handler)
+
+    def unsubscribe(self, handler: ContactEventHandler) -> None:
+        """
+        Stop delivering events to a handler.
+
+        Args:
+            handler: Previously subscribed handler
+        """
+        with self._lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    def publish(self, event: ContactEvent) -> None:
+        """
+        Deliver an event to every subscribed handler.
+
+        Args:
+            event: Event to deliver
+        """
+        with self._lock:
+            handlers = list(self._handlers)
+
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"Contact event handler failed on {event.type.value} event: {e}")
@@ -0,0 +1,351 @@
+"""
+Typo-tolerant search index for the SmartConnect Contact Management System.
+
+This module provides the ContactFuzzyIndex class, a per-user trie over the
+words of contact names searched with a Levenshtein automaton. Queries are
+matched word by word within a bounded edit distance, so "jonh smtih" still
+finds "John Smith".
+"""
+
+import re
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from models import ContactRow
+
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def name_tokens(name: str) -> List[str]:
+    """Split a name into lower-cased words."""
+    return _WORD_PATTERN.findall((name or "").lower())
+
+
+class _WordTrie:
+    """
+    Character trie of words supporting bounded edit-distance search.
+
+    A search walks the trie while carrying the last rows of the edit-distance
+    dynamic-programming table per node, i.e. it simulates a Levenshtein
+    automaton for the query over the trie. Rows are shared by every word
+    with the same prefix, and a subtree is abandoned as soon as no cell of
+    its row is within the edit budget, so only a small part of the trie is
+    visited.
+    """
+
+    __slots__ = ('root', 'size')
+
+    # Key under which a node stores the word ending at it
+    WORD = None
+
+    def __init__(self):
+        self.root: dict = {}
+        self.size = 0
+
+    def add(self, word: str) -> None:
+        """Insert a word (no-op if already present)."""
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        if self.WORD not in node:
+            node[self.WORD] = word
+            self.size += 1
+
+    def remove(self, word: str) -> None:
+        """Remove a word, pruning nodes left empty."""
+        path = []
+        node = self.root
+        for char in word:
+            child = node.get(char)
+            if child is None:
+                return
+            path.append((node, char))
+            node = child
+        if node.pop(self.WORD, None) is None:
+            return
+        self.size -= 1
+
+        for parent, char in reversed(path):
+            if parent[char]:
+                break
+            del parent[char]
+
+    def search(self, word: str, max_edits: int) -> List[Tuple[int, str]]:
+        """
+        Return (distance, word) for every stored word within max_edits of word.
+
+        Distances count insertions, deletions, substitutions and transpositions
+        of adjacent characters (optimal string alignment), so "jonh" is one
+        edit away from "john".
+        """
+        matches = []
+        first_row = list(range(len(word) + 1))
+        stack = [(child, char, first_row, None, None)
+                 for char, child in self.root.items() if char is not self.WORD]
+
+        # Hot loop: plain comparisons instead of min() roughly halve query time
+        while stack:
+            node, char, previous, before_previous, previous_char = stack.pop()
+            left = previous[0] + 1
+            row = [left]
+            lowest = left
+            for j in range(1, len(word) + 1):
+                query_char = word[j - 1]
+                cost = previous[j - 1] if query_char == char else previous[j - 1] + 1  # substitution
+                if previous[j] + 1 < cost:
+                    cost = previous[j] + 1                                          # deletion
+                if left + 1 < cost:
+                    cost = left + 1                                                 # insertion
+                if (before_previous is not None and j > 1 and query_char == previous_char
+                        and word[j - 2] == char and before_previous[j - 2] + 1 < cost):
+                    cost = before_previous[j - 2] + 1                               # transposition
+                row.append(cost)
+                left = cost
+                if cost < lowest:
+                    lowest = cost
+
+            if left <= max_edits and self.WORD in node:
+                matches.append((left, node[self.WORD]))
+            if lowest <= max_edits:
+                stack.extend((child, key, row, previous, char)
+                             for key, child in node.items() if key is not self.WORD)
+        return matches
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        """Return every stored word starting with prefix."""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        words = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is self.WORD:
+                    words.append(child)
+                else:
+                    stack.append(child)
+        return words
+
+
+class _FuzzyBook:
+    """Word trie, word postings and indexed contacts for a single user."""
+
+    __slots__ = ('contacts', 'sort_keys', 'names', 'postings', 'trie')
+
+    def __init__(self):
+        self.contacts: Dict[int, ContactRow] = {}
+        self.sort_keys: Dict[int, str] = {}
+        self.names: Dict[int, List[str]] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        self.trie = _WordTrie()
+
+
+class ContactFuzzyIndex:
+    """
+    Per-user typo-tolerant index over the words of contact names.
+
+    Every query word is matched against the distinct name words of the user's
+    contacts, either as a prefix or within an edit budget scaled to the word's
+    length (short words are matched exactly, since a couple of edits would
+    match almost anything). Swapping two adjacent letters counts as one edit.
+    A contact matches when every query word matches one of its name words.
+
+    Results are ranked by total edit distance, then by how many query words
+    matched only fuzzily rather than as a prefix, then by name. Prefix matches
+    count as zero edits, so partially typed names rank with exact ones.
+
+    On a 100,000-contact book, misspelled-name queries take a few
+    milliseconds. Very short prefixes matching a large share of the book cost
+    more, mostly in ordering the results.
+
+    Like ContactSearchIndex, the index is built once per user and then kept
+    current through add_contact, update_contact and remove_contact.
+    """
+
+    # Words shorter than this many characters per allowed edit get fewer edits
+    CHARS_PER_EDIT = 3
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._books: Dict[int, _FuzzyBook] = {}
+        self._lock = threading.RLock()
+
+    def is_built(self, user_id: int) -> bool:
+        """Check whether the index for a user has been built."""
+        with self._lock:
+            return user_id in self._books
+
+    def build(self, user_id: int, contacts: Iterable[ContactRow],
+              is_current: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Build (or rebuild) the index for a user from their contacts.
+
+        Args:
+            user_id: ID of the user owning the contacts
+            contacts: All contacts of the user
+            is_current: Called under the index lock just before the new index
+                is installed; if it returns False, a change was published
+                after the contacts were read, and the build is discarded
+
+        Returns:
+            bool: Whether the index was installed
+        """
+        book = _FuzzyBook()
+        for contact in contacts:
+            self._index_contact(book, contact)
+
+        with self._lock:
+            # Changes published after this check wait for the lock, then apply to the new book
+            if is_current is not None and not is_current():
+                return False
+            self._books[user_id] = book
+            return True
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """
+        Drop the index for a user, or for all users if no ID is given.
+
+        Args:
+            user_id: ID of the user whose index should be dropped
+        """
+        with self._lock:
+            if user_id is None:
+                self._books.clear()
+            else:
+                self._books.pop(user_id, None)
+
+    def add_contact(self, user_id: int, contact: ContactRow) -> None:
+        """
+        Add a newly created contact to a user's index.
+
+        Does nothing if the user's index has not been built yet; it will
+        include the contact when it is built.
+
+        Args:
+            user_id: ID of the user owning the contact
+            contact: ContactRow with a database ID
+        """
+        with self._lock:
+            book = self._books.get(user_id)
+            if book is not None and contact.id is not None:
+                self._unindex_contact(book, contact.id)
+                self._index_contact(book, contact)
+
+    def update_contact(self, user_id: int, contact: ContactRow) -> None:
+        """
+        Replace an indexed contact with its updated version.
+
+        Args:
+            user_id: ID of the user owning the contact
+            contact: Updated contact row with a database ID
+        """
+        self.add_contact(user_id, contact)
+
+    def remove_contact(self, user_id: int, contact_id: int) -> None:
+        """
+        Remove a deleted contact from a user's index.
+
+        Args:
+            user_id: ID of the user owning the contact
+            contact_id: ID of the deleted contact
+        """
+        with self._lock:
+            book = self._books.get(user_id)
+            if book is not None:
+                self._unindex_contact(book, contact_id)
+
+    def search(self, user_id: int, query: str, max_edits: int = 2) -> List[ContactRow]:
+        """
+        Find contacts whose name approximately matches the query.
+
+        Args:
+            user_id: ID of the user whose contacts are searched
+            query: One or more (possibly misspelled) name words
+            max_edits: Maximum edits allowed per query word
+
+        Returns:
+            List of matching ContactRow objects, best matches first
+        """
+        terms = name_tokens(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            book = self._books.get(user_id)
+            if book is None:
+                return []
+
+            # contact ID -> (total distance, number of terms matched only fuzzily)
+            scores: Optional[Dict[int, Tuple[int, int]]] = None
+            for term in terms:
+                term_scores = self._match_term(book, term, max_edits)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        contact_id: (distance + term_scores[contact_id][0],
+                                     misses + term_scores[contact_id][1])
+                        for contact_id, (distance, misses) in scores.items()
+                        if contact_id in term_scores
+                    }
+                if not scores:
+                    return []
+
+            # Sort by name, then stably by score; C-level keys keep broad queries fast
+            ranked = sorted(scores, key=book.sort_keys.__getitem__)
+            ranked.sort(key=scores.__getitem__)
+            return list(map(book.contacts.__getitem__, ranked))
+
+    def _match_term(self, book: _FuzzyBook, term: str, max_edits: int) -> Dict[int, Tuple[int, int]]:
+        """
+        Match one query word against a book's name words.
+
+        Returns:
+            Dict mapping contact ID to (edit distance, 0 if prefix match else 1)
+        """
+        word_scores: Dict[str, Tuple[int, int]] = {}
+
+        allowed = min(max_edits, len(term) // self.CHARS_PER_EDIT)
+        for distance, word in book.trie.search(term, allowed):
+            word_scores[word] = (distance, 1)
+        for word in book.trie.with_prefix(term):
+            word_scores[word] = (0, 0)
+
+        # Apply the worst scores first so each contact ends up with its best one
+        term_scores: Dict[int, Tuple[int, int]] = {}
+        for word, score in sorted(word_scores.items(), key=lambda item: item[1], reverse=True):
+            term_scores.update(dict.fromkeys(book.postings[word], score))
+        return term_scores
+
+    def _index_contact(self, book: _FuzzyBook, contact: ContactRow) -> None:
+        """Add a contact's name words to a book index."""
+        words = name_tokens(contact.name)
+        book.contacts[contact.id] = contact
+        book.sort_keys[contact.id] = (contact.name or "").lower()
+        book.names[contact.id] = words
+
+        for word in words:
+            posting = book.postings.get(word)
+            if posting is None:
+                posting = book.postings[word] = set()
+                book.trie.add(word)
+            posting.add(contact.id)
+
+    def _unindex_contact(self, book: _FuzzyBook, contact_id: int) -> None:
+        """Remove a contact and its word postings from a book index."""
+        if book.contacts.pop(contact_id, None) is None:
+            return
+        del book.sort_keys[contact_id]
+
+        for word in book.names.pop(contact_id):
+            posting = book.postings.get(word)
+            if posting is None:
+                continue
+            posting.discard(contact_id)
+            if not posting:
+                del book.postings[word]
+                book.trie.remove(word)
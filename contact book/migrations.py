@@ -0,0 +1,491 @@
+"""
+Schema migrations for the SmartConnect Contact Management System.
+
+The database schema is changed only by the numbered migrations in MIGRATIONS.
+The number of the last migration applied is stored in the file's
+``PRAGMA user_version``; get_schema applies the missing ones once per process
+and database file, each in its own transaction, then returns the cached
+SchemaCapabilities, so no request path needs to inspect the schema.
+
+Databases created before migrations existed have user_version 0 and may be in
+any earlier layout, so the first migrations check what already exists. New
+migrations are appended to MIGRATIONS and must never be edited once released.
+"""
+
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Set
+from connection_pool import get_pool
+from phone_utils import digits_only, to_e164
+
+
+FTS_INSERT_TRIGGER_SQL = """
+CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts BEGIN
+    INSERT INTO contacts_fts (rowid, name, email, company, job_title, address)
+    VALUES (new.id, new.name, new.email, new.company, new.job_title, new.address);
+END
+"""
+
+FTS_BULK_FILL_SQL = """
+INSERT INTO contacts_fts (rowid, name, email, company, job_title, address)
+SELECT id, name, email, company, job_title, address FROM contacts WHERE id >= ?
+"""
+
+PHONE_FTS_INSERT_TRIGGER_SQL = """
+CREATE TRIGGER IF NOT EXISTS contacts_phone_fts_insert AFTER INSERT ON contacts BEGIN
+    INSERT INTO contacts_phone_fts (rowid, phone_digits) VALUES (new.id, new.phone_digits);
+END
+"""
+
+PHONE_FTS_BULK_FILL_SQL = """
+INSERT INTO contacts_phone_fts (rowid, phone_digits)
+SELECT id, phone_digits FROM contacts WHERE id >= ?
+"""
+
+CONTACT_COUNTS_INSERT_TRIGGER_SQL = """
+CREATE TRIGGER IF NOT EXISTS contact_counts_insert AFTER INSERT ON contacts BEGIN
+    INSERT OR IGNORE INTO contact_counts (user_id, category) VALUES (new.user_id, COALESCE(new.category, ''));
+    UPDATE contact_counts SET count = count + 1
+    WHERE user_id = new.user_id AND category = COALESCE(new.category, '');
+END
+"""
+
+CONTACT_COUNTS_BULK_FILL_SQL = """
+INSERT OR REPLACE INTO contact_counts (user_id, category, count)
+SELECT added.user_id, added.category, added.count + COALESCE(
+    (SELECT count FROM contact_counts AS counts
+     WHERE counts.user_id = added.user_id AND counts.category = added.category), 0)
+FROM (SELECT user_id, COALESCE(category, '') AS category, COUNT(*) AS count
+      FROM contacts WHERE id >= ? GROUP BY user_id, COALESCE(category, '')) AS added
+"""
+
+
+def _table_exists(cursor: sqlite3.Cursor, table: str) -> bool:
+    """Check whether a table exists."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return cursor.fetchone() is not None
+
+
+def _columns(cursor: sqlite3.Cursor, table: str) -> Set[str]:
+    """Return the column names of a table."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _migrate_auth_tables(cursor: sqlite3.Cursor) -> None:
+    """Create the users, user_sessions and auth_activity tables."""
+    if _table_exists(cursor, "users"):
+        # Tables from older versions of the app may lack any of these columns
+        existing_columns = _columns(cursor, "users")
+        for column, definition in (
+            ("name", "TEXT"),
+            ("email", "TEXT UNIQUE"),
+            ("password_hash", "TEXT"),
+            ("role", "TEXT DEFAULT 'user'"),
+            ("status", "TEXT DEFAULT 'active'"),
+            ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+            ("last_login", "TIMESTAMP"),
+            ("failed_login_attempts", "INTEGER DEFAULT 0"),
+            ("suspension_end", "TIMESTAMP"),
+        ):
+            if column not in existing_columns:
+                cursor.execute(f"ALTER TABLE users ADD COLUMN {column} {definition}")
+    else:
+        cursor.execute("""
+            CREATE TABLE users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                password_hash TEXT NOT NULL,
+                role TEXT DEFAULT 'user' CHECK(role IN ('user', 'admin')),
+                status TEXT DEFAULT 'active' CHECK(status IN ('active', 'banned', 'suspended')),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_login TIMESTAMP,
+                failed_login_attempts INTEGER DEFAULT 0,
+                suspension_end TIMESTAMP
+            )
+        """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            session_token TEXT UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL,
+            is_active BOOLEAN DEFAULT 1,
+            ip_address TEXT,
+            user_agent TEXT,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS auth_activity (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            action TEXT NOT NULL,
+            details TEXT,
+            ip_address TEXT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE SET NULL
+        )
+    """)
+
+
+def _migrate_auth_indexes(cursor: sqlite3.Cursor) -> None:
+    """Index sessions and auth activity for login, session checks, admin queries and retention."""
+    # Tables created with UNIQUE(session_token) already have an index on it
+    cursor.execute("PRAGMA index_list(user_sessions)")
+    indexed_columns = set()
+    for index in cursor.fetchall():
+        cursor.execute(f"PRAGMA index_info('{index[1]}')")
+        first_column = cursor.fetchone()
+        if first_column:
+            indexed_columns.add(first_column[2])
+    if "session_token" not in indexed_columns:
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_token ON user_sessions (session_token)")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_user ON user_sessions (user_id, is_active)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_expiry ON user_sessions (is_active, expires_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_auth_activity_user_time ON auth_activity (user_id, timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_auth_activity_action_time ON auth_activity (action, timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_auth_activity_time ON auth_activity (timestamp)")
+
+
+def _migrate_contacts_table(cursor: sqlite3.Cursor) -> None:
+    """Create the contacts table, with normalized phone columns."""
+    if not _table_exists(cursor, "contacts"):
+        cursor.execute("""
+            CREATE TABLE contacts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL DEFAULT 1,
+                name TEXT NOT NULL,
+                phone TEXT,
+                phone_digits TEXT,
+                phone_e164 TEXT,
+                email TEXT,
+                address TEXT,
+                company TEXT,
+                job_title TEXT,
+                category TEXT CHECK(category IN ('Family', 'Friends', 'Work')) DEFAULT 'Friends',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+            )
+        """)
+        return
+
+    columns = _columns(cursor, "contacts")
+    if "user_id" not in columns:
+        cursor.execute("ALTER TABLE contacts ADD COLUMN user_id INTEGER NOT NULL DEFAULT 1")
+        print("Added user_id column to contacts table")
+    if "phone_digits" not in columns:
+        cursor.execute("ALTER TABLE contacts ADD COLUMN phone_digits TEXT")
+        cursor.execute("ALTER TABLE contacts ADD COLUMN phone_e164 TEXT")
+        cursor.execute(
+            "SELECT id, phone FROM contacts WHERE phone IS NOT NULL AND phone != '' AND phone_digits IS NULL"
+        )
+        cursor.executemany(
+            "UPDATE contacts SET phone_digits = ?, phone_e164 = ? WHERE id = ?",
+            [(digits_only(row[1]), to_e164(row[1]), row[0]) for row in cursor.fetchall()]
+        )
+        print("Added normalized phone columns to contacts table")
+
+
+def _migrate_contact_indexes(cursor: sqlite3.Cursor) -> None:
+    """Index contacts for per-user listing, keyset pagination and phone lookups; add import checkpoints."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_user_name ON contacts (user_id, name COLLATE NOCASE, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_user_created ON contacts (user_id, created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_user_phone_digits ON contacts (user_id, phone_digits)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_user_phone_e164 ON contacts (user_id, phone_e164)")
+
+    # Progress of interrupted bulk imports, committed with each chunk
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+            user_id INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            records_done INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, source)
+        )
+    """)
+
+
+def _migrate_contacts_fts(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the FTS5 full-text index over contacts.
+
+    The index is an external-content FTS5 table kept in sync with contacts by
+    triggers, so it only stores the inverted index and never a second copy of
+    the rows. If the SQLite build lacks FTS5, nothing is created and searching
+    falls back to LIKE scans.
+    """
+    index_exists = _table_exists(cursor, "contacts_fts")
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+                name, email, company, job_title, address,
+                content='contacts', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError:
+        return  # SQLite compiled without FTS5
+
+    cursor.execute(FTS_INSERT_TRIGGER_SQL)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts BEGIN
+            INSERT INTO contacts_fts (contacts_fts, rowid, name, email, company, job_title, address)
+            VALUES ('delete', old.id, old.name, old.email, old.company, old.job_title, old.address);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_update AFTER UPDATE ON contacts BEGIN
+            INSERT INTO contacts_fts (contacts_fts, rowid, name, email, company, job_title, address)
+            VALUES ('delete', old.id, old.name, old.email, old.company, old.job_title, old.address);
+            INSERT INTO contacts_fts (rowid, name, email, company, job_title, address)
+            VALUES (new.id, new.name, new.email, new.company, new.job_title, new.address);
+        END
+    """)
+
+    if not index_exists:
+        # Backfill for databases created before the index existed
+        cursor.execute("INSERT INTO contacts_fts (contacts_fts) VALUES ('rebuild')")
+        print("Built full-text search index for contacts table")
+
+
+def _migrate_contacts_phone_fts(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the trigram index over normalized phone digits.
+
+    A trigram FTS5 table turns "contains these digits" into an indexed
+    lookup. It needs SQLite 3.34+; on older builds nothing is created and
+    phone search scans the current user's phone_digits values.
+    """
+    index_exists = _table_exists(cursor, "contacts_phone_fts")
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS contacts_phone_fts USING fts5(
+                phone_digits, content='contacts', content_rowid='id', tokenize='trigram'
+            )
+        """)
+    except sqlite3.OperationalError:
+        return  # FTS5 missing or too old for the trigram tokenizer
+
+    cursor.execute(PHONE_FTS_INSERT_TRIGGER_SQL)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS contacts_phone_fts_delete AFTER DELETE ON contacts BEGIN
+            INSERT INTO contacts_phone_fts (contacts_phone_fts, rowid, phone_digits)
+            VALUES ('delete', old.id, old.phone_digits);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS contacts_phone_fts_update AFTER UPDATE OF phone_digits ON contacts BEGIN
+            INSERT INTO contacts_phone_fts (contacts_phone_fts, rowid, phone_digits)
+            VALUES ('delete', old.id, old.phone_digits);
+            INSERT INTO contacts_phone_fts (rowid, phone_digits) VALUES (new.id, new.phone_digits);
+        END
+    """)
+
+    if not index_exists:
+        cursor.execute("INSERT INTO contacts_phone_fts (contacts_phone_fts) VALUES ('rebuild')")
+
+
+def _migrate_user_directory_indexes(cursor: sqlite3.Cursor) -> None:
+    """Index users for the admin directory's filters and name/email prefix search."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_status ON users (status, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_role ON users (role, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_name_nocase ON users (name COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_email_nocase ON users (email COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_last_login ON users (last_login)")
+
+
+def _migrate_contact_counts(cursor: sqlite3.Cursor) -> None:
+    """
+    Create contact_counts, the number of contacts per user and category.
+
+    Triggers keep it in step with contacts, so counting a user's contacts
+    reads at most one row per category instead of scanning the contacts.
+    Contacts without a category are counted under the empty string.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS contact_counts (
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, category)
+        )
+    """)
+    cursor.execute("DELETE FROM contact_counts")
+    cursor.execute("""
+        INSERT INTO contact_counts (user_id, category, count)
+        SELECT user_id, COALESCE(category, ''), COUNT(*) FROM contacts
+        GROUP BY user_id, COALESCE(category, '')
+    """)
+
+    cursor.execute(CONTACT_COUNTS_INSERT_TRIGGER_SQL)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS contact_counts_delete AFTER DELETE ON contacts BEGIN
+            UPDATE contact_counts SET count = count - 1
+            WHERE user_id = old.user_id AND category = COALESCE(old.category, '');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS contact_counts_update AFTER UPDATE OF user_id, category ON contacts
+        WHEN old.user_id IS NOT new.user_id OR old.category IS NOT new.category BEGIN
+            UPDATE contact_counts SET count = count - 1
+            WHERE user_id = old.user_id AND category = COALESCE(old.category, '');
+            INSERT OR IGNORE INTO contact_counts (user_id, category) VALUES (new.user_id, COALESCE(new.category, ''));
+            UPDATE contact_counts SET count = count + 1
+            WHERE user_id = new.user_id AND category = COALESCE(new.category, '');
+        END
+    """)
+
+
+def _migrate_contact_query_indexes(cursor: sqlite3.Cursor) -> None:
+    """Index contacts for ContactQuery's category and company filters and company sort."""
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_user_category_name "
+        "ON contacts (user_id, category, name COLLATE NOCASE, id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_user_company "
+        "ON contacts (user_id, company COLLATE NOCASE, name COLLATE NOCASE, id)"
+    )
+
+
+def _migrate_contact_company_index(cursor: sqlite3.Cursor) -> None:
+    """
+    Index contacts by company with a missing company as an empty one.
+
+    Contact rows read a NULL company as "", so the list widget's sort keys
+    only agree with the database if the ordering does the same.
+    """
+    cursor.execute("DROP INDEX IF EXISTS idx_contacts_user_company")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_user_company_coalesced "
+        "ON contacts (user_id, COALESCE(company, '') COLLATE NOCASE, name COLLATE NOCASE, id)"
+    )
+
+
+# Migration N brings a database from user_version N - 1 to N
+MIGRATIONS: List[Callable[[sqlite3.Cursor], None]] = [
+    _migrate_auth_tables,
+    _migrate_auth_indexes,
+    _migrate_contacts_table,
+    _migrate_contact_indexes,
+    _migrate_contacts_fts,
+    _migrate_contacts_phone_fts,
+    _migrate_user_directory_indexes,
+    _migrate_contact_counts,
+    _migrate_contact_query_indexes,
+    _migrate_contact_company_index,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+@dataclass(frozen=True)
+class SchemaCapabilities:
+    """
+    Schema features of a database, determined once after migrating.
+
+    Attributes:
+        version: Schema version (PRAGMA user_version)
+        users_has_username: Whether users has the username column of older
+            versions of the app, which must be filled on insert
+        contacts_fts: Whether the FTS5 full-text index exists
+        contacts_phone_fts: Whether the trigram phone index exists
+    """
+    version: int
+    users_has_username: bool
+    contacts_fts: bool
+    contacts_phone_fts: bool
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply the migrations a database is missing.
+
+    Each migration runs in its own transaction together with the update of
+    user_version, so an interrupted run resumes at the failed migration.
+    Databases from a newer version of the app are left unchanged.
+
+    Args:
+        conn: Connection to the database, with no transaction open
+
+    Returns:
+        int: Number of migrations applied
+
+    Raises:
+        sqlite3.Error: If a migration fails (it is rolled back)
+    """
+    applied = 0
+    cursor = conn.cursor()
+    while True:
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Read inside the write transaction, so concurrent processes never apply a migration twice
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                conn.rollback()
+                return applied
+            MIGRATIONS[version](cursor)
+            cursor.execute(f"PRAGMA user_version = {version + 1}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied += 1
+
+
+def _read_capabilities(conn: sqlite3.Connection) -> SchemaCapabilities:
+    """Inspect a migrated database once."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    return SchemaCapabilities(
+        version=cursor.execute("PRAGMA user_version").fetchone()[0],
+        users_has_username="username" in _columns(cursor, "users") if "users" in tables else False,
+        contacts_fts="contacts_fts" in tables,
+        contacts_phone_fts="contacts_phone_fts" in tables,
+    )
+
+
+_schemas: Dict[str, SchemaCapabilities] = {}
+_schemas_lock = threading.Lock()
+
+
+def get_schema(db_path: str) -> SchemaCapabilities:
+    """
+    Migrate a database file on first use in this process and return its capabilities.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        SchemaCapabilities: Cached capabilities, shared by every component using this file
+
+    Raises:
+        sqlite3.Error: If migrating fails
+        RuntimeError: If the database cannot be opened
+    """
+    pool = get_pool(db_path)
+    if db_path == ":memory:":
+        # Every thread has its own in-memory database, so nothing can be shared
+        conn = pool.connection()
+        migrate(conn)
+        return _read_capabilities(conn)
+
+    key = os.path.abspath(db_path)
+    with _schemas_lock:
+        schema = _schemas.get(key)
+        if schema is None:
+            conn = pool.connection()
+            migrate(conn)
+            schema = _read_capabilities(conn)
+            _schemas[key] = schema
+        return schema
@@ -2,9 +2,15 @@
 Data models for the SmartConnect Contact Management System.
 """
 
+import string
+import sys
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
+
+
+# Case folding of SQLite's NOCASE collation (ASCII letters only)
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
 
 @dataclass
@@ -40,4 +46,173 @@ class Contact:
         if self.created_at is None:
             self.created_at = datetime.now()
         if self.updated_at is None:
-            self.updated_at = datetime.now()
\ No newline at end of file
+            self.updated_at = datetime.now()
+
+
+class ContactRow:
+    """
+    Compact, read-only view of a stored contact for lists and search results.
+    
+    Holds the same fields as Contact in slots, without a per-instance __dict__,
+    and keeps the timestamps as the ISO strings read from the database until
+    they are first accessed. Build a full Contact with to_contact() when a
+    record is opened for editing.
+    """
+    
+    __slots__ = ('id', 'name', 'phone', 'email', 'address', 'company', 'job_title',
+                 'category', '_created_at', '_updated_at')
+    
+    # Column order expected by the constructor
+    COLUMNS = ('id', 'name', 'phone', 'email', 'address', 'company', 'job_title',
+               'category', 'created_at', 'updated_at')
+    
+    def __init__(self, id: int, name: str, phone: Optional[str], email: Optional[str],
+                 address: Optional[str], company: Optional[str], job_title: Optional[str],
+                 category: Optional[str], created_at: Union[str, datetime, None] = None,
+                 updated_at: Union[str, datetime, None] = None):
+        self.id = id
+        self.name = name
+        self.phone = phone or ""
+        self.email = email or ""
+        self.address = address or ""
+        self.company = company or ""
+        self.job_title = job_title or ""
+        self.category = sys.intern(category) if category else "Friends"
+        self._created_at = created_at
+        # Never-edited contacts share one timestamp string instead of holding two
+        self._updated_at = created_at if updated_at == created_at else updated_at
+    
+    @property
+    def created_at(self) -> Optional[datetime]:
+        """Creation timestamp, parsed on first access."""
+        value = self._created_at
+        if isinstance(value, str):
+            value = self._created_at = datetime.fromisoformat(value)
+        return value
+    
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        """Last modification timestamp, parsed on first access."""
+        value = self._updated_at
+        if isinstance(value, str):
+            value = self._updated_at = datetime.fromisoformat(value)
+        return value
+    
+    @classmethod
+    def from_contact(cls, contact: Contact) -> "ContactRow":
+        """
+        Build a row from a saved Contact.
+        
+        Args:
+            contact: Contact with a database ID
+            
+        Returns:
+            ContactRow with the same field values
+        """
+        return cls(contact.id, contact.name, contact.phone, contact.email, contact.address,
+                   contact.company, contact.job_title, contact.category,
+                   contact.created_at, contact.updated_at)
+    
+    def to_contact(self) -> Contact:
+        """
+        Build a full Contact with the same field values.
+        
+        Returns:
+            Contact object
+        """
+        return Contact(
+            id=self.id,
+            name=self.name,
+            phone=self.phone,
+            email=self.email,
+            address=self.address,
+            company=self.company,
+            job_title=self.job_title,
+            category=self.category,
+            created_at=self.created_at,
+            updated_at=self.updated_at
+        )
+    
+    def __repr__(self) -> str:
+        return f"ContactRow(id={self.id!r}, name={self.name!r})"
+
+
+@dataclass(frozen=True)
+class ContactQuery:
+    """
+    Filters, ordering and window for listing the current user's contacts.
+    
+    ContactDatabase.query_contacts compiles a query into a single
+    parameterized SQL statement; every filter left empty is omitted.
+    ContactSearchEngine.query answers queries with search text from its
+    trigram index instead, applying the other filters with matches() and
+    the ordering with contact_sort_key().
+    
+    Attributes:
+        text: Free-form search text. ContactSearchEngine.query matches it as a
+            substring of the name (case-insensitive) or, for phone-like text,
+            of the phone digits; ContactDatabase.query_contacts matches it by
+            word prefix against name, email, company, job title and address,
+            and by digits against phone
+        category: Only contacts in this category
+        company: Only contacts at this company (case-insensitive)
+        created_from: Only contacts created at or after this time
+        created_to: Only contacts created before this time
+        sort_by: Sort key ("name", "recent" for creation date, or "company")
+        descending: Reverse the sort; None uses the key's natural direction
+            (newest first for "recent", A to Z otherwise)
+        limit: Maximum number of contacts to return (None for all)
+        offset: Number of matching contacts to skip
+    """
+    text: str = ""
+    category: Optional[str] = None
+    company: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    sort_by: str = "name"
+    descending: Optional[bool] = None
+    limit: Optional[int] = None
+    offset: int = 0
+    
+    def matches(self, contact) -> bool:
+        """
+        Check a contact against every filter except the search text.
+        
+        Args:
+            contact: Any object with Contact attributes
+        
+        Returns:
+            bool: Whether the contact passes the category, company and
+            creation date filters, compared as the database compares them
+        """
+        if self.category and contact.category != self.category:
+            return False
+        if self.company and (contact.company or "").translate(_NOCASE) != self.company.translate(_NOCASE):
+            return False
+        if self.created_from is not None and (contact.created_at is None or contact.created_at < self.created_from):
+            return False
+        if self.created_to is not None and (contact.created_at is None or contact.created_at >= self.created_to):
+            return False
+        return True
+
+
+def contact_sort_key(contact, sort_by: str = "name") -> tuple:
+    """
+    Build the key ordering contacts as ContactDatabase.query_contacts does.
+    
+    The key reproduces "name COLLATE NOCASE, id", "created_at, id" or
+    "COALESCE(company, '') COLLATE NOCASE, name COLLATE NOCASE, id" for
+    sort_by and always ends with the contact ID, so keys are unique.
+    
+    Args:
+        contact: Any object with Contact attributes
+        sort_by: Sort key ("name", "recent" or "company")
+    
+    Returns:
+        tuple: Sort key in ascending order
+    """
+    if sort_by == "recent":
+        return (contact.created_at or datetime.min, contact.id)
+    if sort_by == "company":
+        return ((contact.company or "").translate(_NOCASE), contact.name.translate(_NOCASE), contact.id)
+    return (contact.name.translate(_NOCASE), contact.id)
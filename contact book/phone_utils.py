@@ -0,0 +1,86 @@
+"""
+Phone number normalization for the SmartConnect Contact Management System.
+
+This module provides helpers that reduce formatted phone numbers to the
+derived forms stored alongside each contact: a digits-only string used for
+formatting-insensitive matching, and an E.164 string used for exact lookups.
+"""
+
+# Country calling code assumed for national numbers without one (NANP)
+DEFAULT_COUNTRY_CODE = "1"
+
+# Characters besides digits that may appear in a typed phone number
+PHONE_FORMATTING_CHARS = frozenset("+()-. ")
+
+
+def digits_only(phone: str) -> str:
+    """
+    Strip everything but digits from a phone number.
+
+    Args:
+        phone: Phone number in any format, e.g. "(555) 123-4567"
+
+    Returns:
+        str: Digits only, e.g. "5551234567" (empty if there are none)
+    """
+    if not phone:
+        return ""
+    return "".join(char for char in phone if char.isdigit())
+
+
+def phone_query_digits(query: str) -> str:
+    """
+    Extract the digits of a search query that looks like a phone number.
+
+    Only queries made of digits and phone formatting characters count, so
+    "Room 101" or "John 5" are not matched against phone numbers.
+
+    Args:
+        query: Search text, e.g. "(555) 12"
+
+    Returns:
+        str: Digits of the query, e.g. "55512", or an empty string if the
+        query is not phone-like
+    """
+    if not query or not all(char.isdigit() or char in PHONE_FORMATTING_CHARS for char in query):
+        return ""
+    return digits_only(query)
+
+
+def to_e164(phone: str, default_country_code: str = DEFAULT_COUNTRY_CODE) -> str:
+    """
+    Normalize a phone number to E.164 format.
+
+    Numbers written with "+" or a "00" international prefix keep their country
+    code. Ten-digit national numbers get the default country code, as do
+    eleven-digit numbers already starting with it.
+
+    Args:
+        phone: Phone number in any format
+        default_country_code: Country code for national numbers
+
+    Returns:
+        str: Number such as "+15551234567", or an empty string if the
+        number cannot be normalized
+    """
+    if not phone:
+        return ""
+
+    digits = digits_only(phone)
+    stripped = phone.strip()
+
+    if stripped.startswith("+"):
+        normalized = digits
+    elif stripped.startswith("00"):
+        normalized = digits[2:]
+    elif len(digits) == 10:
+        normalized = default_country_code + digits
+    elif len(digits) == 11 and digits.startswith(default_country_code):
+        normalized = digits
+    else:
+        return ""
+
+    # E.164 allows at most 15 digits; anything under 8 is not a full number
+    if not 8 <= len(normalized) <= 15:
+        return ""
+    return "+" + normalized
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Retention of authentication data for the SmartConnect Contact Management System.
+
+This module provides the RetentionManager class. It deletes sessions that can
+no longer be used and moves old auth_activity rows out of the live table,
+into one archive table per month or into gzip-compressed NDJSON files, so the
+tables read at login and by the admin panel stay small on long-lived installs.
+It can run periodically on a background thread.
+"""
+
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from auth_system import AuthenticationSystem
+from connection_pool import get_pool
+
+
+ARCHIVE_TABLE_PREFIX = "auth_activity_archive_"
+
+# Columns copied to archives, in order
+_ACTIVITY_COLUMNS = ("id", "user_id", "action", "details", "ip_address", "timestamp")
+
+
+def _next_month(month: str) -> str:
+    """Return the month after a "YYYY-MM" month."""
+    year, number = map(int, month.split("-"))
+    return f"{year + number // 12:04d}-{number % 12 + 1:02d}"
+
+
+class RetentionManager:
+    """
+    Purges ended sessions and archives old authentication activity.
+
+    Sessions are deleted once they have expired or were ended by a logout,
+    ban or suspension. Activity older than activity_retention_days is moved
+    to auth_activity_archive_YYYY_MM tables (by the month of its timestamp),
+    or, if archive_dir is given, appended to auth_activity_YYYY_MM.ndjson.gz
+    files there. Each run happens in one transaction, so rows are never lost;
+    with file archives, a run whose commit fails may write rows to a file
+    again on the next run.
+    """
+
+    DEFAULT_ACTIVITY_RETENTION_DAYS = 90
+    DEFAULT_INTERVAL_SECONDS = 6 * 60 * 60
+    DEFAULT_INITIAL_DELAY_SECONDS = 60
+
+    def __init__(self, db_path: str = "contacts.db",
+                 activity_retention_days: int = DEFAULT_ACTIVITY_RETENTION_DAYS,
+                 archive_dir: Optional[str] = None,
+                 interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+                 auth_system: Optional[AuthenticationSystem] = None):
+        """
+        Initialize the retention manager.
+
+        Args:
+            db_path: Path to the SQLite database file
+            activity_retention_days: Days of activity kept in auth_activity
+            archive_dir: Directory for compressed archive files; None archives
+                into tables in the database
+            interval_seconds: Time between scheduled runs
+            auth_system: Authentication system whose session cache and admin
+                statistics are refreshed after sessions are purged
+        """
+        if activity_retention_days < 0:
+            raise ValueError("Retention days cannot be negative")
+        self.pool = get_pool(db_path)
+        self.activity_retention_days = activity_retention_days
+        self.archive_dir = archive_dir
+        self.interval_seconds = interval_seconds
+        self.auth_system = auth_system
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def purge_sessions(self, now: Optional[datetime] = None) -> int:
+        """
+        Delete expired and ended sessions.
+
+        Args:
+            now: Current time (local, as session expiry times are stored)
+
+        Returns:
+            int: Number of sessions deleted
+
+        Raises:
+            RuntimeError: If the sessions cannot be deleted
+        """
+        now = now or datetime.now()
+        conn = self.pool.connection()
+        try:
+            cursor = conn.cursor()
+            if not conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                "SELECT DISTINCT user_id FROM user_sessions WHERE is_active = 0 OR expires_at < ?",
+                (now.isoformat(),)
+            )
+            user_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute(
+                "DELETE FROM user_sessions WHERE is_active = 0 OR expires_at < ?",
+                (now.isoformat(),)
+            )
+            purged = cursor.rowcount
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise RuntimeError(f"Failed to purge sessions: {e}")
+
+        if purged and self.auth_system is not None:
+            for user_id in user_ids:
+                self.auth_system.session_cache.invalidate_user(user_id)
+            self.auth_system.users_changed()
+        return purged
+
+    def archive_activity(self, now: Optional[datetime] = None) -> int:
+        """
+        Move activity older than the retention period to monthly archives.
+
+        Args:
+            now: Current time (activity timestamps are stored in UTC)
+
+        Returns:
+            int: Number of activity rows archived
+
+        Raises:
+            RuntimeError: If archiving fails (the live table is unchanged)
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=self.activity_retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+
+        conn = self.pool.connection()
+        try:
+            cursor = conn.cursor()
+            if not conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                "SELECT DISTINCT substr(timestamp, 1, 7) FROM auth_activity WHERE timestamp < ?",
+                (cutoff,)
+            )
+            # Rows with malformed timestamps stay in the live table
+            months = [row[0] for row in cursor.fetchall() if re.fullmatch(r"\d{4}-\d{2}", row[0] or "")]
+
+            archived = 0
+            for month in months:
+                bounds = (month, min(_next_month(month), cutoff))
+                if self.archive_dir:
+                    self._archive_month_to_file(cursor, month, bounds)
+                else:
+                    self._archive_month_to_table(cursor, month, bounds)
+                cursor.execute("DELETE FROM auth_activity WHERE timestamp >= ? AND timestamp < ?", bounds)
+                archived += cursor.rowcount
+
+            conn.commit()
+            return archived
+        except (sqlite3.Error, OSError) as e:
+            conn.rollback()
+            raise RuntimeError(f"Failed to archive auth activity: {e}")
+
+    @staticmethod
+    def _archive_month_to_table(cursor: sqlite3.Cursor, month: str, bounds: tuple) -> None:
+        """Copy one month of activity into its archive table."""
+        table = ARCHIVE_TABLE_PREFIX + month.replace("-", "_")
+        columns = ", ".join(_ACTIVITY_COLUMNS)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER,
+                action TEXT NOT NULL,
+                details TEXT,
+                ip_address TEXT,
+                timestamp TIMESTAMP
+            )
+        """)
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {table} ({columns}) "
+            f"SELECT {columns} FROM auth_activity WHERE timestamp >= ? AND timestamp < ?",
+            bounds
+        )
+
+    def _archive_month_to_file(self, cursor: sqlite3.Cursor, month: str, bounds: tuple) -> None:
+        """Append one month of activity to its compressed NDJSON file."""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"auth_activity_{month.replace('-', '_')}.ndjson.gz")
+        rows = cursor.execute(
+            f"SELECT {', '.join(_ACTIVITY_COLUMNS)} FROM auth_activity "
+            f"WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp, id",
+            bounds
+        )
+        # Appending adds a gzip member; gzip readers see one continuous stream
+        with gzip.open(path, "at", encoding="utf-8") as archive:
+            for row in rows:
+                archive.write(json.dumps(dict(zip(_ACTIVITY_COLUMNS, row))) + "\n")
+
+    def archive_tables(self) -> List[str]:
+        """Return the names of the monthly archive tables, oldest first."""
+        cursor = self.pool.connection().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ? ORDER BY name",
+            (ARCHIVE_TABLE_PREFIX + "%",)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        Purge sessions and archive activity now.
+
+        Returns:
+            Dict[str, int]: Numbers of sessions purged and activity rows archived
+        """
+        result = {
+            'sessions_purged': self.purge_sessions(),
+            'activity_archived': self.archive_activity(),
+        }
+        if any(result.values()):
+            # Refresh query planner statistics after large deletes
+            self.pool.connection().execute("PRAGMA optimize")
+        return result
+
+    def start(self, initial_delay: float = DEFAULT_INITIAL_DELAY_SECONDS) -> None:
+        """
+        Run retention periodically on a background thread.
+
+        Args:
+            initial_delay: Seconds before the first run, so it does not slow
+                down application startup
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_periodically, args=(initial_delay,), name="auth-retention", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background runs (a run in progress finishes first)."""
+        self._stop.set()
+
+    def _run_periodically(self, delay: float) -> None:
+        """Background thread body: run, then wait for the next interval."""
+        while not self._stop.wait(delay):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Auth data retention failed: {e}")
+            delay = self.interval_seconds
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Background search controller for the SmartConnect contact search box.
+
+Keystrokes are debounced on the Tk main thread, queries run on a single worker
+thread, and only the result of the latest query is handed back to the main
+thread (via root.after polling), so typing never blocks the event loop and
+stale results are never shown.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class SearchController:
+    """
+    Debounced, cancellable search runner for a Tk application.
+
+    Each new request supersedes the previous one: a debounced request that
+    has not started is dropped, a queued query is cancelled, and the result
+    of a query that is already running is discarded when it finishes.
+
+    All callbacks run on the Tk main thread; the worker thread never touches
+    widgets.
+    """
+
+    DEBOUNCE_MS = 200
+    POLL_MS = 15
+
+    def __init__(self, root, search_fn: Callable[[str, str], Any],
+                 on_results: Callable[[str, str, Any], None],
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 debounce_ms: Optional[int] = None):
+        """
+        Initialize the controller.
+
+        Args:
+            root: Tk root (or any widget) used for scheduling with after()
+            search_fn: Called on the worker thread as search_fn(query, sort_by)
+            on_results: Called on the main thread as on_results(query, sort_by, result)
+            on_error: Called on the main thread with the exception if search_fn fails
+            debounce_ms: Quiet period after the last keystroke before searching
+        """
+        self.root = root
+        self.search_fn = search_fn
+        self.on_results = on_results
+        self.on_error = on_error
+        self.debounce_ms = self.DEBOUNCE_MS if debounce_ms is None else debounce_ms
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="contact-search")
+        self._generation = 0
+        self._debounce_id = None
+        self._poll_id = None
+        self._future: Optional[Future] = None
+
+    def search(self, query: str, sort_by: str = "name", debounce: bool = False) -> None:
+        """
+        Request a search, superseding any earlier request.
+
+        Args:
+            query: Search text
+            sort_by: Sorting criteria passed to search_fn
+            debounce: Wait for the debounce period first (use for keystrokes)
+        """
+        self._cancel_pending()
+
+        if debounce:
+            self._debounce_id = self.root.after(self.debounce_ms, self._dispatch, query, sort_by)
+        else:
+            self._dispatch(query, sort_by)
+
+    @property
+    def pending(self) -> bool:
+        """Whether a requested search has not delivered its result yet."""
+        return self._debounce_id is not None or self._future is not None
+
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        """
+        Run background work on the search worker thread.
+
+        The work is queued behind any running query and is not superseded
+        by later searches.
+
+        Args:
+            fn: Called on the worker thread without arguments
+
+        Returns:
+            Future: Result of fn
+        """
+        return self._executor.submit(fn)
+
+    def shutdown(self) -> None:
+        """Discard pending work and stop the worker thread."""
+        self._cancel_pending()
+        self._executor.shutdown(wait=False)
+
+    def _cancel_pending(self) -> None:
+        """Drop the debounced request and invalidate any in-flight query."""
+        self._generation += 1
+
+        for after_id in (self._debounce_id, self._poll_id):
+            if after_id is not None:
+                try:
+                    self.root.after_cancel(after_id)
+                except Exception:
+                    pass
+        self._debounce_id = None
+        self._poll_id = None
+
+        if self._future is not None:
+            self._future.cancel()  # Only succeeds if the query has not started
+            self._future = None
+
+    def _dispatch(self, query: str, sort_by: str) -> None:
+        """Start a query on the worker thread."""
+        self._debounce_id = None
+        generation = self._generation
+        self._future = self._executor.submit(self.search_fn, query, sort_by)
+        self._poll(generation, self._future, query, sort_by)
+
+    def _poll(self, generation: int, future: Future, query: str, sort_by: str) -> None:
+        """Deliver the query result on the main thread once it is ready."""
+        self._poll_id = None
+        if generation != self._generation:
+            return  # Superseded by a newer request
+
+        if not future.done():
+            self._poll_id = self.root.after(self.POLL_MS, self._poll, generation, future, query, sort_by)
+            return
+
+        self._future = None
+        error = future.exception()
+        if error is not None:
+            if self.on_error:
+                self.on_error(error)
+            return
+
+        self.on_results(query, sort_by, future.result())
@@ -5,10 +5,15 @@ This module provides the ContactSearchEngine class that handles intelligent sear
 and filtering operations with real-time capabilities and flexible sorting options.
 """
 
+import threading
 from datetime import datetime
-from typing import List
-from models import Contact
+from typing import Dict, List
+from models import ContactQuery, ContactRow, contact_sort_key
 from contact_manager import ContactManager
+from events import ContactEvent, ContactEventType
+from search_index import ContactSearchIndex
+from fuzzy_index import ContactFuzzyIndex
+from autocomplete import ContactCompletionIndex
 
 
 class ContactSearchEngine:
@@ -17,6 +22,14 @@ class ContactSearchEngine:
     
     Provides real-time search capabilities with case-insensitive matching,
     flexible sorting options, and comprehensive filtering across multiple fields.
+    
+    Substring searches are answered from an in-memory trigram index and
+    typo-tolerant searches from a fuzzy name index; both are built once per
+    user on first use and kept current from the ContactManager's change events,
+    as is the completion index behind type-ahead suggestions. Listings that
+    combine filters with a sort order are answered by query(): by the
+    database in one statement, or from the trigram index when they have
+    search text, so the search box keeps its substring matching.
     """
     
     def __init__(self, contact_manager: ContactManager):
@@ -27,8 +40,60 @@ class ContactSearchEngine:
             contact_manager: ContactManager instance for data access
         """
         self.contact_manager = contact_manager
+        self.index = ContactSearchIndex()
+        self.fuzzy_index = ContactFuzzyIndex()
+        self.completions = ContactCompletionIndex()
+        self._versions: Dict[int, int] = {}  # User ID -> number of change events seen
+        self._versions_lock = threading.Lock()
+        contact_manager.events.subscribe(self._on_contact_event)
+    
+    def _on_contact_event(self, event: ContactEvent) -> None:
+        """
+        Apply a contact change to the search indexes.
+        
+        Args:
+            event: Change published by the ContactManager
+        """
+        # Counted before the indexes are touched, so a build that read the
+        # contacts before this change can tell that it is outdated
+        with self._versions_lock:
+            self._versions[event.user_id] = self._versions.get(event.user_id, 0) + 1
+        
+        for index in (self.index, self.fuzzy_index, self.completions):
+            if event.type is ContactEventType.CREATED:
+                index.add_contact(event.user_id, event.contact)
+            elif event.type is ContactEventType.UPDATED:
+                index.update_contact(event.user_id, event.contact)
+            elif event.type is ContactEventType.DELETED:
+                index.remove_contact(event.user_id, event.contact_id)
+            else:
+                # Bulk changes: rebuild lazily on the next search
+                index.invalidate(event.user_id)
     
-    def search_by_name(self, query: str) -> List[Contact]:
+    def _indexed_user(self, index=None) -> int:
+        """
+        Return the current user's ID, building their index on first use.
+        
+        Builds may run on worker threads while the UI thread changes contacts.
+        A build whose contacts were read before a change was published is
+        discarded and redone, since the index ignored that change while it
+        was not built yet.
+        
+        Args:
+            index: Index to build (defaults to the trigram index)
+            
+        Returns:
+            int: ID of the user whose contacts are being searched
+        """
+        index = index or self.index
+        user_id = self.contact_manager.database.current_user_id
+        while not index.is_built(user_id):
+            version = self._versions.get(user_id, 0)
+            contacts = self.contact_manager.get_all_contacts()
+            index.build(user_id, contacts, lambda: self._versions.get(user_id, 0) == version)
+        return user_id
+    
+    def search_by_name(self, query: str) -> List[ContactRow]:
         """
         Search contacts by name with case-insensitive matching.
         
@@ -36,20 +101,14 @@ class ContactSearchEngine:
             query: Search query string for name matching
             
         Returns:
-            List of Contact objects matching the name query
+            List of ContactRow objects matching the name query
         """
         if not query or not query.strip():
             return []
         
-        query_lower = query.strip().lower()
-        all_contacts = self.contact_manager.get_all_contacts()
-        
-        return [
-            contact for contact in all_contacts
-            if query_lower in contact.name.lower()
-        ]
+        return self.index.search_name(self._indexed_user(), query.strip())
     
-    def search_by_phone(self, query: str) -> List[Contact]:
+    def search_by_phone(self, query: str) -> List[ContactRow]:
         """
         Search contacts by phone number with partial matching.
         
@@ -57,20 +116,14 @@ class ContactSearchEngine:
             query: Search query string for phone matching
             
         Returns:
-            List of Contact objects matching the phone query
+            List of ContactRow objects matching the phone query
         """
         if not query or not query.strip():
             return []
         
-        query_clean = query.strip()
-        all_contacts = self.contact_manager.get_all_contacts()
-        
-        return [
-            contact for contact in all_contacts
-            if query_clean in contact.phone
-        ]
+        return self.index.search_phone(self._indexed_user(), query.strip())
     
-    def search_combined(self, query: str) -> List[Contact]:
+    def search_combined(self, query: str) -> List[ContactRow]:
         """
         Search contacts by name or phone number with case-insensitive matching.
         
@@ -82,35 +135,81 @@ class ContactSearchEngine:
             query: Search query string
             
         Returns:
-            List of Contact objects matching either name or phone query
+            List of ContactRow objects matching either name or phone query
         """
         if not query or not query.strip():
             return self.contact_manager.get_all_contacts()
         
-        query_lower = query.strip().lower()
-        all_contacts = self.contact_manager.get_all_contacts()
+        # Case-insensitive name matching or exact phone substring matching
+        return self.index.search_combined(self._indexed_user(), query.strip())
+    
+    def search_fuzzy(self, query: str, max_edits: int = 2) -> List[ContactRow]:
+        """
+        Search contact names tolerating typos.
+        
+        Each query word may be a prefix of a name word or differ from one by
+        up to max_edits insertions, deletions or substitutions (fewer for
+        short words), so "jonh smtih" finds "John Smith".
         
-        matching_contacts = []
-        for contact in all_contacts:
-            # Case-insensitive name matching
-            if query_lower in contact.name.lower():
-                matching_contacts.append(contact)
-            # Phone number matching (exact substring)
-            elif query.strip() in contact.phone:
-                matching_contacts.append(contact)
+        Args:
+            query: Search query string
+            max_edits: Maximum edits allowed per query word
+            
+        Returns:
+            List of ContactRow objects, closest matches first
+        """
+        if not query or not query.strip():
+            return []
         
-        return matching_contacts
+        user_id = self._indexed_user(self.fuzzy_index)
+        return self.fuzzy_index.search(user_id, query, max_edits)
     
-    def sort_contacts(self, contacts: List[Contact], sort_by: str) -> List[Contact]:
+    def suggest(self, prefix: str, limit: int = ContactCompletionIndex.DEFAULT_LIMIT) -> List[str]:
+        """
+        Suggest completions for text typed into the search box.
+        
+        Completions are full names, name words, companies and email
+        addresses of the current user's contacts, most used first.
+        
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+        
+        Returns:
+            List of completions starting with prefix (case-insensitive)
+        """
+        if not prefix or not prefix.strip():
+            return []
+        
+        user_id = self._indexed_user(self.completions)
+        return self.completions.complete(user_id, prefix, limit)
+    
+    def suggestions_ready(self) -> bool:
+        """Check whether the current user's completion index is built."""
+        return self.completions.is_built(self.contact_manager.database.current_user_id)
+    
+    def prepare_suggestions(self) -> None:
+        """
+        Build the current user's completion index ahead of the first suggest call.
+        
+        Safe to call from a worker thread, so the first keystroke does not
+        pay for reading every contact.
+        """
+        self._indexed_user(self.completions)
+    
+    def sort_contacts(self, contacts: List[ContactRow], sort_by: str) -> List[ContactRow]:
         """
         Sort contacts according to specified criteria.
         
+        For lists already in memory (e.g. from search_fuzzy); listings read
+        from the database are sorted by query() instead.
+        
         Args:
-            contacts: List of Contact objects to sort
+            contacts: List of ContactRow objects to sort
             sort_by: Sorting criteria ("name" for alphabetical, "recent" for creation date)
             
         Returns:
-            List of Contact objects sorted according to criteria
+            List of ContactRow objects sorted according to criteria
         """
         if not contacts:
             return []
@@ -129,31 +228,61 @@ class ContactSearchEngine:
                 key=lambda c: c.name.lower()
             )
     
-    def search_and_sort(self, query: str, sort_by: str = "name") -> List[Contact]:
+    def search_and_sort(self, query: str, sort_by: str = "name") -> List[ContactRow]:
         """
         Combined search and sort operation for complete functionality.
         
         This method provides the complete search and sort functionality
         required by the system, handling both empty queries (return all)
-        and filtered results with proper sorting.
+        and filtered results with proper sorting (see query()).
         
         Args:
             query: Search query string (empty returns all contacts)
             sort_by: Sorting criteria ("name" for alphabetical, "recent" for creation date)
             
         Returns:
-            List of Contact objects matching query and sorted by criteria
+            List of ContactRow objects matching query and sorted by criteria
         """
-        # Get search results (or all contacts if query is empty)
-        if not query or not query.strip():
-            contacts = self.contact_manager.get_all_contacts()
-        else:
-            contacts = self.search_combined(query)
+        return self.query(ContactQuery(text=query or "", sort_by=sort_by))
+    
+    def query(self, query: ContactQuery) -> List[ContactRow]:
+        """
+        Run a structured query with filters, sorting and paging.
+        
+        Queries without search text go to the database in one statement
+        (see ContactDatabase.query_contacts). Search text is matched like
+        search_combined, as a substring of the name or of the phone digits,
+        through the trigram index; the other filters, the ordering and the
+        window are then applied to the (usually few) matches in memory, in
+        the same order the database would return them.
+        
+        Args:
+            query: Search text, filters, sort order and window
+        
+        Returns:
+            List of ContactRow objects selected and ordered by the query
+        
+        Raises:
+            ValueError: If the sort key is unknown or limit or offset is negative
+        """
+        text = query.text.strip()
+        if not text:
+            return self.contact_manager.query_contacts(query)
+        
+        if query.sort_by not in ("name", "recent", "company"):
+            raise ValueError(f"Unknown sort key: {query.sort_by}")
+        if (query.limit is not None and query.limit < 0) or query.offset < 0:
+            raise ValueError("Limit and offset cannot be negative")
         
-        # Apply sorting
-        return self.sort_contacts(contacts, sort_by)
+        matches = [contact for contact in self.index.search_combined(self._indexed_user(), text)
+                   if query.matches(contact)]
+        # Newest first is the natural direction of "recent", as in the database
+        descending = query.sort_by == "recent" if query.descending is None else query.descending
+        matches.sort(key=lambda contact: contact_sort_key(contact, query.sort_by), reverse=descending)
+        end = None if query.limit is None else query.offset + query.limit
+        return matches[query.offset:end]
     
-    def reset_search(self, sort_by: str = "name") -> List[Contact]:
+    def reset_search(self, sort_by: str = "name") -> List[ContactRow]:
         """
         Reset search to show all contacts with specified sorting.
         
@@ -164,7 +293,6 @@ class ContactSearchEngine:
             sort_by: Sorting criteria for the full contact list
             
         Returns:
-            List of all Contact objects sorted by criteria
+            List of all ContactRow objects sorted by criteria
         """
-        all_contacts = self.contact_manager.get_all_contacts()
-        return self.sort_contacts(all_contacts, sort_by)
\ No newline at end of file
+        return self.query(ContactQuery(sort_by=sort_by))
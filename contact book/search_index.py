@@ -0,0 +1,263 @@
+"""
+In-memory search index for the SmartConnect Contact Management System.
+
+This module provides the ContactSearchIndex class, a per-user trigram inverted
+index over contact names and phone numbers. Substring queries only touch the
+postings lists of the query's trigrams instead of scanning the whole book.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from models import ContactRow
+from phone_utils import digits_only, phone_query_digits
+
+
+class _BookIndex:
+    """Trigram postings and indexed contacts for a single user."""
+
+    __slots__ = ('contacts', 'names', 'phones', 'name_postings', 'phone_postings')
+
+    def __init__(self):
+        self.contacts: Dict[int, ContactRow] = {}
+        self.names: Dict[int, str] = {}
+        self.phones: Dict[int, str] = {}
+        self.name_postings: Dict[str, Set[int]] = {}
+        self.phone_postings: Dict[str, Set[int]] = {}
+
+
+class ContactSearchIndex:
+    """
+    Per-user trigram inverted index over contact names and phone numbers.
+
+    Names are indexed case-insensitively and phone numbers by their digits, so
+    phone queries match regardless of formatting. A query is
+    answered by intersecting the postings lists of its trigrams (smallest first)
+    and verifying the few remaining candidates, so lookup cost depends on the
+    number of candidates rather than the size of the address book. Queries
+    shorter than a trigram are answered by scanning the in-memory entries.
+
+    The index is built once per user and then kept current incrementally
+    through add_contact, update_contact and remove_contact.
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._books: Dict[int, _BookIndex] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def _grams(cls, text: str) -> Set[str]:
+        """Return the set of trigrams of a string."""
+        size = cls.GRAM_SIZE
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+    def is_built(self, user_id: int) -> bool:
+        """Check whether the index for a user has been built."""
+        with self._lock:
+            return user_id in self._books
+
+    def build(self, user_id: int, contacts: Iterable[ContactRow],
+              is_current: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Build (or rebuild) the index for a user from their contacts.
+
+        Args:
+            user_id: ID of the user owning the contacts
+            contacts: All contacts of the user
+            is_current: Called under the index lock just before the new index
+                is installed; if it returns False, a change was published
+                after the contacts were read, and the build is discarded
+
+        Returns:
+            bool: Whether the index was installed
+        """
+        book = _BookIndex()
+        for contact in contacts:
+            self._index_contact(book, contact)
+
+        with self._lock:
+            # Changes published after this check wait for the lock, then apply to the new book
+            if is_current is not None and not is_current():
+                return False
+            self._books[user_id] = book
+            return True
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """
+        Drop the index for a user, or for all users if no ID is given.
+
+        Args:
+            user_id: ID of the user whose index should be dropped
+        """
+        with self._lock:
+            if user_id is None:
+                self._books.clear()
+            else:
+                self._books.pop(user_id, None)
+
+    def add_contact(self, user_id: int, contact: ContactRow) -> None:
+        """
+        Add a newly created contact to a user's index.
+
+        Does nothing if the user's index has not been built yet; it will
+        include the contact when it is built.
+
+        Args:
+            user_id: ID of the user owning the contact
+            contact: ContactRow with a database ID
+        """
+        with self._lock:
+            book = self._books.get(user_id)
+            if book is not None and contact.id is not None:
+                self._unindex_contact(book, contact.id)
+                self._index_contact(book, contact)
+
+    def update_contact(self, user_id: int, contact: ContactRow) -> None:
+        """
+        Replace an indexed contact with its updated version.
+
+        Args:
+            user_id: ID of the user owning the contact
+            contact: Updated contact row with a database ID
+        """
+        self.add_contact(user_id, contact)
+
+    def remove_contact(self, user_id: int, contact_id: int) -> None:
+        """
+        Remove a deleted contact from a user's index.
+
+        Args:
+            user_id: ID of the user owning the contact
+            contact_id: ID of the deleted contact
+        """
+        with self._lock:
+            book = self._books.get(user_id)
+            if book is not None:
+                self._unindex_contact(book, contact_id)
+
+    def search_name(self, user_id: int, query: str) -> List[ContactRow]:
+        """
+        Find contacts whose name contains the query (case-insensitive).
+
+        Args:
+            user_id: ID of the user whose contacts are searched
+            query: Substring to look for
+
+        Returns:
+            List of matching ContactRow objects sorted by name
+        """
+        query_lower = query.lower()
+        with self._lock:
+            book = self._books.get(user_id)
+            if book is None:
+                return []
+            ids = self._lookup(book.name_postings, book.names, query_lower)
+            return self._sorted_contacts(book, ids)
+
+    def search_phone(self, user_id: int, query: str) -> List[ContactRow]:
+        """
+        Find contacts whose phone number contains the query's digits.
+
+        Args:
+            user_id: ID of the user whose contacts are searched
+            query: Digits to look for; formatting characters are ignored
+
+        Returns:
+            List of matching ContactRow objects sorted by name
+        """
+        with self._lock:
+            book = self._books.get(user_id)
+            if book is None:
+                return []
+            ids = self._lookup(book.phone_postings, book.phones, digits_only(query))
+            return self._sorted_contacts(book, ids)
+
+    def search_combined(self, user_id: int, query: str) -> List[ContactRow]:
+        """
+        Find contacts whose name (case-insensitive) or phone contains the query.
+
+        Phone numbers are only matched for phone-like queries (digits and
+        formatting characters), by their digits.
+
+        Args:
+            user_id: ID of the user whose contacts are searched
+            query: Substring to look for
+
+        Returns:
+            List of matching ContactRow objects sorted by name
+        """
+        with self._lock:
+            book = self._books.get(user_id)
+            if book is None:
+                return []
+            ids = self._lookup(book.name_postings, book.names, query.lower())
+            ids |= self._lookup(book.phone_postings, book.phones, phone_query_digits(query))
+            return self._sorted_contacts(book, ids)
+
+    def _lookup(self, postings: Dict[str, Set[int]], texts: Dict[int, str], query: str) -> Set[int]:
+        """Return IDs of entries whose text contains the query."""
+        if not query:
+            return set()
+
+        if len(query) < self.GRAM_SIZE:
+            return {contact_id for contact_id, text in texts.items() if query in text}
+
+        lists = []
+        for gram in self._grams(query):
+            posting = postings.get(gram)
+            if not posting:
+                return set()
+            lists.append(posting)
+        lists.sort(key=len)
+
+        candidates = set(lists[0])
+        for posting in lists[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+
+        # Trigram hits are necessary but not sufficient; confirm the substring
+        return {contact_id for contact_id in candidates if query in texts[contact_id]}
+
+    def _index_contact(self, book: _BookIndex, contact: ContactRow) -> None:
+        """Add a contact's name and phone trigrams to a book index."""
+        contact_id = contact.id
+        name = (contact.name or "").lower()
+        phone = digits_only(contact.phone)
+
+        book.contacts[contact_id] = contact
+        book.names[contact_id] = name
+        book.phones[contact_id] = phone
+        for gram in self._grams(name):
+            book.name_postings.setdefault(gram, set()).add(contact_id)
+        for gram in self._grams(phone):
+            book.phone_postings.setdefault(gram, set()).add(contact_id)
+
+    def _unindex_contact(self, book: _BookIndex, contact_id: int) -> None:
+        """Remove a contact and its postings from a book index."""
+        if book.contacts.pop(contact_id, None) is None:
+            return
+
+        for gram in self._grams(book.names.pop(contact_id)):
+            self._discard(book.name_postings, gram, contact_id)
+        for gram in self._grams(book.phones.pop(contact_id)):
+            self._discard(book.phone_postings, gram, contact_id)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[int]], gram: str, contact_id: int) -> None:
+        """Remove an ID from a postings list, dropping the list when empty."""
+        posting = postings.get(gram)
+        if posting is not None:
+            posting.discard(contact_id)
+            if not posting:
+                del postings[gram]
+
+    @staticmethod
+    def _sorted_contacts(book: _BookIndex, ids: Set[int]) -> List[ContactRow]:
+        """Materialize contacts for a set of IDs, sorted by name."""
+        return sorted(
+            (book.contacts[contact_id] for contact_id in ids),
+            key=lambda c: book.names[c.id]
+        )
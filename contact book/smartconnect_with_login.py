@@ -6,24 +6,53 @@ Single window - Login first, then show contacts (user-specific)
 
 import sys
 import os
+from datetime import datetime, timedelta, timezone
 import customtkinter as ctk
 from tkinter import messagebox
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from auth_system import AuthenticationSystem
+from async_auth import AsyncAuthService, call_when_done
+from virtual_list import ContactRowModel, VirtualContactList
+from search_controller import SearchController
+from events import ContactEventType
+from models import ContactQuery
+from retention import RetentionManager
 
 
 class SmartConnectWithLogin:
     """SmartConnect with integrated login - single window."""
     
+    # Category filter choice that shows every contact
+    ALL_CATEGORIES = "All categories"
+    
+    # Completions shown under the search box
+    SEARCH_SUGGESTIONS = 8
+    
+    # Users fetched per page in the admin panel
+    ADMIN_USERS_PAGE_SIZE = 50
+    
+    # Last login filters of the admin panel: (logged in since, logged in before) as ages
+    ADMIN_LAST_LOGIN_RANGES = {
+        "Any login time": (None, None),
+        "Last 24 hours": (timedelta(days=1), None),
+        "Last 7 days": (timedelta(days=7), None),
+        "Last 30 days": (timedelta(days=30), None),
+        "Over 30 days ago": (None, timedelta(days=30)),
+    }
+    
     def __init__(self):
         """Initialize the application."""
         self.auth_system = AuthenticationSystem("contacts.db")
+        self.async_auth = AsyncAuthService(self.auth_system)  # bcrypt work off the UI thread
+        self.auth_busy = False
+        self.retention = RetentionManager("contacts.db", auth_system=self.auth_system)
         self.session_token = None
         self.user_data = None
         self.root = None
         self.smartconnect_app = None
+        self.search_controller = None
         
     def run(self):
         """Run the application."""
@@ -39,7 +68,13 @@ class SmartConnectWithLogin:
         # Show login screen first
         self._show_login_screen()
         
+        # Purge old sessions and archive old auth activity in the background
+        self.retention.start()
+        
         self.root.mainloop()
+        self.retention.stop()
+        self.async_auth.shutdown()
+        self.auth_system.activity_log.close()
     
     def _show_login_screen(self):
         """Show login/signup screen."""
@@ -105,7 +140,7 @@ class SmartConnectWithLogin:
         self.login_password.bind("<Return>", lambda e: self._handle_login())
         
         # Login button
-        login_btn = ctk.CTkButton(
+        self.login_button = ctk.CTkButton(
             content_frame,
             text="Login",
             command=self._handle_login,
@@ -113,8 +148,10 @@ class SmartConnectWithLogin:
             height=45,
             font=ctk.CTkFont(size=13, weight="bold")
         )
-        login_btn.pack(padx=20, pady=(0, 10))
+        self.login_button.pack(padx=20, pady=(0, 10))
         
+        # Shown while the password is being checked
+        self.login_progress = ctk.CTkProgressBar(content_frame, mode="indeterminate", width=300)
 
     
     def _setup_signup_tab(self):
@@ -157,7 +194,7 @@ class SmartConnectWithLogin:
         self.signup_confirm.bind("<Return>", lambda e: self._handle_signup())
         
         # Signup button
-        signup_btn = ctk.CTkButton(
+        self.signup_button = ctk.CTkButton(
             content_frame,
             text="Create Account",
             command=self._handle_signup,
@@ -165,10 +202,27 @@ class SmartConnectWithLogin:
             height=45,
             font=ctk.CTkFont(size=13, weight="bold")
         )
-        signup_btn.pack(padx=20, pady=(0, 10))
+        self.signup_button.pack(padx=20, pady=(0, 10))
+        
+        # Shown while the password is being hashed
+        self.signup_progress = ctk.CTkProgressBar(content_frame, mode="indeterminate", width=300)
+    
+    def _set_auth_busy(self, button, progress, busy):
+        """Disable a login/signup button and show progress while its request runs."""
+        self.auth_busy = busy
+        button.configure(state="disabled" if busy else "normal")
+        if busy:
+            progress.pack(padx=20, pady=(0, 10))
+            progress.start()
+        else:
+            progress.stop()
+            progress.pack_forget()
     
     def _handle_login(self):
         """Handle login."""
+        if self.auth_busy:
+            return
+        
         email = self.login_email.get().strip()
         password = self.login_password.get()
         
@@ -176,7 +230,14 @@ class SmartConnectWithLogin:
             messagebox.showerror("Error", "Please enter email and password")
             return
         
-        success, message, session_token, user_data = self.auth_system.login(email, password)
+        self._set_auth_busy(self.login_button, self.login_progress, True)
+        call_when_done(self.root, self.async_auth.login(email, password), self._finish_login,
+                       on_error=lambda e: self._finish_login((False, f"Login failed: {e}", None, None)))
+    
+    def _finish_login(self, result):
+        """Handle the result of a background login."""
+        self._set_auth_busy(self.login_button, self.login_progress, False)
+        success, message, session_token, user_data = result
         
         if success:
             self.session_token = session_token
@@ -188,6 +249,9 @@ class SmartConnectWithLogin:
     
     def _handle_signup(self):
         """Handle signup."""
+        if self.auth_busy:
+            return
+        
         name = self.signup_name.get().strip()
         email = self.signup_email.get().strip()
         password = self.signup_password.get()
@@ -201,7 +265,15 @@ class SmartConnectWithLogin:
             messagebox.showerror("Error", "Passwords do not match")
             return
         
-        success, message = self.auth_system.signup(name, email, password)
+        self._set_auth_busy(self.signup_button, self.signup_progress, True)
+        call_when_done(self.root, self.async_auth.signup(name, email, password),
+                       lambda result: self._finish_signup(email, result),
+                       on_error=lambda e: self._finish_signup(email, (False, f"Registration failed: {e}")))
+    
+    def _finish_signup(self, email, result):
+        """Handle the result of a background signup."""
+        self._set_auth_busy(self.signup_button, self.signup_progress, False)
+        success, message = result
         
         if success:
             messagebox.showinfo("Success", message)
@@ -324,7 +396,7 @@ class SmartConnectWithLogin:
             database = ContactDatabase(db_path)
             database.set_current_user(self.user_data['id'])
             
-            contact_manager = ContactManager(database)
+            contact_manager = ContactManager(database, activity_log=self.auth_system.activity_log)
             search_engine = ContactSearchEngine(contact_manager)
             
             # Create SmartConnect GUI components manually in our content frame
@@ -352,6 +424,19 @@ class SmartConnectWithLogin:
         self.form_entries = {}
         self.validation_labels = {}
         
+        # Saves, updates and deletes patch the list instead of reloading it
+        self.contact_facets = {}  # Contacts per category, see ContactManager.get_contact_facets
+        contact_manager.events.subscribe(self._on_contact_event)
+        
+        # Searches run on a worker thread; results are applied on the main thread
+        self._stop_search_controller()
+        self.search_controller = SearchController(
+            self.root,
+            self._load_contact_rows,
+            self._show_contact_rows,
+            on_error=lambda e: self.status_label.configure(text=f"Search failed: {e}")
+        )
+        
         # Configure parent frame grid
         parent_frame.grid_columnconfigure(0, weight=1)
         parent_frame.grid_rowconfigure(1, weight=1)
@@ -365,8 +450,12 @@ class SmartConnectWithLogin:
         # Create status bar
         self._create_embedded_status_bar(parent_frame)
         
+        # Suggestion dropdown, floating over the contact list
+        self._create_embedded_suggestions(parent_frame)
+        
         # Load contacts
         self._refresh_embedded_contact_list()
+        self._prepare_embedded_suggestions()
     
     def _create_embedded_search_frame(self, parent):
         """Create search interface."""
@@ -379,24 +468,113 @@ class SmartConnectWithLogin:
         search_label.grid(row=0, column=0, padx=10, pady=10)
         
         # Search entry
-        self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="Search by name or phone...")
+        self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="Search by name, email, company or phone...")
         self.search_entry.grid(row=0, column=1, sticky="ew", padx=10, pady=10)
-        self.search_entry.bind("<KeyRelease>", lambda e: self._refresh_embedded_contact_list())
+        self.search_entry.bind("<KeyRelease>", self._on_embedded_search_key)
+        
+        # Category filter
+        self.filter_category = None  # Read by the search worker, so not a Tk variable
+        self.filter_category_var = ctk.StringVar(value=self.ALL_CATEGORIES)
+        category_menu = ctk.CTkOptionMenu(search_frame, values=[self.ALL_CATEGORIES, "Family", "Friends", "Work"],
+                                          variable=self.filter_category_var,
+                                          command=self._embedded_category_changed)
+        category_menu.grid(row=0, column=2, padx=10, pady=10)
         
         # Sort options
         sort_label = ctk.CTkLabel(search_frame, text="Sort by:")
-        sort_label.grid(row=0, column=2, padx=10, pady=10)
+        sort_label.grid(row=0, column=3, padx=10, pady=10)
         
         self.sort_var = ctk.StringVar(value="name")
-        sort_menu = ctk.CTkOptionMenu(search_frame, values=["name", "recent"],
+        sort_menu = ctk.CTkOptionMenu(search_frame, values=["name", "recent", "company"],
                                      variable=self.sort_var,
                                      command=lambda v: self._refresh_embedded_contact_list())
-        sort_menu.grid(row=0, column=3, padx=10, pady=10)
+        sort_menu.grid(row=0, column=4, padx=10, pady=10)
         
         # Clear button
         clear_btn = ctk.CTkButton(search_frame, text="Clear", width=80,
                                  command=self._clear_embedded_search)
-        clear_btn.grid(row=0, column=4, padx=10, pady=10)
+        clear_btn.grid(row=0, column=5, padx=10, pady=10)
+    
+    def _create_embedded_suggestions(self, parent):
+        """Create the completion dropdown under the search entry."""
+        self.suggestions_ready = False  # Set once the completion index is built
+        self.suggestion_frame = ctk.CTkFrame(parent, border_width=1)
+        # Buttons are created once and relabelled, like the rows of the contact list
+        self.suggestion_buttons = []
+        for _ in range(self.SEARCH_SUGGESTIONS):
+            button = ctk.CTkButton(self.suggestion_frame, text="", anchor="w", height=26,
+                                   fg_color="transparent", text_color=("gray10", "gray90"),
+                                   hover_color=("gray80", "gray30"))
+            button.configure(command=lambda b=button: self._accept_embedded_suggestion(b.cget("text")))
+            self.suggestion_buttons.append(button)
+    
+    def _prepare_embedded_suggestions(self):
+        """Build the completion index on the search worker, after the first contact list load."""
+        search_engine = self.search_engine
+        if search_engine.suggestions_ready():
+            self.suggestions_ready = True
+            return
+        
+        def finish(result):
+            if self.search_engine is search_engine:
+                self.suggestions_ready = True
+        
+        # Reading every contact would delay the first keystroke; do it now, off the UI thread
+        call_when_done(self.root, self.search_controller.submit(search_engine.prepare_suggestions), finish,
+                       on_error=lambda e: print(f"Search suggestions unavailable: {e}"))
+    
+    def _on_embedded_search_key(self, event):
+        """Refresh the results and suggestions after a keystroke in the search box."""
+        if event.keysym == "Escape":
+            self._hide_embedded_suggestions()
+            return
+        if event.keysym == "Return":
+            self._hide_embedded_suggestions()
+            self._refresh_embedded_contact_list()
+            return
+        if event.keysym in ("Up", "Down", "Left", "Right", "Home", "End"):
+            return
+        
+        self._refresh_embedded_contact_list(debounce=True)
+        self._show_embedded_suggestions()
+    
+    def _show_embedded_suggestions(self):
+        """Show completions of the search text, or hide the dropdown if there are none."""
+        text = self.search_entry.get()
+        suggestions = []
+        if self.suggestions_ready and text.strip():
+            # Answered from memory in well under a millisecond, so no debounce
+            suggestions = [suggestion for suggestion in self.search_engine.suggest(text, self.SEARCH_SUGGESTIONS)
+                           if suggestion.lower() != text.strip().lower()]
+        if not suggestions:
+            self._hide_embedded_suggestions()
+            return
+        
+        for index, button in enumerate(self.suggestion_buttons):
+            if index < len(suggestions):
+                button.configure(text=suggestions[index])
+                button.pack(fill="x", padx=2, pady=1)
+            else:
+                button.pack_forget()
+        self.suggestion_frame.place(in_=self.search_entry, relx=0, rely=1, relwidth=1, y=2)
+        self.suggestion_frame.lift()
+    
+    def _hide_embedded_suggestions(self):
+        """Hide the completion dropdown."""
+        self.suggestion_frame.place_forget()
+    
+    def _accept_embedded_suggestion(self, suggestion):
+        """Put a chosen completion into the search box and search for it."""
+        self.search_entry.delete(0, 'end')
+        self.search_entry.insert(0, suggestion)
+        self._hide_embedded_suggestions()
+        self.search_entry.focus_set()
+        self._refresh_embedded_contact_list()
+    
+    def _embedded_category_changed(self, value):
+        """Filter the contact list by the chosen category."""
+        self.filter_category = None if value == self.ALL_CATEGORIES else value
+        self._refresh_embedded_contact_list()
     
     def _create_embedded_main_content(self, parent):
         """Create main content area with contact list and form."""
@@ -423,10 +601,9 @@ class SmartConnectWithLogin:
         header = ctk.CTkLabel(list_frame, text="Contacts", font=ctk.CTkFont(size=16, weight="bold"))
         header.grid(row=0, column=0, pady=10)
         
-        # Scrollable list
-        self.contact_listbox = ctk.CTkScrollableFrame(list_frame)
+        # Virtualized list - only the visible rows exist as widgets
+        self.contact_listbox = VirtualContactList(list_frame, on_select=self._select_embedded_contact)
         self.contact_listbox.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
-        self.contact_listbox.grid_columnconfigure(0, weight=1)
     
     def _create_embedded_contact_form(self, parent):
         """Create contact form."""
@@ -505,88 +682,93 @@ class SmartConnectWithLogin:
         self.count_label = ctk.CTkLabel(status_frame, text="")
         self.count_label.grid(row=0, column=1, sticky="e", padx=10, pady=5)
     
-    def _refresh_embedded_contact_list(self):
-        """Refresh contact list."""
-        # Clear existing
-        for widget in self.contact_listbox.winfo_children():
-            widget.destroy()
+    def _refresh_embedded_contact_list(self, debounce=False):
+        """
+        Refresh contact list in the background.
         
-        # Get contacts
+        Args:
+            debounce: Wait for typing to pause before searching (for keystrokes)
+        """
         search_query = self.search_entry.get() if hasattr(self, 'search_entry') else ""
         sort_by = self.sort_var.get() if hasattr(self, 'sort_var') else "name"
         
-        if search_query.strip():
-            contacts = self.search_engine.search_combined(search_query)
-            if sort_by == "recent":
-                contacts = self.search_engine.sort_contacts(contacts, "recent")
-            else:
-                contacts = self.search_engine.sort_contacts(contacts, "name")
-        else:
-            contacts = self.contact_manager.get_all_contacts(sort_by)
+        self.search_controller.search(search_query, sort_by, debounce=debounce)
+    
+    def _load_contact_rows(self, search_query, sort_by):
+        # Substring search through the trigram index, or one SQL query when there is no search text
+        # Searching, filtering and sorting are done by one SQL query
+        contacts = self.search_engine.query(
+            ContactQuery(text=search_query, category=self.filter_category, sort_by=sort_by)
+        )
+        
+        rows = [ContactRowModel.from_contact(contact, sort_by) for contact in contacts]
+        facets = self.contact_manager.get_contact_facets()
+        return rows, facets
+    
+    def _show_contact_rows(self, search_query, sort_by, result):
+        """Display the result of the latest search (runs on the main thread)."""
+        rows, facets = result
         
         # Display contacts
-        if not contacts:
-            empty_frame = ctk.CTkFrame(self.contact_listbox, fg_color="transparent")
-            empty_frame.grid(row=0, column=0, pady=20, padx=20, sticky="ew")
-            
-            empty_icon = ctk.CTkLabel(empty_frame, text="📇", font=ctk.CTkFont(size=32))
-            empty_icon.pack(pady=(0, 10))
-            
-            if search_query.strip():
-                empty_label = ctk.CTkLabel(empty_frame, text=f"No contacts found for '{search_query}'",
-                                          font=ctk.CTkFont(size=14, weight="bold"))
-            else:
-                empty_label = ctk.CTkLabel(empty_frame, text="No contacts yet",
-                                          font=ctk.CTkFont(size=14, weight="bold"))
-            empty_label.pack()
-            
-            suggestion = ctk.CTkLabel(empty_frame, 
-                                     text="Add your first contact using the form on the right",
-                                     font=ctk.CTkFont(size=12), text_color="gray")
-            suggestion.pack(pady=(5, 0))
+        if search_query.strip():
+            self.contact_listbox.set_empty_message(f"No contacts found for '{search_query}'",
+                                                   "Add your first contact using the form on the right")
+        elif self.filter_category:
+            self.contact_listbox.set_empty_message(f"No contacts in {self.filter_category}",
+                                                   "Add your first contact using the form on the right")
         else:
-            for i, contact in enumerate(contacts):
-                self._create_embedded_contact_item(contact, i)
+            self.contact_listbox.set_empty_message("No contacts yet",
+                                                   "Add your first contact using the form on the right")
+        self.contact_listbox.set_items(rows, descending=(sort_by == "recent"))
         
-        # Update count
-        total = self.contact_manager.get_contact_count()
-        if search_query.strip():
-            self.count_label.configure(text=f"Showing {len(contacts)} of {total} contacts")
+        self.contact_facets = facets
+        self._update_count_label()
+    
+    def _update_count_label(self):
+        """Show the number of listed and total contacts, and the count per category."""
+        total = sum(self.contact_facets.values())
+        categories = " · ".join(f"{category} {count}" for category, count in self.contact_facets.items() if category)
+        if self._embedded_list_filtered():
+            self.count_label.configure(
+                text=f"Showing {len(self.contact_listbox.items)} of {total} contacts"
+            )
         else:
-            self.count_label.configure(text=f"Total contacts: {total}")
+            self.count_label.configure(text=f"Total contacts: {total} ({categories})")
     
-    def _create_embedded_contact_item(self, contact, row):
-        """Create contact item widget."""
-        from models import Contact
-        
-        item_frame = ctk.CTkFrame(self.contact_listbox)
-        item_frame.grid(row=row, column=0, sticky="ew", padx=5, pady=2)
-        item_frame.grid_columnconfigure(0, weight=1)
-        
-        name_label = ctk.CTkLabel(item_frame, text=contact.name, 
-                                 font=ctk.CTkFont(size=14, weight="bold"))
-        name_label.grid(row=0, column=0, sticky="w", padx=10, pady=(5, 0))
-        
-        details = []
-        if contact.phone:
-            details.append(f"📞 {contact.phone}")
-        if contact.email:
-            details.append(f"✉️ {contact.email}")
-        if contact.company:
-            details.append(f"🏢 {contact.company}")
-        
-        if details:
-            details_text = " | ".join(details)
-            details_label = ctk.CTkLabel(item_frame, text=details_text, font=ctk.CTkFont(size=12))
-            details_label.grid(row=1, column=0, sticky="w", padx=10, pady=(0, 5))
-        
-        def on_click(event=None, cid=contact.id):
-            self._select_embedded_contact(cid)
-        
-        item_frame.bind("<Button-1>", on_click)
-        name_label.bind("<Button-1>", on_click)
-        if details:
-            details_label.bind("<Button-1>", on_click)
+    def _on_contact_event(self, event):
+        """
+        Patch the contact list and count after a contact change.
+        
+        Events are published on the thread that made the change, which for
+        saves, updates and deletes is the main thread.
+        """
+        searching = self._embedded_list_filtered()
+        
+        # A reload in flight may predate the change, and a changed contact may
+        # enter or leave the search results; let a fresh query settle both.
+        if (event.type is ContactEventType.RELOADED or self.search_controller.pending
+                or (searching and event.type is not ContactEventType.DELETED)):
+            self._refresh_embedded_contact_list()
+            return
+        
+        if event.type in (ContactEventType.CREATED, ContactEventType.UPDATED):
+            self.contact_listbox.put_item(ContactRowModel.from_contact(event.contact, self.sort_var.get()))
+        elif event.type is ContactEventType.DELETED:
+            self.contact_listbox.remove_item(event.contact_id)
+        
+        # Category counts are maintained by the database; reading them is cheap
+        self.contact_facets = self.contact_manager.get_contact_facets()
+        self._update_count_label()
+    
+    def _embedded_list_filtered(self):
+        """Whether the contact list shows only search results or one category."""
+        return bool(self.search_entry.get().strip() or self.filter_category)
+    
+    def _stop_search_controller(self):
+        """Stop background searches before the contact view is torn down."""
+        if self.search_controller is not None:
+            self.search_controller.shutdown()
+            self.search_controller = None
     
     def _select_embedded_contact(self, contact_id):
         """Select and populate form with contact."""
@@ -639,7 +821,6 @@ class SmartConnectWithLogin:
         if success:
             messagebox.showinfo("Success", message)
             self._clear_embedded_form()
-            self._refresh_embedded_contact_list()
         else:
             messagebox.showerror("Error", message)
     
@@ -663,7 +844,6 @@ class SmartConnectWithLogin:
         
         if success:
             messagebox.showinfo("Success", message)
-            self._refresh_embedded_contact_list()
         else:
             messagebox.showerror("Error", message)
     
@@ -681,7 +861,6 @@ class SmartConnectWithLogin:
             if success:
                 messagebox.showinfo("Success", message)
                 self._clear_embedded_form()
-                self._refresh_embedded_contact_list()
             else:
                 messagebox.showerror("Error", message)
     
@@ -701,13 +880,17 @@ class SmartConnectWithLogin:
         self.status_label.configure(text="Ready")
     
     def _clear_embedded_search(self):
-        """Clear search field."""
+        """Clear search field and category filter."""
         self.search_entry.delete(0, 'end')
+        self._hide_embedded_suggestions()
+        self.filter_category_var.set(self.ALL_CATEGORIES)
+        self.filter_category = None
         self._refresh_embedded_contact_list()
     
     def _logout(self):
         """Logout user."""
         if messagebox.askyesno("Confirm Logout", "Are you sure you want to logout?"):
+            self._stop_search_controller()
             self.auth_system.logout(self.session_token)
             self.session_token = None
             self.user_data = None
@@ -716,6 +899,8 @@ class SmartConnectWithLogin:
     def _open_admin_panel(self):
         """Open admin panel for user management (embedded in same window)."""
         try:
+            self._stop_search_controller()
+            
             # Clear current content
             for widget in self.root.winfo_children():
                 widget.destroy()
@@ -815,10 +1000,8 @@ class SmartConnectWithLogin:
     
     def _create_admin_panel_content(self):
         """Create admin panel content embedded in main window."""
-        from admin_user_controller import AdminUserController
-        
-        # Initialize controller first
-        self.admin_controller = AdminUserController(self.auth_system)
+        # Share the controller used for background admin operations
+        self.admin_controller = self.async_auth.admin_controller
         
         # Main container with proper sizing
         main_frame = ctk.CTkFrame(self.root)
@@ -848,9 +1031,33 @@ class SmartConnectWithLogin:
         )
         list_header.grid(row=0, column=0, sticky="w", padx=15)
         
+        # Filters, applied by the database (see AdminUserController.list_users)
+        filter_frame = ctk.CTkFrame(header_frame, fg_color="transparent")
+        filter_frame.grid(row=1, column=0, sticky="ew", padx=15, pady=(5, 0))
+        filter_frame.grid_columnconfigure(0, weight=1)
+        
+        self.admin_search_entry = ctk.CTkEntry(filter_frame, placeholder_text="Name or email starts with...")
+        self.admin_search_entry.grid(row=0, column=0, sticky="ew", padx=(5, 10))
+        self.admin_search_entry.bind("<KeyRelease>", lambda e: self._admin_filters_changed(debounce=True))
+        
+        self.admin_status_var = ctk.StringVar(value="All statuses")
+        ctk.CTkOptionMenu(filter_frame, values=["All statuses", "active", "banned", "suspended"],
+                          variable=self.admin_status_var, width=130,
+                          command=lambda v: self._admin_filters_changed()).grid(row=0, column=1, padx=5)
+        
+        self.admin_role_var = ctk.StringVar(value="All roles")
+        ctk.CTkOptionMenu(filter_frame, values=["All roles", "user", "admin"],
+                          variable=self.admin_role_var, width=110,
+                          command=lambda v: self._admin_filters_changed()).grid(row=0, column=2, padx=5)
+        
+        self.admin_login_var = ctk.StringVar(value="Any login time")
+        ctk.CTkOptionMenu(filter_frame, values=list(self.ADMIN_LAST_LOGIN_RANGES),
+                          variable=self.admin_login_var, width=150,
+                          command=lambda v: self._admin_filters_changed()).grid(row=0, column=3, padx=5)
+        
         # Column headers for better alignment
         headers_frame = ctk.CTkFrame(header_frame, fg_color="transparent")
-        headers_frame.grid(row=1, column=0, sticky="ew", padx=15, pady=(5, 0))
+        headers_frame.grid(row=2, column=0, sticky="ew", padx=15, pady=(5, 0))
         headers_frame.grid_columnconfigure(0, weight=0)
         headers_frame.grid_columnconfigure(1, weight=1)
         headers_frame.grid_columnconfigure(2, weight=0)
@@ -883,7 +1090,7 @@ class SmartConnectWithLogin:
             font=ctk.CTkFont(size=11, weight="bold"),
             text_color="gray",
             anchor="center",
-            width=150
+            width=200
         )
         actions_header.grid(row=0, column=3, padx=(10, 5))
         
@@ -891,6 +1098,9 @@ class SmartConnectWithLogin:
         self.admin_users_frame = ctk.CTkScrollableFrame(list_container, fg_color="transparent")
         self.admin_users_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=(5, 10))
         self.admin_users_frame.grid_columnconfigure(0, weight=1)
+        self.admin_users_next_key = None
+        self.admin_load_more_btn = None
+        self.admin_filter_job = None
         
         # Action buttons with better layout
         button_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -940,13 +1150,16 @@ class SmartConnectWithLogin:
         
         # Create stat cards with equal sizing
         stat_items = [
-            ("Total Users", stats.get('total_users', 0), "#3498db"),
-            ("Active Users", stats.get('active_users', 0), "#2ecc71"),
-            ("Banned Users", stats.get('banned_users', 0), "#e74c3c"),
-            ("Admins", stats.get('admin_users', 0), "#9b59b6")
+            ("Total Users", 'total_users', "#3498db"),
+            ("Active Users", 'active_users', "#2ecc71"),
+            ("Banned Users", 'banned_users', "#e74c3c"),
+            ("Admins", 'admin_users', "#9b59b6")
         ]
         
-        for i, (label, value, color) in enumerate(stat_items):
+        # Value labels by statistic, updated in place by _refresh_admin_statistics
+        self.admin_stat_labels = {}
+        
+        for i, (label, key, color) in enumerate(stat_items):
             # Create card with fixed height
             card = ctk.CTkFrame(stats_frame, fg_color=color, corner_radius=10, height=120)
             card.grid(row=0, column=i, sticky="ew", padx=5, pady=15, ipadx=10, ipady=10)
@@ -959,11 +1172,12 @@ class SmartConnectWithLogin:
             
             value_label = ctk.CTkLabel(
                 card,
-                text=str(value),
+                text=str(stats.get(key, 0)),
                 font=ctk.CTkFont(size=32, weight="bold"),
                 text_color="white"
             )
             value_label.grid(row=0, column=0, sticky="ew", pady=(15, 0))
+            self.admin_stat_labels[key] = value_label
             
             text_label = ctk.CTkLabel(
                 card,
@@ -973,20 +1187,66 @@ class SmartConnectWithLogin:
             )
             text_label.grid(row=1, column=0, sticky="ew", pady=(0, 15))
     
+    def _admin_user_filters(self):
+        """Return the list_users filters selected in the admin panel."""
+        status = self.admin_status_var.get()
+        role = self.admin_role_var.get()
+        since, before = self.ADMIN_LAST_LOGIN_RANGES[self.admin_login_var.get()]
+        now = datetime.now(timezone.utc)
+        
+        # last_login is stored by SQLite's CURRENT_TIMESTAMP, in UTC
+        return {
+            'search': self.admin_search_entry.get().strip() or None,
+            'status': None if status == "All statuses" else status,
+            'role': None if role == "All roles" else role,
+            'last_login_from': (now - since).strftime("%Y-%m-%d %H:%M:%S") if since else None,
+            'last_login_to': (now - before).strftime("%Y-%m-%d %H:%M:%S") if before else None
+        }
+    
+    def _admin_filters_changed(self, debounce=False):
+        """Reload the user list for new filters, after a pause in typing if debounce is set."""
+        if self.admin_filter_job is not None:
+            self.root.after_cancel(self.admin_filter_job)
+            self.admin_filter_job = None
+        if debounce:
+            self.admin_filter_job = self.root.after(300, self._admin_filters_changed)
+            return
+        self._admin_load_users()
+    
     def _admin_load_users(self):
-        """Load and display users in admin panel."""
+        """Load the first page of users in admin panel; later pages load from the "Load more" button."""
         # Clear existing users only (not the whole interface)
         for widget in self.admin_users_frame.winfo_children():
             widget.destroy()
+        self.admin_users_next_key = None
+        self.admin_load_more_btn = None
         
-        # Get all users - returns (success, message, users)
-        result = self.admin_controller.get_all_users(self.session_token)
-        
-        if len(result) == 3:
-            success, message, users = result
-        else:
-            success, users = result
-            message = ""
+        if self._admin_load_users_page(None):
+            # Refresh statistics only - don't destroy the whole layout
+            self._refresh_admin_statistics()
+    
+    def _admin_load_more_users(self):
+        """Append the next page of users, if there is one."""
+        if self.admin_load_more_btn is not None:
+            self.admin_load_more_btn.destroy()
+            self.admin_load_more_btn = None
+        if self.admin_users_next_key is not None:
+            self._admin_load_users_page(self.admin_users_next_key)
+    
+    def _admin_load_users_page(self, after_key):
+        """
+        Fetch one page of users matching the filters and add their cards.
+        
+        Returns:
+            True if the page was loaded
+        """
+        # Cleared first, so repeated clicks during loading don't request the same page again
+        self.admin_users_next_key = None
+        result = self.admin_controller.list_users(
+            self.session_token, after_key=after_key, limit=self.ADMIN_USERS_PAGE_SIZE,
+            **self._admin_user_filters()
+        )
+        success, message, page = result
         
         if not success:
             error_label = ctk.CTkLabel(
@@ -996,9 +1256,10 @@ class SmartConnectWithLogin:
                 text_color="red"
             )
             error_label.pack(pady=20)
-            return
+            return False
         
-        if not users:
+        users, next_key = page
+        if not users and after_key is None:
             empty_label = ctk.CTkLabel(
                 self.admin_users_frame,
                 text="No users found",
@@ -1006,62 +1267,35 @@ class SmartConnectWithLogin:
                 text_color="gray"
             )
             empty_label.pack(pady=20)
-            return
         
         # Display users
         for user in users:
             self._create_admin_user_card(user)
         
-        # Refresh statistics only - don't destroy the whole layout
-        self._refresh_admin_statistics()
+        # Further pages are appended below the cards loaded so far
+        self.admin_users_next_key = next_key
+        if next_key is not None:
+            self.admin_load_more_btn = ctk.CTkButton(
+                self.admin_users_frame,
+                text="Load more users",
+                command=self._admin_load_more_users,
+                width=160,
+                height=30,
+                fg_color="transparent",
+                border_width=1,
+                font=ctk.CTkFont(size=12)
+            )
+            self.admin_load_more_btn.pack(pady=10)
+        return True
     
     def _refresh_admin_statistics(self):
         """Refresh statistics without destroying layout."""
         try:
-            # Find the main frame
-            main_frame = None
-            for widget in self.root.winfo_children():
-                if isinstance(widget, ctk.CTkFrame) and widget.grid_info().get('row') == 1:
-                    main_frame = widget
-                    break
-            
-            if not main_frame:
-                return
-            
-            # Find and update the statistics frame
-            stats_frame = None
-            for widget in main_frame.winfo_children():
-                if isinstance(widget, ctk.CTkFrame) and widget.grid_info().get('row') == 0:
-                    stats_frame = widget
-                    break
-            
-            if stats_frame:
-                # Get updated statistics
-                success, message, stats = self.admin_controller.get_user_statistics(self.session_token)
-                if success:
-                    # Update the stat cards
-                    stat_values = [
-                        stats.get('total_users', 0),
-                        stats.get('active_users', 0),
-                        stats.get('banned_users', 0),
-                        stats.get('admin_users', 0)
-                    ]
-                    
-                    # Find and update each stat card
-                    card_index = 0
-                    for widget in stats_frame.winfo_children():
-                        if isinstance(widget, ctk.CTkFrame) and card_index < len(stat_values):
-                            # Find the value label in this card
-                            for card_widget in widget.winfo_children():
-                                if isinstance(card_widget, ctk.CTkLabel):
-                                    try:
-                                        # Check if this is a number (the value label)
-                                        int(card_widget.cget("text"))
-                                        card_widget.configure(text=str(stat_values[card_index]))
-                                        break
-                                    except:
-                                        continue
-                            card_index += 1
+            # Statistics are cached by the controller until users change
+            success, message, stats = self.admin_controller.get_user_statistics(self.session_token)
+            if success:
+                for key, value_label in self.admin_stat_labels.items():
+                    value_label.configure(text=str(stats.get(key, 0)))
         except Exception as e:
             print(f"Error refreshing statistics: {e}")
             # If refresh fails, just skip it
@@ -1127,7 +1361,7 @@ class SmartConnectWithLogin:
         status_label.pack(side="left", padx=(0, 5))
         
         # Action buttons (right side) - reduced width
-        action_frame = ctk.CTkFrame(card, fg_color="transparent", width=150)
+        action_frame = ctk.CTkFrame(card, fg_color="transparent", width=200)
         action_frame.grid(row=0, column=3, padx=10, pady=12, sticky="e")
         action_frame.grid_propagate(False)
         
@@ -1167,16 +1401,47 @@ class SmartConnectWithLogin:
             font=ctk.CTkFont(size=11)
         )
         delete_btn.pack(side="left", padx=1)
+        
+        reset_btn = ctk.CTkButton(
+            action_frame,
+            text="Reset",
+            command=lambda u=user: self._admin_reset_password(u['id'], u['name']),
+            width=65,
+            height=28,
+            fg_color="#f39c12",
+            hover_color="#d68910",
+            font=ctk.CTkFont(size=11)
+        )
+        reset_btn.pack(side="left", padx=1)
     
     def _admin_create_user(self):
         """Create new user dialog."""
         from user_creation_dialog import UserCreationDialog
         
-        dialog = UserCreationDialog(self.root, self.auth_system)
-        self.root.wait_window(dialog.dialog)
+        # The dialog creates the account on the auth worker pool and reloads the list when done
+        dialog = UserCreationDialog(self.root, self.async_auth, self.session_token,
+                                    on_created=lambda user_data: self._admin_load_users())
+        dialog.show()
+    
+    def _admin_reset_password(self, user_id, user_name):
+        """Reset a user's password to a temporary one."""
+        if not messagebox.askyesno("Confirm Reset",
+                                   f"Reset the password of '{user_name}'?\n\n"
+                                   "A temporary password will be issued that they must use to log in."):
+            return
         
-        if dialog.result:
-            self._admin_load_users()
+        def finish(result):
+            success, message, temp_password = result
+            if success:
+                messagebox.showinfo("Password Reset",
+                                    f"{message}\n\nTemporary password for {user_name}:\n{temp_password}")
+            else:
+                messagebox.showerror("Error", message)
+        
+        # Hashing the temporary password runs on the auth worker pool
+        future = self.async_auth.reset_password(self.session_token, user_id)
+        call_when_done(self.root, future, finish,
+                       on_error=lambda e: messagebox.showerror("Error", f"Password reset failed: {e}"))
     
     def _admin_ban_user(self, user_id):
         """Ban a user."""
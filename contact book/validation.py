@@ -6,10 +6,30 @@ using regex patterns for email, phone number, and name validation.
 """
 
 import re
-from typing import List, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 from models import Contact
 
 
+# Fields of a contact that are validated, as sent to worker processes
+_FieldTuple = Tuple[str, str, str, str]
+
+
+def _validate_field_tuples(records: Sequence[_FieldTuple]) -> List[List[str]]:
+    """Validate (name, email, phone, category) tuples (runs in worker processes)."""
+    fields_valid = ContactValidator._fields_valid
+    results = []
+    for name, email, phone, category in records:
+        if fields_valid(name, email, phone, category):
+            results.append([])
+        else:
+            contact = Contact(name=name, email=email, phone=phone, category=category)
+            results.append(ContactValidator.get_validation_errors(contact))
+    return results
+
+
 class ContactValidator:
     """
     Validation engine for contact data using regex patterns.
@@ -28,6 +48,17 @@ class ContactValidator:
     # Name validation pattern - allows letters, spaces, apostrophes, and hyphens
     NAME_PATTERN = re.compile(r'^[a-zA-Z\s\'\-]+$')
     
+    VALID_CATEGORIES = frozenset({'Family', 'Friends', 'Work'})
+    
+    # Unanchored forms of the patterns above for re.fullmatch on stripped
+    # fields, used together by the fast path of validate_many
+    _NAME_FULLMATCH = re.compile(r"[a-zA-Z\s'\-]+").fullmatch
+    _EMAIL_FULLMATCH = re.compile(r"[\w.\-]+@[a-zA-Z\d\-]+\.[a-zA-Z]{2,}").fullmatch
+    _PHONE_FULLMATCH = re.compile(r"\+?[0-9\s\-()]{10,15}").fullmatch
+    
+    # Records handed to a worker process at a time in validate_many
+    PROCESS_CHUNK_SIZE = 5000
+    
     @staticmethod
     def validate_email(email: str) -> bool:
         """
@@ -105,8 +136,7 @@ class ContactValidator:
         Returns:
             bool: True if category is valid, False otherwise
         """
-        valid_categories = {'Family', 'Friends', 'Work'}
-        return category in valid_categories
+        return category in ContactValidator.VALID_CATEGORIES
     
     @staticmethod
     def get_validation_errors(contact: Contact) -> List[str]:
@@ -142,6 +172,65 @@ class ContactValidator:
         
         return errors
     
+    @staticmethod
+    def _fields_valid(name: str, email: str, phone: str, category: str) -> bool:
+        """Check all fields at once; True exactly when get_validation_errors is empty."""
+        return bool(
+            name and ContactValidator._NAME_FULLMATCH(name.strip())
+            and (not email or ContactValidator._EMAIL_FULLMATCH(email.strip()))
+            and (not phone or ContactValidator._PHONE_FULLMATCH(phone.strip()))
+            and category in ContactValidator.VALID_CATEGORIES
+        )
+    
+    @classmethod
+    def validate_many(cls, contacts: Iterable[Contact],
+                      processes: Optional[int] = None) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Validate a stream of contacts.
+        
+        Each contact is checked with one short-circuiting expression over
+        precompiled patterns; only contacts that fail it go through
+        get_validation_errors to build their messages. Results are yielded
+        lazily and in input order, so arbitrarily large inputs can be streamed.
+        
+        Args:
+            contacts: Contacts to validate
+            processes: Validate in a pool of this many worker processes (worth
+                it only for very large batches); None validates in-process
+            
+        Yields:
+            Tuple[int, List[str]]: (index, errors) for every contact, with the
+            index counted from 0 in input order and errors empty if valid
+        """
+        if processes is None:
+            fields_valid = cls._fields_valid
+            for index, contact in enumerate(contacts):
+                if fields_valid(contact.name, contact.email, contact.phone, contact.category):
+                    yield index, []
+                else:
+                    yield index, cls.get_validation_errors(contact)
+            return
+        
+        if processes <= 0:
+            raise ValueError("Number of processes must be positive")
+        
+        fields = ((c.name, c.email, c.phone, c.category) for c in contacts)
+        index = 0
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            # Keep a bounded number of chunks in flight so input is still streamed
+            pending = deque()
+            while True:
+                while len(pending) < processes * 2:
+                    chunk = list(islice(fields, cls.PROCESS_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(_validate_field_tuples, chunk))
+                if not pending:
+                    break
+                for errors in pending.popleft().result():
+                    yield index, errors
+                    index += 1
+    
     @staticmethod
     def is_valid_contact(contact: Contact) -> Tuple[bool, List[str]]:
         """
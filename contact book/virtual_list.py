@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Virtualized contact list widget for SmartConnect.
+
+Only enough row widgets to fill the visible viewport are created. Scrolling
+re-binds those rows to different entries of a lightweight row model instead of
+creating or destroying widgets, so rendering cost is independent of the number
+of contacts. Single rows can be inserted, replaced or removed in place, at
+their sorted position, without reloading the list.
+"""
+
+import math
+from typing import Callable, Dict, List, NamedTuple, Optional
+import customtkinter as ctk
+from models import contact_sort_key
+
+
+class ContactRowModel(NamedTuple):
+    """Display data for one contact row."""
+    contact_id: int
+    name: str
+    details: str
+    sort_key: tuple = ()
+
+    @classmethod
+    def from_contact(cls, contact, sort_by: str = "name") -> "ContactRowModel":
+        """
+        Build a row model from any object with Contact attributes.
+
+        The sort key reproduces the database ordering for sort_by (see
+        models.contact_sort_key), so keys are unique.
+        """
+        details = []
+        if contact.phone:
+            details.append(f"📞 {contact.phone}")
+        if contact.email:
+            details.append(f"✉️ {contact.email}")
+        if contact.company:
+            details.append(f"🏢 {contact.company}")
+
+        return cls(contact.id, contact.name, " | ".join(details), contact_sort_key(contact, sort_by))
+
+
+class VirtualContactList(ctk.CTkFrame):
+    """
+    Scrollable contact list that renders only the visible rows.
+
+    Rows are recycled as the list scrolls (one row per step), and clicking a
+    row calls on_select with its contact ID.
+
+    Items are expected in sort_key order (descending for newest-first lists),
+    which lets put_item and remove_item find positions by binary search.
+    """
+
+    ROW_HEIGHT = 56
+    ROW_GAP = 4
+
+    def __init__(self, master, on_select: Callable[[int], None], **kwargs):
+        """
+        Initialize the list.
+
+        Args:
+            master: Parent widget
+            on_select: Called with the contact ID of a clicked row
+        """
+        super().__init__(master, **kwargs)
+        self.on_select = on_select
+        self.items: List[ContactRowModel] = []
+        self.descending = False
+        self._sort_keys: Dict[int, tuple] = {}  # contact ID -> sort key of its row
+        self._offset = 0
+        self._rows = []  # (frame, name_label, details_label) per recycled row
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.empty_frame = ctk.CTkFrame(self.viewport, fg_color="transparent")
+        ctk.CTkLabel(self.empty_frame, text="📇", font=ctk.CTkFont(size=32)).pack(pady=(0, 10))
+        self.empty_title = ctk.CTkLabel(self.empty_frame, text="", font=ctk.CTkFont(size=14, weight="bold"))
+        self.empty_title.pack()
+        self.empty_subtitle = ctk.CTkLabel(self.empty_frame, text="", font=ctk.CTkFont(size=12),
+                                           text_color="gray")
+        self.empty_subtitle.pack(pady=(5, 0))
+
+        self.viewport.bind("<Configure>", lambda e: self._render())
+        self._bind_scroll(self.viewport)
+
+    @property
+    def visible_count(self) -> int:
+        """Number of rows that fit in the viewport."""
+        height = max(self.viewport.winfo_height(), 1)
+        return max(1, math.ceil(height / self.ROW_HEIGHT))
+
+    def set_items(self, items: List[ContactRowModel], keep_position: bool = False,
+                  descending: bool = False) -> None:
+        """
+        Replace the displayed rows.
+
+        Args:
+            items: Row models in display order
+            keep_position: Keep the current scroll offset instead of returning to the top
+            descending: Items are ordered by descending sort_key
+        """
+        self.items = items
+        self.descending = descending
+        self._sort_keys = {item.contact_id: item.sort_key for item in items}
+        if not keep_position:
+            self._offset = 0
+        self._render()
+
+    def put_item(self, item: ContactRowModel) -> None:
+        """
+        Insert a row at its sorted position, or replace the row with the same contact ID.
+
+        A row whose sort key is unchanged is updated in place; otherwise it
+        moves to its new position. The scroll offset is kept.
+
+        Args:
+            item: Row model for the new or changed contact
+        """
+        old_key = self._sort_keys.get(item.contact_id)
+        if old_key is not None:
+            index = self._index_of(item.contact_id, old_key)
+            if old_key == item.sort_key:
+                self.items[index] = item
+                self._render()
+                return
+            del self.items[index]
+
+        self.items.insert(self._insertion_point(item.sort_key), item)
+        self._sort_keys[item.contact_id] = item.sort_key
+        self._render()
+
+    def remove_item(self, contact_id: int) -> bool:
+        """
+        Remove the row of a contact, keeping the scroll offset.
+
+        Args:
+            contact_id: ID of the contact whose row to remove
+
+        Returns:
+            bool: True if the contact was listed
+        """
+        sort_key = self._sort_keys.pop(contact_id, None)
+        if sort_key is None:
+            return False
+        del self.items[self._index_of(contact_id, sort_key)]
+        self._render()
+        return True
+
+    def set_empty_message(self, title: str, subtitle: str = "") -> None:
+        """Set the text shown when the list has no rows."""
+        self.empty_title.configure(text=title)
+        self.empty_subtitle.configure(text=subtitle)
+
+    def scroll_to(self, offset: int) -> None:
+        """Scroll so that the row at offset is the first visible row."""
+        max_offset = max(0, len(self.items) - self.visible_count + 1)
+        offset = min(max(0, offset), max_offset)
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _insertion_point(self, sort_key: tuple) -> int:
+        """Binary search for the first position whose key does not precede sort_key."""
+        low, high = 0, len(self.items)
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = self.items[middle].sort_key
+            if (middle_key > sort_key) if self.descending else (middle_key < sort_key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _index_of(self, contact_id: int, sort_key: tuple) -> int:
+        """Position of a listed contact's row (scans if the items are not key-ordered)."""
+        index = self._insertion_point(sort_key)
+        if index < len(self.items) and self.items[index].contact_id == contact_id:
+            return index
+        return next(i for i, item in enumerate(self.items) if item.contact_id == contact_id)
+
+    def _render(self) -> None:
+        """Bind the recycled row widgets to the items in view."""
+        visible = self.visible_count
+        while len(self._rows) < visible:
+            self._rows.append(self._create_row())
+
+        if not self.items:
+            for frame, _, _ in self._rows:
+                frame.place_forget()
+            self.empty_frame.place(relx=0.5, y=20, anchor="n")
+            self.scrollbar.set(0.0, 1.0)
+            return
+
+        self.empty_frame.place_forget()
+        self._offset = min(self._offset, max(0, len(self.items) - visible + 1))
+
+        for position, (frame, name_label, details_label) in enumerate(self._rows):
+            index = self._offset + position
+            if position >= visible or index >= len(self.items):
+                frame.place_forget()
+                continue
+
+            item = self.items[index]
+            frame.contact_id = item.contact_id
+            name_label.configure(text=item.name)
+            details_label.configure(text=item.details)
+            frame.place(x=0, y=position * self.ROW_HEIGHT, relwidth=1.0)
+
+        total = len(self.items)
+        self.scrollbar.set(self._offset / total, min(1.0, (self._offset + visible) / total))
+
+    def _create_row(self):
+        """Create one reusable row widget."""
+        frame = ctk.CTkFrame(self.viewport, height=self.ROW_HEIGHT - self.ROW_GAP)
+        frame.grid_columnconfigure(0, weight=1)
+        frame.grid_propagate(False)
+        frame.contact_id = None
+
+        name_label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=14, weight="bold"), anchor="w")
+        name_label.grid(row=0, column=0, sticky="w", padx=10, pady=(5, 0))
+
+        details_label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=12), anchor="w")
+        details_label.grid(row=1, column=0, sticky="w", padx=10, pady=(0, 5))
+
+        def on_click(event=None, row_frame=frame):
+            if row_frame.contact_id is not None:
+                self.on_select(row_frame.contact_id)
+
+        for widget in (frame, name_label, details_label):
+            widget.bind("<Button-1>", on_click)
+            self._bind_scroll(widget)
+
+        return frame, name_label, details_label
+
+    def _bind_scroll(self, widget) -> None:
+        """Route mouse wheel events on a widget to the list."""
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", lambda e: self.scroll_to(self._offset - 1))
+        widget.bind("<Button-5>", lambda e: self.scroll_to(self._offset + 1))
+
+    def _on_mousewheel(self, event) -> None:
+        """Scroll by wheel notches (Windows reports 120 per notch, macOS 1)."""
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_to(self._offset - steps)
+
+    def _on_scrollbar(self, action: str, value: Optional[str] = None, unit: Optional[str] = None) -> None:
+        """Handle Tk scrollbar commands ("moveto" fraction or "scroll" n units/pages)."""
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.items)))
+        elif action == "scroll":
+            step = int(value)
+            if unit == "pages":
+                step *= max(1, self.visible_count - 1)
+            self.scroll_to(self._offset + step)